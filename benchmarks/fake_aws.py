@@ -0,0 +1,190 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import contextlib
+import io
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from unittest import mock
+
+from botocore.exceptions import ClientError
+
+from agenteval.evaluators import base_evaluator
+from agenteval.utils import aws
+
+# rough number of characters per token, used to report token counts
+_CHARS_PER_TOKEN = 4
+
+# delay before each simulated retry of a throttled call
+_RETRY_DELAY = 0.01
+
+
+@dataclass
+class FakeAWSConfig:
+    """The behavior of the fake AWS services.
+
+    Attributes:
+        latency (float): The mean latency of each call in seconds.
+        jitter (float): The fraction of the latency by which each call may vary.
+        throttle_rate (float): The probability of each attempt being throttled.
+        max_attempts (int): The number of attempts made before a throttled call fails.
+        completion_bytes (int): The size of the reasoning in each model completion.
+        agent_trace_bytes (int): The size of the trace returned with each agent response.
+        seed (int): The seed of the random number generator.
+    """
+
+    latency: float = 0.01
+    jitter: float = 0.2
+    throttle_rate: float = 0.0
+    max_attempts: int = 10
+    completion_bytes: int = 1024
+    agent_trace_bytes: int = 4096
+    seed: int = 0
+
+
+class _FakeClient:
+    def __init__(self, config: FakeAWSConfig, rng: random.Random, lock: threading.Lock):
+        self._config = config
+        self._rng = rng
+        self._lock = lock
+
+    def _random(self) -> float:
+        # the generator is shared by all clients, so results are reproducible
+        with self._lock:
+            return self._rng.random()
+
+    def _call(self, operation_name: str) -> int:
+        # retries happen within `boto3` clients, so only failed calls raise
+        attempts = 0
+        while self._random() < self._config.throttle_rate:
+            attempts += 1
+            if attempts >= self._config.max_attempts:
+                raise ClientError(
+                    {
+                        "Error": {
+                            "Code": "ThrottlingException",
+                            "Message": "Rate exceeded",
+                        }
+                    },
+                    operation_name,
+                )
+            time.sleep(_RETRY_DELAY)
+
+        jitter = (self._random() * 2 - 1) * self._config.jitter
+        time.sleep(max(0.0, self._config.latency * (1 + jitter)))
+
+        return attempts
+
+
+class FakeBedrockRuntimeClient(_FakeClient):
+    """A stand-in for a `bedrock-runtime` client, which invokes Anthropic models.
+
+    Completions contain every output of the canonical evaluator, and are cut at the first
+    stop sequence of the request. The test status and evaluation are always `A`, so each
+    test passes after a single turn.
+    """
+
+    def invoke_model(self, modelId: str, body: str) -> dict:
+        retry_attempts = self._call("InvokeModel")
+
+        request_body = json.loads(body)
+        completion = (
+            f"<thinking>{'x' * self._config.completion_bytes}</thinking>"
+            "<initial_prompt>What is the status of my claim?</initial_prompt>"
+            "<category>A</category>"
+            "<user_response>Thank you.</user_response>"
+        )
+
+        response_body = {
+            "content": [{"type": "text", "text": completion}],
+            "stop_reason": "end_turn",
+        }
+        for stop_sequence in request_body.get("stop_sequences", []):
+            if stop_sequence in completion:
+                response_body["content"][0]["text"] = completion.split(stop_sequence)[0]
+                response_body["stop_reason"] = "stop_sequence"
+                response_body["stop_sequence"] = stop_sequence
+                break
+
+        return {
+            "body": io.BytesIO(json.dumps(response_body).encode()),
+            "ResponseMetadata": {
+                "HTTPHeaders": {
+                    "x-amzn-bedrock-input-token-count": str(
+                        len(body) // _CHARS_PER_TOKEN
+                    ),
+                    "x-amzn-bedrock-output-token-count": str(
+                        len(completion) // _CHARS_PER_TOKEN
+                    ),
+                },
+                "RetryAttempts": retry_attempts,
+            },
+        }
+
+
+class FakeBedrockAgentRuntimeClient(_FakeClient):
+    """A stand-in for a `bedrock-agent-runtime` client, which invokes agents."""
+
+    def invoke_agent(self, inputText: str, **kwargs) -> dict:
+        retry_attempts = self._call("InvokeAgent")
+
+        trace = {
+            "orchestrationTrace": {
+                "rationale": {"text": "x" * self._config.agent_trace_bytes}
+            }
+        }
+        return {
+            "completion": [
+                {"trace": {"trace": trace}},
+                {"chunk": {"bytes": b"Your claim is open."}},
+            ],
+            "ResponseMetadata": {"RetryAttempts": retry_attempts},
+        }
+
+
+_FAKE_CLIENTS = {
+    "bedrock-runtime": FakeBedrockRuntimeClient,
+    "bedrock-agent-runtime": FakeBedrockAgentRuntimeClient,
+}
+
+
+class FakeSession:
+    """A stand-in for `boto3.Session`, which creates fake clients."""
+
+    def __init__(self, config: FakeAWSConfig, rng: random.Random, lock: threading.Lock):
+        self._config = config
+        self._rng = rng
+        self._lock = lock
+
+    def client(self, service_name: str, **kwargs) -> _FakeClient:
+        if service_name not in _FAKE_CLIENTS:
+            raise ValueError(f"Unsupported service: {service_name}")
+        return _FAKE_CLIENTS[service_name](self._config, self._rng, self._lock)
+
+
+@contextlib.contextmanager
+def fake_aws(config: FakeAWSConfig):
+    """Replace the `boto3` clients created by `agenteval` with fakes.
+
+    Args:
+        config (FakeAWSConfig): The behavior of the fake services.
+    """
+    rng = random.Random(config.seed)
+    lock = threading.Lock()
+
+    aws.clear_boto3_client_pool()
+    # the fakes are synchronous, so the asyncio engine invokes them in worker threads
+    with mock.patch.object(
+        aws.boto3,
+        "Session",
+        side_effect=lambda **kwargs: FakeSession(config, rng, lock),
+    ), mock.patch.object(
+        base_evaluator, "async_boto3_client_available", return_value=False
+    ):
+        try:
+            yield
+        finally:
+            aws.clear_boto3_client_pool()
@@ -0,0 +1,317 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Measure the throughput, CPU time, memory and latency of `Plan.run` against fake
+AWS services, across suite sizes, thread counts and engines.
+
+Usage:
+    python -m benchmarks.run --sizes 10 --sizes 100 --threads 8 --output results.json
+"""
+
+import concurrent.futures
+import dataclasses
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+
+import click
+from pydantic import PrivateAttr
+
+import agenteval
+from agenteval.metrics import calculate_latency_percentiles
+from agenteval.plan import Plan
+from agenteval.plan.exceptions import TestFailureError
+from agenteval.plan.plan import ENGINES
+from benchmarks.fake_aws import FakeAWSConfig, fake_aws
+
+_DEFAULT_SIZES = (10, 100, 1000, 10000)
+_DEFAULT_THREADS = (8, 45)
+_DEFAULT_ENGINES = ("threads",)
+
+_DEFAULT_OUTPUT = "benchmark_results.json"
+
+# `ru_maxrss` is reported in bytes on macOS and in kilobytes elsewhere
+_RSS_DIVISOR = 1024 * 1024 if sys.platform == "darwin" else 1024
+
+
+class _TimedPlan(Plan):
+    """A plan which records the latency of each test."""
+
+    _test_latencies: list[float] = PrivateAttr(default_factory=list)
+
+    def _run_test(self, test):
+        start = time.perf_counter()
+        try:
+            super()._run_test(test)
+        finally:
+            self._test_latencies.append(time.perf_counter() - start)
+
+    async def _arun_test(self, test):
+        start = time.perf_counter()
+        try:
+            await super()._arun_test(test)
+        finally:
+            self._test_latencies.append(time.perf_counter() - start)
+
+
+def create_plan_config(num_tests: int) -> dict:
+    """Create the configuration of a plan with single-step tests against a Bedrock agent.
+
+    Args:
+        num_tests (int): The number of tests.
+
+    Returns:
+        dict
+    """
+    return {
+        "evaluator": {"model": "claude-3", "aws_region": "us-east-1"},
+        "target": {
+            "type": "bedrock-agent",
+            "bedrock_agent_id": "BENCHMARK_AGENT_ID",
+            "bedrock_agent_alias_id": "BENCHMARK_AGENT_ALIAS_ID",
+            "aws_region": "us-east-1",
+        },
+        "tests": {
+            f"test_{i:05d}": {
+                "steps": [f"Ask the agent for the status of claim C-{i:05d}."],
+                "expected_results": ["The agent returns the status of the claim."],
+            }
+            for i in range(num_tests)
+        },
+    }
+
+
+def run_scenario(
+    num_tests: int, num_threads: int, engine: str, fake_aws_config: FakeAWSConfig
+) -> dict:
+    """Run a plan against fake AWS services and measure it.
+
+    Peak RSS is measured for the whole process, so each scenario should be run in a
+    new process.
+
+    Args:
+        num_tests (int): The number of tests.
+        num_threads (int): The number of threads passed to `Plan.run`.
+        engine (str): The engine passed to `Plan.run`.
+        fake_aws_config (FakeAWSConfig): The behavior of the fake services.
+
+    Returns:
+        dict: The measurements of the run.
+    """
+    plan = _TimedPlan(config=create_plan_config(num_tests))
+
+    with tempfile.TemporaryDirectory() as work_dir, fake_aws(fake_aws_config):
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            plan.run(
+                num_threads=num_threads,
+                work_dir=work_dir,
+                engine=engine,
+                use_cache=False,
+            )
+        except TestFailureError:
+            pass
+        wall_seconds = time.perf_counter() - wall_start
+        cpu_seconds = time.process_time() - cpu_start
+
+    test_latencies = calculate_latency_percentiles({"test": plan._test_latencies})
+
+    return {
+        "num_tests": num_tests,
+        "num_threads": num_threads,
+        "engine": engine,
+        "failed_tests": num_tests - plan._pass_count,
+        "wall_seconds": round(wall_seconds, 3),
+        "tests_per_second": round(num_tests / wall_seconds, 3),
+        "cpu_seconds_per_test": round(cpu_seconds / num_tests, 6),
+        "peak_rss_mb": round(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / _RSS_DIVISOR, 1
+        ),
+        "test_latency": test_latencies.get("test", {}),
+        "step_latencies": calculate_latency_percentiles(plan._durations),
+    }
+
+
+def run_benchmarks(
+    sizes: list[int],
+    threads: list[int],
+    engines: list[str],
+    fake_aws_config: FakeAWSConfig,
+    isolate: bool = True,
+) -> dict:
+    """Run a scenario for each combination of suite size, thread count and engine.
+
+    Args:
+        sizes (list[int]): The numbers of tests.
+        threads (list[int]): The numbers of threads.
+        engines (list[str]): The engines.
+        fake_aws_config (FakeAWSConfig): The behavior of the fake services.
+        isolate (bool): Whether to run each scenario in a new process, so peak RSS
+            is measured per scenario.
+
+    Returns:
+        dict: The environment, configuration and results of the benchmarks.
+    """
+    results = []
+    for engine in engines:
+        for num_threads in threads:
+            for num_tests in sizes:
+                args = (num_tests, num_threads, engine, fake_aws_config)
+                if isolate:
+                    result = _run_isolated(*args)
+                else:
+                    result = run_scenario(*args)
+                results.append(result)
+                _echo_result(result)
+
+    return {
+        "agenteval_version": agenteval.__version__,
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "fake_aws": dataclasses.asdict(fake_aws_config),
+        "results": results,
+    }
+
+
+def _run_isolated(*args) -> dict:
+    # spawn, so the child does not inherit the memory of earlier scenarios
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=1, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        return executor.submit(run_scenario, *args).result()
+
+
+def _echo_result(result: dict):
+    latency = result["test_latency"]
+    click.echo(
+        f"{result['engine']:>8} {result['num_threads']:>4} threads "
+        f"{result['num_tests']:>6} tests: "
+        f"{result['tests_per_second']:>9.2f} tests/s, "
+        f"{result['cpu_seconds_per_test'] * 1000:.3f} ms CPU/test, "
+        f"{result['peak_rss_mb']:.1f} MB peak RSS, "
+        f"p50 {latency.get('p50')}s, p99 {latency.get('p99')}s"
+    )
+
+
+@click.command()
+@click.option(
+    "--sizes",
+    type=int,
+    multiple=True,
+    default=_DEFAULT_SIZES,
+    show_default=True,
+    help="The number of tests in each suite. Can be repeated.",
+)
+@click.option(
+    "--threads",
+    type=int,
+    multiple=True,
+    default=_DEFAULT_THREADS,
+    show_default=True,
+    help="The number of threads used to run each suite. Can be repeated.",
+)
+@click.option(
+    "--engine",
+    "engines",
+    type=click.Choice(ENGINES),
+    multiple=True,
+    default=_DEFAULT_ENGINES,
+    show_default=True,
+    help="The engine used to run each suite. Can be repeated.",
+)
+@click.option(
+    "--latency",
+    type=float,
+    default=FakeAWSConfig.latency,
+    show_default=True,
+    help="The mean latency of each call to the fake services in seconds.",
+)
+@click.option(
+    "--jitter",
+    type=float,
+    default=FakeAWSConfig.jitter,
+    show_default=True,
+    help="The fraction of the latency by which each call may vary.",
+)
+@click.option(
+    "--throttle-rate",
+    type=float,
+    default=FakeAWSConfig.throttle_rate,
+    show_default=True,
+    help="The probability of each attempt to call the fake services being throttled.",
+)
+@click.option(
+    "--completion-bytes",
+    type=int,
+    default=FakeAWSConfig.completion_bytes,
+    show_default=True,
+    help="The size of the reasoning in each completion of the fake model.",
+)
+@click.option(
+    "--agent-trace-bytes",
+    type=int,
+    default=FakeAWSConfig.agent_trace_bytes,
+    show_default=True,
+    help="The size of the trace returned with each response of the fake agent.",
+)
+@click.option(
+    "--seed",
+    type=int,
+    default=FakeAWSConfig.seed,
+    show_default=True,
+    help="The seed of the latency and throttling of the fake services.",
+)
+@click.option(
+    "--output",
+    type=str,
+    default=_DEFAULT_OUTPUT,
+    show_default=True,
+    help="The path of the JSON file the results are written to.",
+)
+@click.option(
+    "--no-isolate",
+    is_flag=True,
+    help="Run every scenario in this process. Peak RSS is then the peak of all scenarios so far.",
+)
+def main(
+    sizes: tuple[int],
+    threads: tuple[int],
+    engines: tuple[str],
+    latency: float,
+    jitter: float,
+    throttle_rate: float,
+    completion_bytes: int,
+    agent_trace_bytes: int,
+    seed: int,
+    output: str,
+    no_isolate: bool,
+):
+    fake_aws_config = FakeAWSConfig(
+        latency=latency,
+        jitter=jitter,
+        throttle_rate=throttle_rate,
+        completion_bytes=completion_bytes,
+        agent_trace_bytes=agent_trace_bytes,
+        seed=seed,
+    )
+    report = run_benchmarks(
+        list(sizes),
+        list(threads),
+        list(engines),
+        fake_aws_config,
+        isolate=not no_isolate,
+    )
+
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    click.echo(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
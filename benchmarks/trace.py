@@ -0,0 +1,137 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Measure the cost of adding a step to a trace, for each trace format and compression,
+with and without an explicit step name.
+
+Usage:
+    python -m benchmarks.trace --steps 10000 --output trace_results.json
+"""
+
+import json
+import platform
+import tempfile
+import time
+from importlib.util import find_spec
+from typing import Optional
+
+import click
+
+import agenteval
+from agenteval.trace import TRACE_FORMATS, Trace
+
+_DEFAULT_STEPS = 10000
+
+_DEFAULT_OUTPUT = "trace_benchmark_results.json"
+
+
+def run_scenario(
+    num_steps: int,
+    format: str,
+    compression: Optional[str],
+    explicit_name: bool,
+    work_dir: str,
+) -> dict:
+    """Add steps to a trace, and measure the time taken per step.
+
+    Args:
+        num_steps (int): The number of steps.
+        format (str): The format of the trace file.
+        compression (Optional[str]): The compression of the trace file.
+        explicit_name (bool): Whether the step name is passed, instead of being
+            resolved from the caller.
+        work_dir (str): The directory the trace is written to.
+
+    Returns:
+        dict: The configuration and results of the scenario.
+    """
+    trace = Trace(
+        f"{format}_{compression}_{explicit_name}",
+        work_dir,
+        format=format,
+        compression=compression,
+    )
+
+    with trace:
+        start = time.perf_counter()
+        for _ in range(num_steps):
+            if explicit_name:
+                trace.add_step(step_name="step", data="test data")
+            else:
+                trace.add_step(data="test data")
+        elapsed = time.perf_counter() - start
+
+    return {
+        "format": format,
+        "compression": compression,
+        "explicit_name": explicit_name,
+        "num_steps": num_steps,
+        "microseconds_per_step": elapsed / num_steps * 1_000_000,
+    }
+
+
+def run_benchmarks(num_steps: int, work_dir: str) -> dict:
+    """Run a scenario for each trace format and compression, with and without an
+    explicit step name.
+
+    `zstd` compression is only measured if `zstandard` is installed.
+
+    Args:
+        num_steps (int): The number of steps added in each scenario.
+        work_dir (str): The directory the traces are written to.
+
+    Returns:
+        dict: The environment and results of the benchmarks.
+    """
+    compressions = [None, "gzip"]
+    if find_spec("zstandard") is not None:
+        compressions.append("zstd")
+
+    results = []
+    for format in TRACE_FORMATS:
+        for compression in compressions:
+            for explicit_name in (True, False):
+                result = run_scenario(
+                    num_steps, format, compression, explicit_name, work_dir
+                )
+                results.append(result)
+                click.echo(
+                    f"{format:>5} {str(compression):>5} "
+                    f"{'explicit' if explicit_name else 'default':>8} name: "
+                    f"{result['microseconds_per_step']:.2f} µs/step"
+                )
+
+    return {
+        "agenteval_version": agenteval.__version__,
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+@click.command()
+@click.option(
+    "--steps",
+    type=int,
+    default=_DEFAULT_STEPS,
+    show_default=True,
+    help="The number of steps added in each scenario.",
+)
+@click.option(
+    "--output",
+    type=str,
+    default=_DEFAULT_OUTPUT,
+    show_default=True,
+    help="The path of the JSON file the results are written to.",
+)
+def main(steps: int, output: str):
+    with tempfile.TemporaryDirectory() as work_dir:
+        report = run_benchmarks(steps, work_dir)
+
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    click.echo(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,6 @@
 import datetime
 import os
 import shutil
-import threading
-import time
 
 import streamlit as st
 import yaml
@@ -11,7 +9,6 @@ from utils.db_handling import insert_result
 from utils.state_handling import StateKeyEnum, check_state
 
 from agenteval.plan import Plan
-from agenteval.runner import Runner
 
 # Check if all the paths were set if not go back to the Home page
 check_state(st.session_state)
@@ -24,7 +21,7 @@ try:
     with open(plan_path, "r") as f:
         plan_config = yaml.safe_load(f)
         st.json(plan_config)
-        plan = Plan.load(plan_dir=plan_dir, filter=None)
+        plan = Plan.load(plan_dir=plan_dir)
 except Exception as e:
     st.error(f"Failed to load plan: {e}")
     st.button("Reconfigure your test plan!")
@@ -36,35 +33,24 @@ if st.button("Run test"):
     test_result_dir = os.path.join(result_dir, created_at)
 
     # Run the test
-    runner = Runner(
-        plan=plan,
-        verbose=False,
-        num_threads=None,
-        work_dir=test_result_dir,
-    )
+    num_tests = len(plan.config["tests"])
     finished_at, status, test_passed_rate = None, None, None
     try:
-        # Start the test in a separate thread 
-        runner_thread = threading.Thread(target=runner.run)
-        runner_thread.start()
         progress_bar = st.progress(0, text="Test is running ...")
-        st.write(f"Starting {runner.num_tests} tests with max {runner.num_threads} workers.")
+        st.write(f"Starting {num_tests} tests.")
         start_time = datetime.datetime.now()
-        num_completed = 0
-        # Wait for the test to complete
-        while num_completed < runner.num_tests:
-            time.sleep(1)
-            num_completed = len(list(filter(lambda x: x != None, runner.results.values())))
-            percentage = num_completed / runner.num_tests
-            progress_bar.progress(percentage, f'Progress: {percentage * 100} %')
-        runner_thread.join()
+        num_completed, num_passed = 0, 0
+        # Results are yielded as soon as each test completes
+        for entry in plan.iter_results(work_dir=test_result_dir):
+            num_completed += 1
+            num_passed += int(entry.result.passed)
+            percentage = num_completed / num_tests
+            progress_bar.progress(percentage, f'Progress: {percentage * 100:.0f} %')
         now = datetime.datetime.now()
         st.success(f"Test completed in {(now - start_time).total_seconds()} seconds")
         status = "completed"
         finished_at = now.strftime("%Y-%m-%d %H:%M:%S")
-        test_passed_rate = (
-            f"{runner.num_tests - runner.num_failed} / {runner.num_tests}"
-        )
+        test_passed_rate = f"{num_passed} / {num_tests}"
         with open(os.path.join(result_dir, created_at, "agenteval_summary.md")) as f:
             result = f.read()
             # Fix: patch the emoji rendering
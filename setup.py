@@ -34,7 +34,12 @@ setup(
     long_description_content_type="text/markdown",
     python_requires=REQUIRES_PYTHON,
     install_requires=read("requirements.txt").splitlines(),
-    extras_require={"dev": read("requirements-dev.txt").splitlines()},
+    extras_require={
+        "dev": read("requirements-dev.txt").splitlines(),
+        "async": ["aiobotocore>=2.13.0,<4.0"],
+        "zstd": ["zstandard>=0.22.0"],
+        "otel": ["opentelemetry-api>=1.20.0"],
+    },
     entry_points={"console_scripts": ["agenteval=agenteval.cli:cli"]},
     author=AUTHOR,
     author_email=EMAIL,
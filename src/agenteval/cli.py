@@ -1,6 +1,7 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 
+import contextlib
 import os
 from enum import Enum
 from typing import Optional
@@ -9,6 +10,11 @@ import click
 
 from agenteval.plan import Plan
 from agenteval.plan.exceptions import TestFailureError
+from agenteval.plan.logging import log_profile
+from agenteval.plan.plan import ENGINES
+from agenteval.utils.profiler import SamplingProfiler
+
+_PROFILE_FILE_NAME = "agenteval_profile.folded"
 
 
 class ExitCode(Enum):
@@ -69,7 +75,7 @@ def init(plan_dir: Optional[str]):
     "--num-threads",
     type=int,
     required=False,
-    help="Number of threads used to run tests concurrently. If the number of threads is not provided, the thread count will be set to the number of tests (up to a maximum of 45 threads).",
+    help="Number of threads used to run tests concurrently. When using the asyncio engine, this is the number of tests run concurrently. If the number of threads is not provided, the thread count will be set to the number of tests (up to a maximum of 45 threads).",
 )
 @click.option(
     "--work-dir",
@@ -78,18 +84,151 @@ def init(plan_dir: Optional[str]):
     help="The directory where the test result and trace will be generated. If a directory is not provided, the assets will be saved to the current working directory.",
     callback=validate_directory,
 )
+@click.option(
+    "--engine",
+    type=click.Choice(ENGINES),
+    default="threads",
+    show_default=True,
+    help="The engine used to run tests concurrently. The asyncio engine runs up to --num-threads tests concurrently on a single event loop, and requires the `async` extra to invoke the evaluator model without blocking a thread.",
+)
+@click.option(
+    "--adaptive-concurrency",
+    is_flag=True,
+    type=bool,
+    default=False,
+    help="Whether to start with a single test in flight and adjust the number of tests in flight, up to --num-threads, based on throttling and latency of calls to the evaluator and target. Defaults to False.",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    type=bool,
+    default=False,
+    help="Whether to disable the completion cache configured for the evaluator. Defaults to False.",
+)
+@click.option(
+    "--refresh-cache",
+    is_flag=True,
+    type=bool,
+    default=False,
+    help="Whether to ignore existing entries in the completion cache configured for the evaluator, and replace them. Defaults to False.",
+)
+@click.option(
+    "--record-cassette",
+    type=str,
+    required=False,
+    help="The path of a cassette file to record the target's responses to, so they can be replayed with --replay-cassette. The file is compressed with gzip if the path ends with .gz.",
+)
+@click.option(
+    "--replay-cassette",
+    type=str,
+    required=False,
+    help="The path of a cassette file recorded with --record-cassette. The target's responses are replayed from the cassette instead of invoking the target.",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    type=bool,
+    default=False,
+    help="Whether to profile the run by sampling the stacks of the threads running it. The wall-clock and CPU time of each phase and the top hotspots are printed, and the samples are saved as folded stacks to agenteval_profile.folded in the work directory, which can be read by flame graph tools. Defaults to False.",
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    type=bool,
+    default=False,
+    help="Whether to resume an interrupted run by skipping the tests whose results were saved to agenteval_journal.jsonl in the work directory. The summary includes the results of the skipped tests. Defaults to False.",
+)
+@click.option(
+    "--changed-only",
+    is_flag=True,
+    type=bool,
+    default=False,
+    help="Whether to only run the tests whose fingerprint changed since their results were saved to agenteval_journal.jsonl in the work directory. A test's fingerprint covers the test, the evaluator and target configurations, including the target's version, and the evaluator templates. The summary includes the reused results. Defaults to False.",
+)
+@click.option(
+    "--rerun-failed",
+    is_flag=True,
+    type=bool,
+    default=False,
+    help="Like --changed-only, but also run the tests which failed. Defaults to False.",
+)
+@click.option(
+    "--last-failed",
+    is_flag=True,
+    type=bool,
+    default=False,
+    help="Whether to only run the tests which failed in the previous run, according to agenteval_journal.jsonl in the work directory. If no tests failed, every test is run. Defaults to False.",
+)
+@click.option(
+    "--failed-first",
+    is_flag=True,
+    type=bool,
+    default=False,
+    help="Whether to start the tests which failed in the previous run, according to agenteval_journal.jsonl in the work directory, before the other tests. Defaults to False.",
+)
 def run(
     filter: Optional[str],
     plan_dir: Optional[str],
     verbose: bool,
     num_threads: Optional[int],
     work_dir: Optional[str],
+    engine: str,
+    adaptive_concurrency: bool,
+    no_cache: bool,
+    refresh_cache: bool,
+    record_cassette: Optional[str],
+    replay_cassette: Optional[str],
+    profile: bool,
+    resume: bool,
+    changed_only: bool,
+    rerun_failed: bool,
+    last_failed: bool,
+    failed_first: bool,
 ):
+    profiler = SamplingProfiler() if profile else None
+    if profiler:
+        profiler.start()
+
     try:
-        plan = Plan.load(plan_dir)
+        with profiler.phase("load") if profiler else contextlib.nullcontext():
+            plan = Plan.load(plan_dir)
         plan.run(
-            verbose=verbose, num_threads=num_threads, work_dir=work_dir, filter=filter
+            verbose=verbose,
+            num_threads=num_threads,
+            work_dir=work_dir,
+            filter=filter,
+            engine=engine,
+            adaptive_concurrency=adaptive_concurrency,
+            use_cache=not no_cache,
+            refresh_cache=refresh_cache,
+            record_cassette=record_cassette,
+            replay_cassette=replay_cassette,
+            profiler=profiler,
+            resume=resume,
+            rerun=_get_rerun_mode(changed_only, rerun_failed),
+            last_failed=last_failed,
+            failed_first=failed_first,
         )
 
     except TestFailureError:
         exit(ExitCode.TESTS_FAILED.value)
+
+    finally:
+        if profiler:
+            _write_profile(profiler, work_dir)
+
+
+def _write_profile(profiler: SamplingProfiler, work_dir: Optional[str]):
+    profiler.stop()
+    path = os.path.join(work_dir or os.getcwd(), _PROFILE_FILE_NAME)
+    profiler.write_folded(path)
+    log_profile(profiler.phase_timings, profiler.hotspots(), path)
+
+
+def _get_rerun_mode(changed_only: bool, rerun_failed: bool) -> Optional[str]:
+    # failed tests are rerun in addition to changed tests
+    if rerun_failed:
+        return "failed"
+    if changed_only:
+        return "changed"
+    return None
@@ -1,20 +1,73 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 
+import contextlib
+import contextvars
+import io
 import json
+import threading
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from typing import Optional
 
 from agenteval.conversation import Conversation
+from agenteval.evaluators.bedrock_request.bedrock_request_handler import (
+    BedrockRequestHandler,
+)
 from agenteval.evaluators.model_config.bedrock_model_config import BedrockModelConfig
 from agenteval.hook import Hook
 from agenteval.targets import BaseTarget
 from agenteval.test import Test, TestResult
 from agenteval.trace import Trace
-from agenteval.utils import create_boto3_client, import_class
+from agenteval.utils import create_boto3_client, import_class, telemetry
+from agenteval.utils.aws import (
+    async_boto3_client_available,
+    create_async_boto3_client,
+)
+from agenteval.utils.cache import CompletionCache
+from agenteval.utils.concurrency import (
+    AdaptiveConcurrencyLimiter,
+    ConcurrencyLimiter,
+    to_thread,
+)
+from agenteval.utils.rate_limiter import estimate_token_count, get_rate_limiter
 
 _BOTO3_SERVICE_NAME = "bedrock-runtime"
 
+# the token counts of a response are sent in headers with this prefix
+_BEDROCK_HEADER_PREFIX = "x-amzn-bedrock-"
+
+# sent in the last chunk of a stream
+_INVOCATION_METRICS_KEY = "amazon-bedrock-invocationMetrics"
+
+
+@dataclass
+class TokenUsage:
+    """The tokens used by calls to the model."""
+
+    input_token_count: int = 0
+    output_token_count: int = 0
+
+
+# collects the tokens used by calls to the model in the current context, see `track_token_usage`
+_token_usage: contextvars.ContextVar[Optional[TokenUsage]] = contextvars.ContextVar(
+    "token_usage", default=None
+)
+
+# the stage of the evaluation making calls to the model in the current context, see `track_stage`
+_stage: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "stage", default=None
+)
+
+
+@dataclass
+class _StreamedCompletion:
+    completion: str = ""
+    input_token_count: int = 0
+    output_token_count: Optional[int] = None
+    cache_read_input_token_count: int = 0
+    cache_write_input_token_count: int = 0
+
 
 class BaseEvaluator(ABC):
     """The `BaseEvaluator` abstract base class defines the common interface for evaluator
@@ -28,6 +81,8 @@ class BaseEvaluator(ABC):
         test_result (TestResult): The result of the test which is set in `BaseEvaluator.run`.
         input_token_count (int): Number of input tokens processed by the evaluator.
         output_token_count (int): Number of output tokens generated by the evaluator.
+        cache_read_input_token_count (int): Number of input tokens read from the prompt cache by the evaluator.
+        cache_write_input_token_count (int): Number of input tokens written to the prompt cache by the evaluator.
         model_config (BedrockModelConfig): A configuration of the bedrock model being used. If `provisioned_throughput_arn` is provided,
             then the model_id will be set to the ARN of the provisioned throughput.
         boto3_client (BaseClient): A `boto3` client representing Amazon Bedrock Runtime.
@@ -44,6 +99,14 @@ class BaseEvaluator(ABC):
         aws_region: Optional[str] = None,
         endpoint_url: Optional[str] = None,
         max_retry: int = 10,
+        rate_limits: Optional[dict[str, dict]] = None,
+        concurrency_limiter: Optional[ConcurrencyLimiter] = None,
+        target_concurrency_limiter: Optional[ConcurrencyLimiter] = None,
+        adaptive_concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        streaming: bool = False,
+        prompt_caching: bool = False,
+        completion_cache: Optional[CompletionCache] = None,
+        trace_config: Optional[dict] = None,
     ):
         """Initialize the evaluator.
 
@@ -58,6 +121,19 @@ class BaseEvaluator(ABC):
             aws_region (Optional[str]): The AWS region.
             endpoint_url (Optional[str]): The endpoint URL for the AWS service.
             max_retry (int): The maximum number of retry attempts.
+            rate_limits (Optional[dict[str, dict]]): A map of model IDs to the `requests_per_minute`
+                and `tokens_per_minute` allowed for the model. Limits are shared by all tests in the process.
+            concurrency_limiter (Optional[ConcurrencyLimiter]): Limits the number of calls to the model in flight.
+            target_concurrency_limiter (Optional[ConcurrencyLimiter]): Limits the number of calls to the target in flight.
+            adaptive_concurrency_limiter (Optional[AdaptiveConcurrencyLimiter]): Observes calls to the model and the
+                target, so the number of tests in flight can be adjusted when they are throttled.
+            streaming (bool): Whether to invoke the model with a response stream, so evaluators can stop
+                reading the completion once they have the output they need.
+            prompt_caching (bool): Whether to cache the prefixes of prompts which are repeated by later requests.
+                Only supported for Anthropic models which support prompt caching on Amazon Bedrock.
+            completion_cache (Optional[CompletionCache]): A cache of completions shared by all tests, which
+                is read before invoking the model. Responses served from the cache do not count towards token counts.
+            trace_config (Optional[dict]): Keyword arguments for the `Trace`, such as its `format`.
         """
         # overwrite the model_id with the provisioned_throughput_arn if provided, keep the request_config the same.
         if provisioned_throughput_arn:
@@ -68,18 +144,39 @@ class BaseEvaluator(ABC):
         self.test = test
         self.target = target
         self.conversation = Conversation()
-        self.trace = Trace(work_dir=work_dir, test_name=test.name)
+        self.trace = Trace(
+            work_dir=work_dir, test_name=test.name, **(trace_config or {})
+        )
         self.test_result = None
         self.input_token_count = 0
         self.output_token_count = 0
+        self.cache_read_input_token_count = 0
+        self.cache_write_input_token_count = 0
+        # calls to the model may be made concurrently by the same evaluator
+        self._token_count_lock = threading.Lock()
         self.model_config = model_config
-        self.bedrock_runtime_client = create_boto3_client(
-            boto3_service_name=_BOTO3_SERVICE_NAME,
-            aws_profile=aws_profile,
-            aws_region=aws_region,
-            endpoint_url=endpoint_url,
-            max_retry=max_retry,
+        self._boto3_client_args = {
+            "boto3_service_name": _BOTO3_SERVICE_NAME,
+            "aws_profile": aws_profile,
+            "aws_region": aws_region,
+            "endpoint_url": endpoint_url,
+            "max_retry": max_retry,
+        }
+        self.bedrock_runtime_client = create_boto3_client(**self._boto3_client_args)
+        # a null context supports both `with` and `async with`
+        self._concurrency_limiter = concurrency_limiter or contextlib.nullcontext()
+        self._target_concurrency_limiter = (
+            target_concurrency_limiter or contextlib.nullcontext()
         )
+        self._adaptive_concurrency_limiter = adaptive_concurrency_limiter
+        self.streaming = streaming
+        self.prompt_caching = prompt_caching
+        self._completion_cache = completion_cache
+        self._rate_limiter = None
+        if rate_limits and model_config.model_id in rate_limits:
+            self._rate_limiter = get_rate_limiter(
+                model_config.model_id, **rate_limits[model_config.model_id]
+            )
 
     @abstractmethod
     def evaluate(self) -> TestResult:
@@ -90,6 +187,83 @@ class BaseEvaluator(ABC):
         """
         pass
 
+    async def aevaluate(self) -> TestResult:
+        """Conduct the test from the `asyncio` engine.
+
+        By default, `evaluate` is run in a worker thread. Override this method
+        to conduct the test natively with `asyncio`.
+
+        Returns:
+            TestResult
+        """
+        return await to_thread(self.evaluate)
+
+    @classmethod
+    def max_concurrent_calls(cls, **config) -> int:
+        """Get the maximum number of calls to AWS services a test makes at the same
+        time, which is used to size the connection pools shared by the tests.
+
+        Args:
+            **config: The configuration the evaluator is created with.
+
+        Returns:
+            int
+        """
+        return 1
+
+    @staticmethod
+    @contextlib.contextmanager
+    def track_token_usage():
+        """Track the tokens used by calls to the model made in the current thread
+        or task, in addition to the totals of the evaluator.
+
+        Contexts can be nested, in which case the tokens used within the inner context
+        are also counted by the outer context.
+
+        Yields:
+            TokenUsage: The tokens used by calls made within the context.
+        """
+        outer_usage = _token_usage.get()
+        usage = TokenUsage()
+        token = _token_usage.set(usage)
+        try:
+            yield usage
+        finally:
+            _token_usage.reset(token)
+            if outer_usage:
+                outer_usage.input_token_count += usage.input_token_count
+                outer_usage.output_token_count += usage.output_token_count
+
+    @staticmethod
+    @contextlib.contextmanager
+    def track_stage(stage: str):
+        """Attribute the calls to the model made in the current thread or task to a
+        stage of the evaluation, such as generating the test status.
+
+        With adaptive concurrency, the latency of each call is compared to earlier calls
+        for the same stage, since stages generate outputs of very different lengths.
+
+        Args:
+            stage (str): The name of the stage.
+        """
+        token = _stage.set(stage)
+        try:
+            yield
+        finally:
+            _stage.reset(token)
+
+    @contextlib.contextmanager
+    def _observe(self, source: str):
+        stage = _stage.get()
+        with telemetry.count_throttles(source), (
+            self._adaptive_concurrency_limiter.observe(
+                f"{source}.{stage}" if stage else source
+            )
+            if self._adaptive_concurrency_limiter
+            else contextlib.nullcontext()
+        ):
+            yield
+
     def _get_hook_cls(self, hook: Optional[str]) -> Optional[type[Hook]]:
         if hook:
             hook_cls = import_class(hook, parent_class=Hook)
@@ -109,23 +283,345 @@ class BaseEvaluator(ABC):
             dict: The response from the model invocation.
 
         """
-        response = self.bedrock_runtime_client.invoke_model(
-            modelId=self.model_config.model_id, body=json.dumps(request_body)
-        )
+        body = json.dumps(request_body)
+
+        cache_key = self._get_cache_key(body)
+        if cached_response := self._get_cached_response(cache_key):
+            return cached_response
+
+        reserved_tokens = 0
+        if self._rate_limiter:
+            reserved_tokens = self._rate_limiter.acquire(
+                self._estimate_token_count(request_body, body)
+            )
+
+        try:
+            with self._observe("evaluator"):
+                response = self.bedrock_runtime_client.invoke_model(
+                    modelId=self.model_config.model_id, body=body
+                )
+        except Exception:
+            self._settle_tokens(reserved_tokens)
+            raise
 
-        self._incr_token_counts(response)
+        self._record_token_counts(reserved_tokens, *self._get_token_counts(response))
+        self._observe_retries(response)
+        self._cache_response(cache_key, response)
 
         return response
 
-    def _incr_token_counts(self, response: dict):
+    async def ainvoke_model(self, request_body: dict) -> dict:
+        """
+        Invoke the Bedrock model from the `asyncio` engine.
+
+        If `aiobotocore` is installed, the model is invoked using an async client.
+        Otherwise, `invoke_model` is run in a worker thread. The response body is
+        read before returning, so the response can be parsed the same way as a
+        response from `invoke_model`.
+
+        Args:
+            request_body (dict): The request payload as a dictionary.
+
+        Returns:
+            dict: The response from the model invocation.
+        """
+        if not async_boto3_client_available():
+            return await to_thread(self.invoke_model, request_body)
+
+        body = json.dumps(request_body)
+
+        cache_key = self._get_cache_key(body)
+        if cached_response := self._get_cached_response(cache_key):
+            return cached_response
+
+        reserved_tokens = 0
+        if self._rate_limiter:
+            reserved_tokens = await self._rate_limiter.aacquire(
+                self._estimate_token_count(request_body, body)
+            )
+
+        try:
+            client = await create_async_boto3_client(**self._boto3_client_args)
+            with self._observe("evaluator"):
+                response = await client.invoke_model(
+                    modelId=self.model_config.model_id, body=body
+                )
+
+            async with response["body"] as stream:
+                response["body"] = io.BytesIO(await stream.read())
+        except Exception:
+            self._settle_tokens(reserved_tokens)
+            raise
+
+        self._record_token_counts(reserved_tokens, *self._get_token_counts(response))
+        self._observe_retries(response)
+        self._cache_response(cache_key, response)
+
+        return response
+
+    def invoke_model_with_response_stream(
+        self, request_body: dict, stop: Optional[str] = None
+    ) -> str:
+        """
+        Invoke the Bedrock model using the `InvokeModelWithResponseStream` API and
+        return the completion.
+
+        If `stop` is provided, the stream is closed as soon as `stop` appears in the
+        completion, so the rest of the completion is neither waited for nor returned.
+
+        Args:
+            request_body (dict): The request payload as a dictionary.
+            stop (Optional[str]): The text after which to stop reading the completion.
+
+        Returns:
+            str: The completion, up to and including `stop`.
+        """
+        body = json.dumps(request_body)
+
+        # the completion depends on where the stream is closed
+        cache_key = self._get_cache_key(body, stop or "")
+        if cached_completion := self._get_cached_completion(cache_key):
+            return cached_completion
+
+        reserved_tokens = 0
+        if self._rate_limiter:
+            reserved_tokens = self._rate_limiter.acquire(
+                self._estimate_token_count(request_body, body)
+            )
+
+        streamed = _StreamedCompletion()
+        try:
+            with self._observe("evaluator"):
+                response = (
+                    self.bedrock_runtime_client.invoke_model_with_response_stream(
+                        modelId=self.model_config.model_id, body=body
+                    )
+                )
+                try:
+                    for event in response["body"]:
+                        if self._read_stream_event(event, streamed, stop):
+                            break
+                finally:
+                    response["body"].close()
+        except Exception:
+            self._settle_tokens(reserved_tokens, streamed.input_token_count)
+            raise
+
+        self._record_streamed_token_counts(reserved_tokens, streamed)
+        self._observe_retries(response)
+        if cache_key:
+            self._completion_cache.put(cache_key, {"completion": streamed.completion})
+
+        return streamed.completion
+
+    async def ainvoke_model_with_response_stream(
+        self, request_body: dict, stop: Optional[str] = None
+    ) -> str:
+        """
+        Invoke the Bedrock model using the `InvokeModelWithResponseStream` API from
+        the `asyncio` engine and return the completion.
+
+        If `aiobotocore` is installed, the model is invoked using an async client.
+        Otherwise, `invoke_model_with_response_stream` is run in a worker thread.
+
+        Args:
+            request_body (dict): The request payload as a dictionary.
+            stop (Optional[str]): The text after which to stop reading the completion.
+
+        Returns:
+            str: The completion, up to and including `stop`.
+        """
+        if not async_boto3_client_available():
+            return await to_thread(
+                self.invoke_model_with_response_stream, request_body, stop
+            )
+
+        body = json.dumps(request_body)
+
+        cache_key = self._get_cache_key(body, stop or "")
+        if cached_completion := self._get_cached_completion(cache_key):
+            return cached_completion
+
+        reserved_tokens = 0
+        if self._rate_limiter:
+            reserved_tokens = await self._rate_limiter.aacquire(
+                self._estimate_token_count(request_body, body)
+            )
+
+        streamed = _StreamedCompletion()
+        try:
+            client = await create_async_boto3_client(**self._boto3_client_args)
+            with self._observe("evaluator"):
+                response = await client.invoke_model_with_response_stream(
+                    modelId=self.model_config.model_id, body=body
+                )
+                try:
+                    async for event in response["body"]:
+                        if self._read_stream_event(event, streamed, stop):
+                            break
+                finally:
+                    response["body"].close()
+        except Exception:
+            self._settle_tokens(reserved_tokens, streamed.input_token_count)
+            raise
+
+        self._record_streamed_token_counts(reserved_tokens, streamed)
+        self._observe_retries(response)
+        if cache_key:
+            self._completion_cache.put(cache_key, {"completion": streamed.completion})
+
+        return streamed.completion
+
+    def _get_cache_key(self, body: str, *parts: str) -> Optional[str]:
+        if self._completion_cache:
+            return CompletionCache.make_key(self.model_config.model_id, body, *parts)
+
+    def _get_cached_response(self, cache_key: Optional[str]) -> Optional[dict]:
+        if cache_key and (entry := self._completion_cache.get(cache_key)):
+            return {
+                "body": io.BytesIO(entry["body"].encode()),
+                "ResponseMetadata": {"HTTPHeaders": entry["headers"]},
+            }
+
+    def _get_cached_completion(self, cache_key: Optional[str]) -> Optional[str]:
+        if cache_key and (entry := self._completion_cache.get(cache_key)):
+            return entry["completion"]
+
+    def _cache_response(self, cache_key: Optional[str], response: dict):
+        if not cache_key:
+            return
+
+        # the body can only be read once, so it is replaced for the caller
+        body = response["body"].read()
+        response["body"] = io.BytesIO(body)
+
         headers = response["ResponseMetadata"]["HTTPHeaders"]
+        self._completion_cache.put(
+            cache_key,
+            {
+                "body": body.decode(),
+                "headers": {
+                    name: value
+                    for name, value in headers.items()
+                    if name.startswith(_BEDROCK_HEADER_PREFIX)
+                },
+            },
+        )
 
-        self.input_token_count += int(
-            headers.get("x-amzn-bedrock-input-token-count", 0)
+    def _read_stream_event(
+        self, event: dict, streamed: _StreamedCompletion, stop: Optional[str]
+    ) -> bool:
+        if "chunk" not in event:
+            return False
+
+        chunk = json.loads(event["chunk"]["bytes"])
+
+        streamed.completion += BedrockRequestHandler.parse_completion_from_chunk(
+            chunk, self.model_config
+        )
+
+        input_token_counts = BedrockRequestHandler.parse_input_token_counts_from_chunk(
+            chunk, self.model_config
         )
-        self.output_token_count += int(
-            headers.get("x-amzn-bedrock-output-token-count", 0)
+        if input_token_counts is not None:
+            (
+                streamed.input_token_count,
+                streamed.cache_read_input_token_count,
+                streamed.cache_write_input_token_count,
+            ) = input_token_counts
+
+        output_token_count = BedrockRequestHandler.parse_output_token_count_from_chunk(
+            chunk, self.model_config
         )
+        if output_token_count is not None:
+            streamed.output_token_count = output_token_count
+
+        if metrics := chunk.get(_INVOCATION_METRICS_KEY):
+            streamed.input_token_count = metrics["inputTokenCount"]
+            streamed.output_token_count = metrics["outputTokenCount"]
+            streamed.cache_read_input_token_count = metrics.get(
+                "cacheReadInputTokenCount", 0
+            )
+            streamed.cache_write_input_token_count = metrics.get(
+                "cacheWriteInputTokenCount", 0
+            )
+
+        return bool(stop) and stop in streamed.completion
+
+    def _record_streamed_token_counts(
+        self, reserved_tokens: int, streamed: _StreamedCompletion
+    ):
+        # the output token count is sent at the end of the stream, so it is
+        # estimated from the completion if the stream was closed before it was sent
+        output_token_count = streamed.output_token_count
+        if output_token_count is None:
+            output_token_count = estimate_token_count(streamed.completion)
+
+        self._record_token_counts(
+            reserved_tokens,
+            streamed.input_token_count,
+            output_token_count,
+            streamed.cache_read_input_token_count,
+            streamed.cache_write_input_token_count,
+        )
+
+    def _observe_retries(self, response: dict):
+        retry_attempts = response["ResponseMetadata"].get("RetryAttempts", 0)
+        telemetry.record_retries("evaluator", retry_attempts)
+
+        # calls which succeeded after being retried were likely throttled
+        if self._adaptive_concurrency_limiter and retry_attempts:
+            self._adaptive_concurrency_limiter.record_congestion()
+
+    @staticmethod
+    def _get_token_counts(response: dict) -> tuple[int, int, int, int]:
+        headers = response["ResponseMetadata"]["HTTPHeaders"]
+
+        return (
+            int(headers.get("x-amzn-bedrock-input-token-count", 0)),
+            int(headers.get("x-amzn-bedrock-output-token-count", 0)),
+            int(headers.get("x-amzn-bedrock-cache-read-input-token-count", 0)),
+            int(headers.get("x-amzn-bedrock-cache-write-input-token-count", 0)),
+        )
+
+    def _record_token_counts(
+        self,
+        reserved_tokens: int,
+        input_token_count: int,
+        output_token_count: int,
+        cache_read_input_token_count: int = 0,
+        cache_write_input_token_count: int = 0,
+    ):
+        with self._token_count_lock:
+            self.input_token_count += input_token_count
+            self.output_token_count += output_token_count
+            self.cache_read_input_token_count += cache_read_input_token_count
+            self.cache_write_input_token_count += cache_write_input_token_count
+
+        telemetry.record_tokens(
+            self.model_config.model_id,
+            {
+                "input": input_token_count,
+                "output": output_token_count,
+                "cache_read": cache_read_input_token_count,
+                "cache_write": cache_write_input_token_count,
+            },
+        )
+
+        if usage := _token_usage.get():
+            usage.input_token_count += input_token_count
+            usage.output_token_count += output_token_count
+        self._settle_tokens(reserved_tokens, input_token_count + output_token_count)
+
+    def _estimate_token_count(self, request_body: dict, body: str) -> int:
+        # reserve the input tokens and the maximum number of output tokens
+        return estimate_token_count(body) + BedrockRequestHandler.get_max_tokens(
+            request_body, self.model_config
+        )
+
+    def _settle_tokens(self, reserved_tokens: int, used_tokens: int = 0):
+        if self._rate_limiter:
+            self._rate_limiter.settle(reserved_tokens, used_tokens)
 
     def run(self) -> TestResult:
         """
@@ -140,9 +636,39 @@ class BaseEvaluator(ABC):
 
         with self.trace:
             if hook_cls:
-                hook_cls.pre_evaluate(self.test, self.trace)
+                with self.trace.timer("pre_evaluate"):
+                    hook_cls.pre_evaluate(self.test, self.trace)
             self.test_result = self.evaluate()
             if hook_cls:
-                hook_cls.post_evaluate(self.test, self.test_result, self.trace)
+                # hooks may read the steps from the trace file
+                self.trace.flush()
+                with self.trace.timer("post_evaluate"):
+                    hook_cls.post_evaluate(self.test, self.test_result, self.trace)
+
+        return self.test_result
+
+    async def arun(self) -> TestResult:
+        """
+        Run the evaluator from the `asyncio` engine. Hooks are run in a worker
+        thread, since they may block.
+
+        Returns:
+            TestResult
+        """
+
+        hook_cls = self._get_hook_cls(self.test.hook)
+
+        with self.trace:
+            if hook_cls:
+                with self.trace.timer("pre_evaluate"):
+                    await to_thread(hook_cls.pre_evaluate, self.test, self.trace)
+            self.test_result = await self.aevaluate()
+            if hook_cls:
+                # hooks may read the steps from the trace file
+                self.trace.flush()
+                with self.trace.timer("post_evaluate"):
+                    await to_thread(
+                        hook_cls.post_evaluate, self.test, self.test_result, self.trace
+                    )
 
         return self.test_result
@@ -1,13 +1,27 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
+import copy
 import json
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
 
 from agenteval.evaluators.model_config.bedrock_model_config import (
     BedrockModelConfig,
     ModelProvider,
 )
 
+# marks the end of a prefix of a prompt which is repeated by later requests
+PROMPT_CACHE_BREAKPOINT = "<|cache_breakpoint|>"
+
+_CACHE_CONTROL = {"type": "ephemeral"}
+
+# Anthropic models allow up to 4 cache breakpoints, one of which is used for the system prompt
+_MAX_PROMPT_CACHE_BREAKPOINTS = 2
+
+_MAX_TOKENS_KEYS = {
+    ModelProvider.META: "max_gen_len",
+    ModelProvider.ANTHROPIC: "max_tokens",
+}
+
 
 class BedrockRequestHandler:
     """
@@ -21,7 +35,16 @@ class BedrockRequestHandler:
         model_config: BedrockModelConfig,
         system_prompt: str,
         prompt: str,
+        max_tokens: Optional[int] = None,
+        stop_sequences: Optional[List[str]] = None,
+        prompt_caching: bool = False,
     ) -> Dict:
+        # the request body is shared by all tests, so it must not be modified
+        request_body = copy.deepcopy(request_body)
+        prompt_segments = prompt.split(PROMPT_CACHE_BREAKPOINT)
+        prompt = "".join(prompt_segments)
+        if max_tokens:
+            request_body[_MAX_TOKENS_KEYS[model_config.provider]] = max_tokens
         if model_config.provider == ModelProvider.META:
             # Source for approach: https://www.llama.com/docs/model-cards-and-prompt-formats/llama3_3/
             request_body["prompt"] = (
@@ -33,8 +56,46 @@ class BedrockRequestHandler:
             request_body["system"] = system_prompt
             if "messages" in request_body:
                 request_body["messages"][0]["content"][0]["text"] = prompt
+            if prompt_caching:
+                BedrockRequestHandler._add_cache_breakpoints(
+                    request_body, system_prompt, prompt_segments
+                )
+            # Meta models do not support stop sequences
+            if stop_sequences:
+                request_body["stop_sequences"] = stop_sequences
         return request_body
 
+    @staticmethod
+    def _add_cache_breakpoints(
+        request_body: Dict, system_prompt: str, prompt_segments: List[str]
+    ):
+        request_body["system"] = [
+            {"type": "text", "text": system_prompt, "cache_control": _CACHE_CONTROL}
+        ]
+        if "messages" not in request_body:
+            return
+
+        # each segment except the last ends at a breakpoint, and the latest
+        # breakpoints are cached so the next request can read them. Empty segments
+        # have no block to mark, so breakpoints are placed on the latest segments
+        # which have text, rather than dropped.
+        cached_segments = [
+            i for i, segment in enumerate(prompt_segments[:-1]) if segment
+        ][-_MAX_PROMPT_CACHE_BREAKPOINTS:]
+        content = []
+        for i, segment in enumerate(prompt_segments):
+            if not segment:
+                continue
+            block = {"type": "text", "text": segment}
+            if i in cached_segments:
+                block["cache_control"] = _CACHE_CONTROL
+            content.append(block)
+        request_body["messages"][0]["content"] = content
+
+    @staticmethod
+    def remove_cache_breakpoints(prompt: str) -> str:
+        return prompt.replace(PROMPT_CACHE_BREAKPOINT, "")
+
     @staticmethod
     def parse_completion_from_response(
         response: Dict, model_config: BedrockModelConfig
@@ -43,5 +104,62 @@ class BedrockRequestHandler:
         if model_config.provider == ModelProvider.META:
             completion = json.loads(response_body)["generation"]
         elif model_config.provider == ModelProvider.ANTHROPIC:
-            completion = json.loads(response_body)["content"][0]["text"]
+            response_body = json.loads(response_body)
+            completion = response_body["content"][0]["text"]
+            # the stop sequence is not included in the completion
+            if response_body.get("stop_reason") == "stop_sequence":
+                completion += response_body["stop_sequence"]
         return completion
+
+    @staticmethod
+    def parse_completion_from_chunk(
+        chunk: Dict, model_config: BedrockModelConfig
+    ) -> str:
+        if model_config.provider == ModelProvider.META:
+            completion = chunk.get("generation") or ""
+        elif model_config.provider == ModelProvider.ANTHROPIC:
+            completion = ""
+            if chunk.get("type") == "content_block_delta":
+                completion = chunk["delta"].get("text", "")
+            elif chunk.get("type") == "message_delta":
+                # the stop sequence is not included in the completion
+                if chunk["delta"].get("stop_reason") == "stop_sequence":
+                    completion = chunk["delta"]["stop_sequence"]
+        return completion
+
+    @staticmethod
+    def parse_output_token_count_from_chunk(
+        chunk: Dict, model_config: BedrockModelConfig
+    ) -> Optional[int]:
+        # Anthropic models send the output token count with the stop reason, before
+        # the invocation metrics, so it is known if the stream is closed at a stop
+        # sequence. Other models only send it in the invocation metrics.
+        output_token_count = None
+        if model_config.provider == ModelProvider.ANTHROPIC:
+            if chunk.get("type") == "message_delta":
+                output_token_count = chunk.get("usage", {}).get("output_tokens")
+        return output_token_count
+
+    @staticmethod
+    def parse_input_token_counts_from_chunk(
+        chunk: Dict, model_config: BedrockModelConfig
+    ) -> Optional[Tuple[int, int, int]]:
+        # the input token counts are sent in the first chunk, so they are known
+        # even if the stream is not read to the end
+        input_token_counts = None
+        if model_config.provider == ModelProvider.META:
+            if chunk.get("prompt_token_count") is not None:
+                input_token_counts = (chunk["prompt_token_count"], 0, 0)
+        elif model_config.provider == ModelProvider.ANTHROPIC:
+            if chunk.get("type") == "message_start":
+                usage = chunk["message"]["usage"]
+                input_token_counts = (
+                    usage["input_tokens"],
+                    usage.get("cache_read_input_tokens", 0),
+                    usage.get("cache_creation_input_tokens", 0),
+                )
+        return input_token_counts
+
+    @staticmethod
+    def get_max_tokens(request_body: Dict, model_config: BedrockModelConfig) -> int:
+        return request_body.get(_MAX_TOKENS_KEYS[model_config.provider]) or 0
@@ -1,29 +1,55 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 
+import asyncio
+import concurrent.futures
+import contextlib
+import contextvars
 import logging
 import os
 import re
-from typing import Tuple
+import time
+from typing import Optional, Tuple
 
 from agenteval import jinja_env
 from agenteval.evaluators import BaseEvaluator
 from agenteval.evaluators.bedrock_request.bedrock_request_handler import (
+    PROMPT_CACHE_BREAKPOINT,
     BedrockRequestHandler,
 )
 from agenteval.test import TestResult
+from agenteval.utils import telemetry
 
 logger = logging.getLogger(__name__)
 
 _PROMPT_TEMPLATE_ROOT = "evaluators/canonical"
 _SYSTEM_PROMPT_DIR = "system"
 _RUNTIME_PROMPT_DIR = "runtime"
-_PROMPT_TEMPLATE_NAMES = [
-    "generate_initial_prompt",
-    "generate_user_response",
-    "generate_test_status",
-    "generate_evaluation",
-]
+
+_STAGE_SPAN_NAME = "agenteval.stage"
+
+# the stages which may be generated speculatively in each turn
+_MAX_SPECULATIONS = 2
+_TARGET_SPAN_NAME = "agenteval.target.invoke"
+
+# maps each stage to the XML elements containing its outputs and the names
+# used to record the outputs in the trace, in the order they are generated
+_STAGE_OUTPUTS = {
+    "generate_initial_prompt": [("initial_prompt", "initial_prompt")],
+    "generate_user_response": [("user_response", "user_response")],
+    "generate_test_status": [("category", "test_status")],
+    "generate_evaluation": [("category", "evaluation")],
+    "generate_test_status_and_user_response": [
+        ("category", "test_status"),
+        ("user_response", "user_response"),
+    ],
+}
+
+# the steps of the stages generated in the current context, while they are buffered
+# by a speculation, see `_buffer_steps`
+_buffered_steps: contextvars.ContextVar[Optional[list[dict]]] = contextvars.ContextVar(
+    "buffered_steps", default=None
+)
 
 # enable backwards-compatible StrEnum
 try:
@@ -60,11 +86,39 @@ class CanonicalEvaluator(BaseEvaluator):
 
     def __init__(
         self,
+        stage_max_tokens: Optional[dict[str, int]] = None,
+        fuse_stages: bool = False,
+        speculative: bool = False,
         **kwargs,
     ):
-        """Initialize the evaluator."""
+        """Initialize the evaluator.
+
+        Args:
+            fuse_stages (bool): Whether to check the test status and generate the next user response
+                with a single request, instead of a request for each.
+            speculative (bool): Whether to generate the evaluation and the next user response concurrently
+                with the test status, discarding whichever is not needed.
+            stage_max_tokens (Optional[dict[str, int]]): A map of stage names (e.g. `"generate_test_status"`)
+                to the maximum number of tokens to generate for the stage. If a stage is not specified,
+                the maximum number of tokens in the request body of the model config is used.
+
+        Raises:
+            ValueError: If `stage_max_tokens` contains an unknown stage.
+        """
         super().__init__(**kwargs)
 
+        self.fuse_stages = fuse_stages
+        self.speculative = speculative
+        # speculations of each turn run in the same threads, which are created on the
+        # first speculation and shut down once the test is evaluated
+        self._speculation_executor: Optional[concurrent.futures.ThreadPoolExecutor] = (
+            None
+        )
+        self._stage_max_tokens = stage_max_tokens or {}
+        for stage in self._stage_max_tokens:
+            if stage not in _STAGE_OUTPUTS:
+                raise ValueError(f"Unknown stage in stage_max_tokens: {stage}")
+
         self._prompt_template_map = {
             name: {
                 "system": jinja_env.get_template(
@@ -78,9 +132,16 @@ class CanonicalEvaluator(BaseEvaluator):
                     )
                 ),
             }
-            for name in _PROMPT_TEMPLATE_NAMES
+            for name in _STAGE_OUTPUTS
         }
 
+    @classmethod
+    def max_concurrent_calls(cls, **config) -> int:
+        # the test status is generated alongside the speculations
+        if config.get("speculative"):
+            return 1 + _MAX_SPECULATIONS
+        return 1
+
     @staticmethod
     def _extract_content_from_xml(xml_data: str, element_names: list[str]) -> Tuple:
         content = []
@@ -91,127 +152,428 @@ class CanonicalEvaluator(BaseEvaluator):
         return tuple(content)
 
     def _generate(
+        self,
+        system_prompt: str,
+        prompt: str,
+        output_xml_elements: list[str],
+        max_tokens: Optional[int] = None,
+    ) -> Tuple:
+        request_body = self._build_request_body(
+            system_prompt, prompt, output_xml_elements[-1], max_tokens
+        )
+
+        with self._concurrency_limiter:
+            if self.streaming:
+                # the outputs are complete once the closing tag of the last
+                # output has been generated
+                completion = self.invoke_model_with_response_stream(
+                    request_body=request_body, stop=f"</{output_xml_elements[-1]}>"
+                )
+            else:
+                completion = BedrockRequestHandler.parse_completion_from_response(
+                    response=self.invoke_model(request_body=request_body),
+                    model_config=self.model_config,
+                )
+
+        return self._parse_completion(completion, prompt, output_xml_elements)
+
+    async def _agenerate(
+        self,
+        system_prompt: str,
+        prompt: str,
+        output_xml_elements: list[str],
+        max_tokens: Optional[int] = None,
+    ) -> Tuple:
+        request_body = self._build_request_body(
+            system_prompt, prompt, output_xml_elements[-1], max_tokens
+        )
+
+        async with self._concurrency_limiter:
+            if self.streaming:
+                completion = await self.ainvoke_model_with_response_stream(
+                    request_body=request_body, stop=f"</{output_xml_elements[-1]}>"
+                )
+            else:
+                completion = BedrockRequestHandler.parse_completion_from_response(
+                    response=await self.ainvoke_model(request_body=request_body),
+                    model_config=self.model_config,
+                )
+
+        return self._parse_completion(completion, prompt, output_xml_elements)
+
+    def _build_request_body(
         self,
         system_prompt: str,
         prompt: str,
         output_xml_element: str,
-    ) -> str:
-        request_body = BedrockRequestHandler.build_request_body(
+        max_tokens: Optional[int] = None,
+    ) -> dict:
+        return BedrockRequestHandler.build_request_body(
             request_body=self.model_config.request_body,
             model_config=self.model_config,
             system_prompt=system_prompt,
             prompt=prompt,
+            max_tokens=max_tokens,
+            # nothing after the output is parsed
+            stop_sequences=[f"</{output_xml_element}>"],
+            prompt_caching=self.prompt_caching,
         )
 
-        response = self.invoke_model(request_body=request_body)
-
-        completion = BedrockRequestHandler.parse_completion_from_response(
-            response=response, model_config=self.model_config
-        )
-
+    def _parse_completion(
+        self, completion: str, prompt: str, output_xml_elements: list[str]
+    ) -> Tuple:
+        prompt = BedrockRequestHandler.remove_cache_breakpoints(prompt)
         logger.debug(
             f"[{self.test.name}]\n[PROMPT]\n{prompt}\n[COMPLETION]\n{completion}"
         )
 
-        output, reasoning = self._extract_content_from_xml(
-            completion, [output_xml_element, "thinking"]
+        # returns the outputs followed by the reasoning
+        return self._extract_content_from_xml(
+            completion, output_xml_elements + ["thinking"]
         )
 
-        return output, reasoning
-
-    def _generate_initial_prompt(self) -> str:
-        system_prompt = self._prompt_template_map["generate_initial_prompt"][
-            "system"
-        ].render()
-        prompt = self._prompt_template_map["generate_initial_prompt"]["prompt"].render(
-            step=self.test.steps[0]
-        )
-
-        initial_prompt, reasoning = self._generate(
+    def _render_prompts(self, stage: str, **kwargs) -> tuple[str, str]:
+        system_prompt = self._prompt_template_map[stage]["system"].render()
+        # the conversation is marked with breakpoints after each turn, as each
+        # turn is repeated by the requests for the following turns
+        if self.prompt_caching:
+            kwargs["cache_breakpoint"] = PROMPT_CACHE_BREAKPOINT
+        prompt = self._prompt_template_map[stage]["prompt"].render(**kwargs)
+
+        return system_prompt, prompt
+
+    def _generate_stage(self, stage: str, **kwargs) -> Tuple:
+        system_prompt, prompt = self._render_prompts(stage, **kwargs)
+        output_xml_elements, output_names = zip(*_STAGE_OUTPUTS[stage])
+
+        started_at = time.monotonic()
+        with self.track_token_usage() as usage, self.track_stage(stage), telemetry.span(
+            _STAGE_SPAN_NAME, {"agenteval.stage": stage}
+        ):
+            *outputs, reasoning = self._generate(
+                system_prompt=system_prompt,
+                prompt=prompt,
+                output_xml_elements=list(output_xml_elements),
+                max_tokens=self._stage_max_tokens.get(stage),
+            )
+
+        self._add_stage_step(
+            step_name=f"_{stage}",
+            started_at=started_at,
+            ended_at=time.monotonic(),
             system_prompt=system_prompt,
-            prompt=prompt,
-            output_xml_element="initial_prompt",
+            prompt=BedrockRequestHandler.remove_cache_breakpoints(prompt),
+            **dict(zip(output_names, outputs)),
+            reasoning=reasoning,
+            input_token_count=usage.input_token_count,
+            output_token_count=usage.output_token_count,
         )
-
-        self.trace.add_step(
+        return (*outputs, reasoning)
+
+    async def _agenerate_stage(self, stage: str, **kwargs) -> Tuple:
+        system_prompt, prompt = self._render_prompts(stage, **kwargs)
+        output_xml_elements, output_names = zip(*_STAGE_OUTPUTS[stage])
+
+        started_at = time.monotonic()
+        with self.track_token_usage() as usage, self.track_stage(stage), telemetry.span(
+            _STAGE_SPAN_NAME, {"agenteval.stage": stage}
+        ):
+            *outputs, reasoning = await self._agenerate(
+                system_prompt=system_prompt,
+                prompt=prompt,
+                output_xml_elements=list(output_xml_elements),
+                max_tokens=self._stage_max_tokens.get(stage),
+            )
+
+        self._add_stage_step(
+            step_name=f"_{stage}",
+            started_at=started_at,
+            ended_at=time.monotonic(),
             system_prompt=system_prompt,
-            prompt=prompt,
-            initial_prompt=initial_prompt,
+            prompt=BedrockRequestHandler.remove_cache_breakpoints(prompt),
+            **dict(zip(output_names, outputs)),
             reasoning=reasoning,
+            input_token_count=usage.input_token_count,
+            output_token_count=usage.output_token_count,
+        )
+        return (*outputs, reasoning)
+
+    def _add_stage_step(self, **step):
+        buffered_steps = _buffered_steps.get()
+        if buffered_steps is not None:
+            buffered_steps.append(step)
+        else:
+            self.trace.add_step(**step)
+
+    @staticmethod
+    @contextlib.contextmanager
+    def _buffer_steps():
+        # the steps of a speculation are only added to the trace if it is used
+        steps = []
+        token = _buffered_steps.set(steps)
+        try:
+            yield steps
+        finally:
+            _buffered_steps.reset(token)
+
+    def _generate_initial_prompt(self) -> str:
+        initial_prompt, _ = self._generate_stage(
+            "generate_initial_prompt", step=self.test.steps[0]
         )
         return initial_prompt
 
-    def _generate_test_status(self) -> str:
-        system_prompt = self._prompt_template_map["generate_test_status"][
-            "system"
-        ].render()
-        prompt = self._prompt_template_map["generate_test_status"]["prompt"].render(
-            steps=self.test.steps, conversation=self.conversation
+    async def _agenerate_initial_prompt(self) -> str:
+        initial_prompt, _ = await self._agenerate_stage(
+            "generate_initial_prompt", step=self.test.steps[0]
         )
-        test_status, reasoning = self._generate(
-            system_prompt=system_prompt,
-            prompt=prompt,
-            output_xml_element="category",
+        return initial_prompt
+
+    def _generate_test_status(self) -> str:
+        test_status, _ = self._generate_stage(
+            "generate_test_status",
+            steps=self.test.steps,
+            conversation=self.conversation,
         )
-        self.trace.add_step(
-            system_prompt=system_prompt,
-            prompt=prompt,
-            test_status=test_status,
-            reasoning=reasoning,
+        return test_status
+
+    async def _agenerate_test_status(self) -> str:
+        test_status, _ = await self._agenerate_stage(
+            "generate_test_status",
+            steps=self.test.steps,
+            conversation=self.conversation,
         )
         return test_status
 
     def _generate_evaluation(self) -> tuple[str, str]:
-        system_prompt = self._prompt_template_map["generate_evaluation"][
-            "system"
-        ].render()
-        prompt = self._prompt_template_map["generate_evaluation"]["prompt"].render(
+        return self._generate_stage(
+            "generate_evaluation",
             expected_results=self.test.expected_results,
             conversation=self.conversation,
         )
 
-        evaluation, reasoning = self._generate(
-            system_prompt=system_prompt,
-            prompt=prompt,
-            output_xml_element="category",
+    async def _agenerate_evaluation(self) -> tuple[str, str]:
+        return await self._agenerate_stage(
+            "generate_evaluation",
+            expected_results=self.test.expected_results,
+            conversation=self.conversation,
         )
-        self.trace.add_step(
-            system_prompt=system_prompt,
-            prompt=prompt,
-            evaluation=evaluation,
-            reasoning=reasoning,
+
+    def _generate_user_response(self) -> str:
+        user_response, _ = self._generate_stage(
+            "generate_user_response",
+            steps=self.test.steps,
+            conversation=self.conversation,
         )
+        return user_response
 
-        return evaluation, reasoning
+    async def _agenerate_user_response(self) -> str:
+        user_response, _ = await self._agenerate_stage(
+            "generate_user_response",
+            steps=self.test.steps,
+            conversation=self.conversation,
+        )
+        return user_response
 
-    def _generate_user_response(self) -> str:
-        system_prompt = self._prompt_template_map["generate_user_response"][
-            "system"
-        ].render()
-        prompt = self._prompt_template_map["generate_user_response"]["prompt"].render(
-            steps=self.test.steps, conversation=self.conversation
+    def _generate_test_status_and_user_response(self) -> tuple[str, Optional[str]]:
+        test_status, user_response, _ = self._generate_stage(
+            "generate_test_status_and_user_response",
+            steps=self.test.steps,
+            conversation=self.conversation,
         )
+        return test_status, user_response
 
-        user_response, reasoning = self._generate(
-            system_prompt=system_prompt,
-            prompt=prompt,
-            output_xml_element="user_response",
+    async def _agenerate_test_status_and_user_response(
+        self,
+    ) -> tuple[str, Optional[str]]:
+        test_status, user_response, _ = await self._agenerate_stage(
+            "generate_test_status_and_user_response",
+            steps=self.test.steps,
+            conversation=self.conversation,
         )
+        return test_status, user_response
 
+    def _invoke_target(self, user_input) -> str:
+        with self._target_concurrency_limiter, self._observe("target"):
+            started_at = time.monotonic()
+            with self._target_span():
+                target_response = self.target.invoke(user_input)
         self.trace.add_step(
-            system_prompt=system_prompt,
-            prompt=prompt,
-            user_response=user_response,
-            reasoning=reasoning,
+            step_name="_invoke_target",
+            started_at=started_at,
+            data=target_response.data,
         )
-        return user_response
 
-    def _invoke_target(self, user_input) -> str:
-        target_response = self.target.invoke(user_input)
-        self.trace.add_step(data=target_response.data)
+        return target_response.response
+
+    async def _ainvoke_target(self, user_input) -> str:
+        async with self._target_concurrency_limiter:
+            with self._observe("target"):
+                started_at = time.monotonic()
+                with self._target_span():
+                    target_response = await self.target.ainvoke(user_input)
+        self.trace.add_step(
+            step_name="_invoke_target",
+            started_at=started_at,
+            data=target_response.data,
+        )
 
         return target_response.response
 
+    def _target_span(self):
+        return telemetry.span(
+            _TARGET_SPAN_NAME, {"agenteval.target": self.target.target_name}
+        )
+
+    def _has_next_turn(self) -> bool:
+        return self.conversation.turns < self.test.max_turns
+
+    def _check_test_status(
+        self,
+    ) -> tuple[str, Optional[str], Optional[tuple[str, str]]]:
+        # the next user response is only needed if there is a next turn
+        fuse_stages = self.fuse_stages and self._has_next_turn()
+
+        if self.speculative:
+            return self._check_test_status_speculatively(fuse_stages)
+
+        if fuse_stages:
+            test_status, user_response = self._generate_test_status_and_user_response()
+            return test_status, user_response, None
+
+        return self._generate_test_status(), None, None
+
+    async def _acheck_test_status(
+        self,
+    ) -> tuple[str, Optional[str], Optional[tuple[str, str]]]:
+        fuse_stages = self.fuse_stages and self._has_next_turn()
+
+        if self.speculative:
+            return await self._acheck_test_status_speculatively(fuse_stages)
+
+        if fuse_stages:
+            test_status, user_response = (
+                await self._agenerate_test_status_and_user_response()
+            )
+            return test_status, user_response, None
+
+        return await self._agenerate_test_status(), None, None
+
+    def _speculate_user_response(self, fuse_stages: bool) -> bool:
+        return self._has_next_turn() and not fuse_stages
+
+    def _check_test_status_speculatively(
+        self, fuse_stages: bool
+    ) -> tuple[str, Optional[str], Optional[tuple[str, str]]]:
+        speculations = {"generate_evaluation": self._generate_evaluation}
+        if self._speculate_user_response(fuse_stages):
+            speculations["generate_user_response"] = self._generate_user_response
+
+        if self._speculation_executor is None:
+            self._speculation_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=_MAX_SPECULATIONS
+            )
+
+        futures = {
+            # run in a copy of the context, so spans are parented to the test
+            stage: self._speculation_executor.submit(
+                contextvars.copy_context().run, self._speculate, generate
+            )
+            for stage, generate in speculations.items()
+        }
+
+        try:
+            if fuse_stages:
+                test_status, user_response = (
+                    self._generate_test_status_and_user_response()
+                )
+            else:
+                test_status, user_response = self._generate_test_status(), None
+        finally:
+            concurrent.futures.wait(futures.values())
+
+        results = {
+            stage: (future.exception() or future.result())
+            for stage, future in futures.items()
+        }
+        return self._resolve_speculations(test_status, user_response, results)
+
+    async def _acheck_test_status_speculatively(
+        self, fuse_stages: bool
+    ) -> tuple[str, Optional[str], Optional[tuple[str, str]]]:
+        speculations = {"generate_evaluation": self._agenerate_evaluation}
+        if self._speculate_user_response(fuse_stages):
+            speculations["generate_user_response"] = self._agenerate_user_response
+
+        # each task runs in a copy of the current context, so tokens are tracked per task
+        tasks = {
+            stage: asyncio.create_task(self._aspeculate(generate))
+            for stage, generate in speculations.items()
+        }
+
+        try:
+            if fuse_stages:
+                test_status, user_response = (
+                    await self._agenerate_test_status_and_user_response()
+                )
+            else:
+                test_status, user_response = await self._agenerate_test_status(), None
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            raise
+
+        results = dict(
+            zip(
+                tasks,
+                await asyncio.gather(*tasks.values(), return_exceptions=True),
+            )
+        )
+        return self._resolve_speculations(test_status, user_response, results)
+
+    def _speculate(self, generate):
+        with self.track_token_usage() as usage, self._buffer_steps() as steps:
+            return generate(), usage, steps
+
+    async def _aspeculate(self, agenerate):
+        with self.track_token_usage() as usage, self._buffer_steps() as steps:
+            return await agenerate(), usage, steps
+
+    def _resolve_speculations(
+        self, test_status: str, user_response: Optional[str], results: dict
+    ) -> tuple[str, Optional[str], Optional[tuple[str, str]]]:
+        if test_status == TestStatusCategories.ALL_STEPS_ATTEMPTED:
+            needed_stage = "generate_evaluation"
+        else:
+            needed_stage = "generate_user_response"
+
+        needed = None
+        for stage, result in results.items():
+            if stage == needed_stage:
+                # errors are only raised by the speculation which is used
+                if isinstance(result, BaseException):
+                    raise result
+                needed, _, steps = result
+                for step in steps:
+                    self.trace.add_step(**step)
+            elif not isinstance(result, BaseException):
+                _, usage, _ = result
+                self.trace.add_step(
+                    step_name="_discard_speculation",
+                    stage=stage,
+                    wasted_input_token_count=usage.input_token_count,
+                    wasted_output_token_count=usage.output_token_count,
+                )
+
+        if needed_stage == "generate_evaluation":
+            return test_status, user_response, needed
+        return test_status, user_response or needed, None
+
+    @staticmethod
+    def _resolve_evaluation(eval_category: str) -> tuple[bool, str]:
+        if eval_category == EvaluationCategories.NOT_ALL_EXPECTED_RESULTS_OBSERVED:
+            return False, Results.NOT_ALL_EXPECTED_RESULTS_OBSERVED.value
+        return True, Results.ALL_EXPECTED_RESULTS_OBSERVED.value
+
     def evaluate(self) -> TestResult:
         """Conduct the test.
 
@@ -221,6 +583,55 @@ class CanonicalEvaluator(BaseEvaluator):
         passed = False
         result = Results.MAX_TURNS_REACHED.value
         reasoning = ""
+        next_user_input = None
+
+        try:
+            while self.conversation.turns < self.test.max_turns:
+                if self.conversation.turns == 0:
+                    # start conversation
+                    if self.test.initial_prompt:
+                        user_input = self.test.initial_prompt
+                    else:
+                        user_input = self._generate_initial_prompt()
+                else:
+                    # generate next user response, unless it was generated with the test status
+                    user_input = next_user_input or self._generate_user_response()
+
+                # add turn to the conversation
+                self.conversation.add_turn(user_input, self._invoke_target(user_input))
+
+                # get test status, along with the next user response and evaluation
+                # if they were generated with it
+                test_status, next_user_input, evaluation = self._check_test_status()
+                if test_status == TestStatusCategories.ALL_STEPS_ATTEMPTED:
+                    # evaluate conversation
+                    eval_category, reasoning = evaluation or self._generate_evaluation()
+                    passed, result = self._resolve_evaluation(eval_category)
+
+                    break
+        finally:
+            if self._speculation_executor is not None:
+                self._speculation_executor.shutdown()
+                self._speculation_executor = None
+
+        return TestResult(
+            test_name=self.test.name,
+            passed=passed,
+            result=result,
+            reasoning=reasoning,
+            conversation=self.conversation,
+        )
+
+    async def aevaluate(self) -> TestResult:
+        """Conduct the test from the `asyncio` engine.
+
+        Returns:
+            TestResult
+        """
+        passed = False
+        result = Results.MAX_TURNS_REACHED.value
+        reasoning = ""
+        next_user_input = None
 
         while self.conversation.turns < self.test.max_turns:
             if self.conversation.turns == 0:
@@ -228,27 +639,25 @@ class CanonicalEvaluator(BaseEvaluator):
                 if self.test.initial_prompt:
                     user_input = self.test.initial_prompt
                 else:
-                    user_input = self._generate_initial_prompt()
+                    user_input = await self._agenerate_initial_prompt()
             else:
-                # generate next user response
-                user_input = self._generate_user_response()
+                # generate next user response, unless it was generated with the test status
+                user_input = next_user_input or await self._agenerate_user_response()
 
             # add turn to the conversation
-            self.conversation.add_turn(user_input, self._invoke_target(user_input))
+            self.conversation.add_turn(
+                user_input, await self._ainvoke_target(user_input)
+            )
 
-            # get test status
-            test_status = self._generate_test_status()
+            # get test status, along with the next user response and evaluation
+            # if they were generated with it
+            test_status, next_user_input, evaluation = await self._acheck_test_status()
             if test_status == TestStatusCategories.ALL_STEPS_ATTEMPTED:
                 # evaluate conversation
-                eval_category, reasoning = self._generate_evaluation()
-                if (
-                    eval_category
-                    == EvaluationCategories.NOT_ALL_EXPECTED_RESULTS_OBSERVED.value  # noqa: W503
-                ):
-                    result = Results.NOT_ALL_EXPECTED_RESULTS_OBSERVED.value
-                else:
-                    result = Results.ALL_EXPECTED_RESULTS_OBSERVED.value
-                    passed = True
+                eval_category, reasoning = (
+                    evaluation or await self._agenerate_evaluation()
+                )
+                passed, result = self._resolve_evaluation(eval_category)
 
                 break
 
@@ -1,7 +1,9 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 
-from pydantic import BaseModel
+from typing import Optional
+
+from pydantic import BaseModel, PrivateAttr
 
 from agenteval.evaluators import BaseEvaluator
 from agenteval.evaluators.canonical.evaluator import CanonicalEvaluator
@@ -15,6 +17,11 @@ from agenteval.evaluators.model_config.preconfigured_model_configs import (
 )
 from agenteval.targets import BaseTarget
 from agenteval.test import Test
+from agenteval.utils.cache import CompletionCache
+from agenteval.utils.concurrency import (
+    AdaptiveConcurrencyLimiter,
+    ConcurrencyLimiter,
+)
 
 _EVALUATOR_METHOD_MAP = {
     "canonical": CanonicalEvaluator,
@@ -39,7 +46,24 @@ class EvaluatorFactory(BaseModel):
 
     config: dict
 
-    def create(self, test: Test, target: BaseTarget, work_dir: str) -> BaseEvaluator:
+    _concurrency_limiter: Optional[ConcurrencyLimiter] = PrivateAttr(default=None)
+
+    def model_post_init(self, __context):
+        if "max_concurrency" in self.config:
+            self._concurrency_limiter = ConcurrencyLimiter(
+                self.config["max_concurrency"]
+            )
+
+    def create(
+        self,
+        test: Test,
+        target: BaseTarget,
+        work_dir: str,
+        target_concurrency_limiter: Optional[ConcurrencyLimiter] = None,
+        adaptive_concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        completion_cache: Optional[CompletionCache] = None,
+        trace_config: Optional[dict] = None,
+    ) -> BaseEvaluator:
         """Create an instance of the evaluator class specified in the configuration.
 
         Args:
@@ -47,21 +71,48 @@ class EvaluatorFactory(BaseModel):
             target (BaseTarget): The target agent being evaluated.
             work_dir (str): The directory where the test result and trace will be
                 generated.
+            target_concurrency_limiter (Optional[ConcurrencyLimiter]): Limits the number
+                of calls to the target in flight across all tests.
+            adaptive_concurrency_limiter (Optional[AdaptiveConcurrencyLimiter]): Adjusts
+                the number of tests in flight based on the calls made by the evaluator.
+            completion_cache (Optional[CompletionCache]): A cache of completions shared
+                by all tests.
+            trace_config (Optional[dict]): The configuration of the trace of each test.
 
         Returns:
             BaseEvaluator: An instance of the evaluator class, with the configuration
                 parameters applied.
         """
-        reserved_config_keys = {"eval_method", "model", "custom_config"}
+        reserved_config_keys = {
+            "eval_method",
+            "model",
+            "custom_config",
+            "max_concurrency",
+            "cache",
+        }
         evaluator_cls = self._get_evaluator_class()
         return evaluator_cls(
             test=test,
             target=target,
             work_dir=work_dir,
             model_config=self._get_bedrock_model_config(),
+            concurrency_limiter=self._concurrency_limiter,
+            target_concurrency_limiter=target_concurrency_limiter,
+            adaptive_concurrency_limiter=adaptive_concurrency_limiter,
+            completion_cache=completion_cache,
+            trace_config=trace_config,
             **{k: v for k, v in self.config.items() if k not in reserved_config_keys},
         )
 
+    def max_concurrent_calls(self) -> int:
+        """Get the maximum number of calls to AWS services each test makes at the same
+        time with the configured evaluator.
+
+        Returns:
+            int
+        """
+        return self._get_evaluator_class().max_concurrent_calls(**self.config)
+
     def _get_evaluator_class(self) -> type[BaseEvaluator]:
         if "eval_method" in self.config:
             return _EVALUATOR_METHOD_MAP[self.config["eval_method"]]
@@ -1,6 +1,10 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 
+import math
+
+_PERCENTILES = (50, 95, 99)
+
 
 def calculate_pass_rate_metric(pass_count: int, num_tests: int) -> float:
     """Calculate the pass rate metric.
@@ -13,3 +17,37 @@ def calculate_pass_rate_metric(pass_count: int, num_tests: int) -> float:
         float: The pass rate metric.
     """
     return round((pass_count / num_tests) * 100, 2)
+
+
+def calculate_latency_percentiles(
+    durations: dict[str, list[float]],
+) -> dict[str, dict[str, float]]:
+    """Calculate the p50, p95 and p99 latencies of each step, using the nearest rank.
+
+    Args:
+        durations (dict[str, list[float]]): The durations in seconds of each step,
+            by step name.
+
+    Returns:
+        dict[str, dict[str, float]]: A map of step names to the `count` of durations,
+            their `total` and their `p50`, `p95` and `p99` percentiles, in seconds.
+    """
+    latencies = {}
+
+    for name, step_durations in sorted(durations.items()):
+        if not step_durations:
+            continue
+
+        ordered = sorted(step_durations)
+        latencies[name] = {
+            "count": len(ordered),
+            "total": round(sum(ordered), 3),
+            **{
+                f"p{percentile}": round(
+                    ordered[max(0, math.ceil(percentile / 100 * len(ordered)) - 1)], 3
+                )
+                for percentile in _PERCENTILES
+            },
+        }
+
+    return latencies
@@ -1,6 +1,8 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 
+from .journal import JournalEntry
+from .sinks import BaseSink
 from .plan import Plan
 
-__all__ = ["Plan"]
+__all__ = ["BaseSink", "JournalEntry", "Plan"]
@@ -0,0 +1,64 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import functools
+import hashlib
+import json
+
+import agenteval
+from agenteval import jinja_env
+from agenteval.test import Test
+
+# configurations which limit or cache requests without changing their results
+_EXCLUDED_CONFIG_KEYS = {"cache", "max_concurrency", "rate_limits"}
+
+_EVALUATOR_TEMPLATE_ROOT = "evaluators/"
+
+
+def fingerprint_test(test: Test, evaluator_config: dict, target_config: dict) -> str:
+    """Fingerprint the inputs of a test, so a stored result can be reused while
+    they are unchanged.
+
+    The fingerprint covers the fields of the test, the configurations of the evaluator
+    and the target (including the target's `version`), and the version of the
+    evaluator templates.
+
+    Args:
+        test (Test): The test.
+        evaluator_config (dict): The configuration of the evaluator.
+        target_config (dict): The configuration of the target.
+
+    Returns:
+        str: The SHA-256 digest of the inputs.
+    """
+    inputs = {
+        "test": test.model_dump(),
+        "evaluator": _without_excluded_keys(evaluator_config),
+        "target": _without_excluded_keys(target_config),
+        "templates": templates_version(),
+    }
+    return hashlib.sha256(
+        json.dumps(inputs, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def templates_version() -> str:
+    """Get the version of the evaluator templates, which changes with the package
+    version or the content of any template.
+
+    Returns:
+        str: The SHA-256 digest of the package version and the templates.
+    """
+    digest = hashlib.sha256(agenteval.__version__.encode("utf-8"))
+    for name in jinja_env.list_templates(
+        filter_func=lambda name: name.startswith(_EVALUATOR_TEMPLATE_ROOT)
+    ):
+        source, _, _ = jinja_env.loader.get_source(jinja_env, name)
+        digest.update(name.encode("utf-8"))
+        digest.update(source.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _without_excluded_keys(config: dict) -> dict:
+    return {k: v for k, v in config.items() if k not in _EXCLUDED_CONFIG_KEYS}
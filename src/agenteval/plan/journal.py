@@ -0,0 +1,214 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import IO, Iterator, Optional
+
+from agenteval.conversation import Conversation
+from agenteval.test import TestResult
+
+_JOURNAL_FILE_NAME = "agenteval_journal.jsonl"
+
+
+@dataclass
+class JournalEntry:
+    """The result of a completed test, along with the tokens used and the durations
+    of the steps taken to evaluate it.
+
+    Attributes:
+        result (TestResult): The result of the test.
+        input_token_count (int): The input tokens used by the evaluator.
+        output_token_count (int): The output tokens generated by the evaluator.
+        cache_read_input_token_count (int): The input tokens read from the prompt cache.
+        cache_write_input_token_count (int): The input tokens written to the prompt cache.
+        duration (float): The duration of the test in seconds.
+        durations (dict[str, list[float]]): A map of step names to their durations in seconds.
+        fingerprint (Optional[str]): The fingerprint of the inputs of the test, which is
+            compared to reuse the result in later runs.
+    """
+
+    result: TestResult
+    input_token_count: int = 0
+    output_token_count: int = 0
+    cache_read_input_token_count: int = 0
+    cache_write_input_token_count: int = 0
+    duration: float = 0.0
+    durations: dict[str, list[float]] = field(default_factory=dict)
+    fingerprint: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        """Convert the entry to a dictionary which can be serialized to JSON.
+
+        Returns:
+            dict
+        """
+        return {
+            "result": {
+                "test_name": self.result.test_name,
+                "result": self.result.result,
+                "reasoning": self.result.reasoning,
+                "passed": self.result.passed,
+                "conversation": {
+                    "messages": self.result.conversation.messages,
+                    "turns": self.result.conversation.turns,
+                },
+            },
+            "input_token_count": self.input_token_count,
+            "output_token_count": self.output_token_count,
+            "cache_read_input_token_count": self.cache_read_input_token_count,
+            "cache_write_input_token_count": self.cache_write_input_token_count,
+            "duration": self.duration,
+            "durations": self.durations,
+            "fingerprint": self.fingerprint,
+        }
+
+    @classmethod
+    def from_dict(cls, entry: dict) -> JournalEntry:
+        """Create an entry from a dictionary created with `to_dict`.
+
+        Args:
+            entry (dict): The entry as a dictionary.
+
+        Returns:
+            JournalEntry
+        """
+        result = dict(entry["result"])
+        conversation = Conversation()
+        conversation.messages = [
+            tuple(message) for message in result["conversation"]["messages"]
+        ]
+        conversation.turns = result["conversation"]["turns"]
+        result["conversation"] = conversation
+
+        return cls(**{**entry, "result": TestResult(**result)})
+
+
+class ResultJournal:
+    """An append-only journal of the results of completed tests, stored as JSON Lines.
+
+    Each entry is flushed to disk as soon as it is appended, so the results of an
+    interrupted run can be read with `load` to resume the run.
+
+    Attributes:
+        path (str): The path of the journal file.
+    """
+
+    def __init__(self, path: str):
+        """Initialize the journal.
+
+        Args:
+            path (str): The path of the journal file.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._file: Optional[IO] = None
+
+    @classmethod
+    def in_work_dir(cls, work_dir: str) -> ResultJournal:
+        """Get the journal of a work directory.
+
+        Args:
+            work_dir (str): The work directory of the run.
+
+        Returns:
+            ResultJournal
+        """
+        return cls(os.path.join(work_dir, _JOURNAL_FILE_NAME))
+
+    def load(self) -> dict[str, JournalEntry]:
+        """Read the entries of the journal.
+
+        A partially written last entry, left behind if the run was interrupted
+        while appending it, is ignored.
+
+        Returns:
+            dict[str, JournalEntry]: A map of test names to their latest entry, which is
+                empty if the journal does not exist.
+        """
+        entries = {}
+        if not os.path.exists(self.path):
+            return entries
+
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    entry = JournalEntry.from_dict(json.loads(line))
+                except ValueError:
+                    continue
+                entries[entry.result.test_name] = entry
+
+        return entries
+
+    def iter_entries(self, test_names: list[str]) -> Iterator[JournalEntry]:
+        """Read the latest entry of each test, one at a time.
+
+        Only the offset of each entry is kept in memory, so the entries of a large
+        journal can be read without loading every entry.
+
+        Args:
+            test_names (list[str]): The names of the tests, in the order their entries
+                are read.
+
+        Yields:
+            JournalEntry
+
+        Raises:
+            KeyError: If a test has no entry in the journal.
+        """
+        offsets = {}
+        with open(self.path, "rb") as f:
+            offset = 0
+            for line in f:
+                try:
+                    offsets[json.loads(line)["result"]["test_name"]] = offset
+                except ValueError:
+                    pass
+                offset += len(line)
+
+            for test_name in test_names:
+                f.seek(offsets[test_name])
+                yield JournalEntry.from_dict(json.loads(f.readline()))
+
+    def open(self, resume: bool = False):
+        """Open the journal for appending.
+
+        Args:
+            resume (bool): Whether to keep the existing entries. Otherwise, the
+                journal is truncated.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._file = open(self.path, "a" if resume else "w")
+
+        # a partial entry is left behind if a run is interrupted while appending it,
+        # so start the next entry on a new line
+        if resume and self._file.tell() and not self._ends_with_newline():
+            self._file.write("\n")
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def append(self, entry: JournalEntry):
+        """Append an entry, and flush it to disk.
+
+        Args:
+            entry (JournalEntry): The entry.
+        """
+        line = json.dumps(entry.to_dict(), separators=(",", ":"), default=str)
+        with self._lock:
+            self._file.write(f"{line}\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        """Close the journal."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
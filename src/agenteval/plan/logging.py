@@ -2,6 +2,9 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import logging
+from typing import Optional
+
+from agenteval.utils.concurrency import LATENCY
 
 logger = logging.getLogger(__name__)
 
@@ -12,15 +15,52 @@ def log_run_start(verbose: bool, num_tests: int, num_threads: int):
         logger.info(f"Number of threads: {num_threads}")
 
 
+def log_resume(num_completed: int):
+    logger.info(f"Resuming run, skipping {num_completed} completed test(s)")
+
+
+def log_reuse(num_reused: int):
+    logger.info(f"Reusing the results of {num_reused} unchanged test(s)")
+
+
+def log_last_failed(num_failed: int):
+    if num_failed:
+        logger.info(f"Running {num_failed} test(s) which failed in the previous run")
+    else:
+        logger.info("No tests failed in the previous run, running all tests")
+
+
+def log_failed_first(num_failed: int):
+    logger.info(f"Running {num_failed} test(s) which failed in the previous run first")
+
+
+def log_concurrency_change(
+    verbose: bool, previous: int, current: int, reason: Optional[str] = None
+):
+    if current < previous and reason == LATENCY:
+        logger.warning(
+            f"[yellow]Latency increased, reducing concurrency from {previous} to {current}"
+        )
+    elif current < previous:
+        logger.warning(
+            f"[yellow]Throttling detected, reducing concurrency from {previous} to {current}"
+        )
+    elif verbose:
+        logger.info(f"Increasing concurrency from {previous} to {current}")
+
+
 def log_run_end(
     verbose: bool,
-    results: dict,
+    statuses: dict[str, bool],
     num_tests: int,
     pass_count: int,
     fail_count: int,
     elapsed_time: float,
     evaluator_input_token_count: int,
     evaluator_output_token_count: int,
+    evaluator_cache_read_input_token_count: int = 0,
+    evaluator_cache_write_input_token_count: int = 0,
+    latencies: Optional[dict[str, dict[str, float]]] = None,
 ):
     if fail_count:
         logger.error(f"[red]{pass_count} passed, {fail_count} failed.")
@@ -30,14 +70,44 @@ def log_run_end(
     logger.info(f"Completed in {elapsed_time} seconds.")
 
     if verbose:
-        for _, result in results.items():
-            if result.passed:
-                logger.info(f"[bold green]{result.test_name}...PASSED")
+        for test_name, passed in statuses.items():
+            if passed:
+                logger.info(f"[bold green]{test_name}...PASSED")
             else:
-                logger.error(f"[bold red]{result.test_name}...FAILED")
+                logger.error(f"[bold red]{test_name}...FAILED")
         logger.info(
             f"Input tokens processed by evaluator: {evaluator_input_token_count}"
         )
         logger.info(
             f"Output tokens generated by evaluator: {evaluator_output_token_count}"
         )
+        # only reported if prompt caching is used
+        if (
+            evaluator_cache_read_input_token_count
+            or evaluator_cache_write_input_token_count
+        ):
+            logger.info(
+                f"Input tokens read from cache by evaluator: {evaluator_cache_read_input_token_count}"
+            )
+            logger.info(
+                f"Input tokens written to cache by evaluator: {evaluator_cache_write_input_token_count}"
+            )
+        for name, latency in (latencies or {}).items():
+            logger.info(
+                f"{name}: p50 {latency['p50']}s, p95 {latency['p95']}s, "
+                f"p99 {latency['p99']}s ({latency['count']} calls)"
+            )
+
+
+def log_profile(
+    phase_timings: dict[str, tuple[float, float]],
+    hotspots: list[tuple[str, float]],
+    path: str,
+):
+    for phase, (wall_time, cpu_time) in phase_timings.items():
+        logger.info(
+            f"Profile of {phase}: {wall_time:.2f} seconds, {cpu_time:.2f} CPU seconds"
+        )
+    for function, percentage in hotspots:
+        logger.info(f"{percentage}% {function}")
+    logger.info(f"Profile saved to {path}")
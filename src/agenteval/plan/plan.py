@@ -3,28 +3,61 @@
 
 from __future__ import annotations
 
+import asyncio
 import concurrent.futures
+import contextlib
 import logging
 import os
+import queue
 import sys
 import threading
 import time
-from typing import Optional
+from dataclasses import dataclass
+from typing import AsyncIterator, Iterator, Optional
 
 import yaml
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 from rich.progress import Progress
 
 from agenteval import defaults
 from agenteval.evaluators import EvaluatorFactory
+from agenteval.metrics import calculate_latency_percentiles
 from agenteval.plan.exceptions import TestFailureError
-from agenteval.plan.logging import log_run_end, log_run_start
-from agenteval.summary import create_markdown_summary
-from agenteval.targets import TargetFactory
+from agenteval.plan.fingerprint import fingerprint_test
+from agenteval.plan.journal import JournalEntry, ResultJournal
+from agenteval.plan.logging import (
+    log_concurrency_change,
+    log_failed_first,
+    log_last_failed,
+    log_resume,
+    log_reuse,
+    log_run_end,
+    log_run_start,
+)
+from agenteval.plan.sinks import create_sink
+from agenteval.summary import create_latency_summary, create_markdown_summary
+from agenteval.targets import Cassette, RecordingTarget, ReplayTarget, TargetFactory
 from agenteval.test import TestSuite
+from agenteval.utils import configure_boto3_client_pool, telemetry
+from agenteval.utils.aws import close_async_boto3_clients
+from agenteval.utils.cache import CompletionCache
+from agenteval.utils.concurrency import AdaptiveConcurrencyLimiter, use_executor
+from agenteval.utils.profiler import SamplingProfiler
 
 _DEFAULT_PLAN_FILE_NAME = "agenteval.yml"
 
+_CACHE_DIR = "agenteval_cache"
+
+_TEST_SPAN_NAME = "agenteval.test"
+
+_THREADS_ENGINE = "threads"
+_ASYNCIO_ENGINE = "asyncio"
+ENGINES = [_THREADS_ENGINE, _ASYNCIO_ENGINE]
+
+_RERUN_CHANGED = "changed"
+_RERUN_FAILED = "failed"
+RERUN_MODES = [_RERUN_CHANGED, _RERUN_FAILED]
+
 _DEFAULT__PLAN = {
     "evaluator": {"model": "claude-3", "eval_method": "canonical"},
     "target": {
@@ -45,6 +78,12 @@ sys.path.append(".")
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class _RunEnd:
+    # marks the end of the results of a run
+    error: Optional[BaseException] = None
+
+
 class Plan(BaseModel):
     """Encapsulates the configurations for a test plan, which includes information
     about the evaluator, the target, the tests to be executed, and various settings
@@ -56,6 +95,8 @@ class Plan(BaseModel):
 
     config: dict
 
+    _profiler: Optional[SamplingProfiler] = PrivateAttr(default=None)
+
     @classmethod
     def load(
         cls,
@@ -123,6 +164,17 @@ class Plan(BaseModel):
         num_threads: Optional[int] = None,
         work_dir: Optional[str] = None,
         filter: Optional[str] = None,
+        engine: str = _THREADS_ENGINE,
+        adaptive_concurrency: bool = False,
+        use_cache: bool = True,
+        refresh_cache: bool = False,
+        record_cassette: Optional[str] = None,
+        replay_cassette: Optional[str] = None,
+        profiler: Optional[SamplingProfiler] = None,
+        resume: bool = False,
+        rerun: Optional[str] = None,
+        last_failed: bool = False,
+        failed_first: bool = False,
     ):
         """Run the test plan.
 
@@ -134,62 +186,475 @@ class Plan(BaseModel):
                 generated. If `None`, the assets will be saved to the current working directory.
             filter (Optional[str]): Specifies the test(s) to run, where multiple tests should be seperated using a comma.
                 If `None`, all tests will be run.
+            engine (str): The engine used to run tests concurrently. `"threads"` runs each test in its own thread,
+                while `"asyncio"` runs up to `num_threads` tests concurrently on a single event loop.
+            adaptive_concurrency (bool): Whether to start with a single test in flight and adjust the number of tests
+                in flight (up to `num_threads`) based on throttling and latency of calls to the evaluator and target.
+            use_cache (bool): Whether to use the completion cache, if it is configured for the evaluator.
+            refresh_cache (bool): Whether to ignore existing entries in the completion cache and replace them.
+            record_cassette (Optional[str]): The path of a cassette file to record the target's responses to.
+            replay_cassette (Optional[str]): The path of a cassette file to replay the target's responses from,
+                instead of invoking the target.
+            profiler (Optional[SamplingProfiler]): A profiler which is told the phase of the run (`"setup"`,
+                `"evaluation"` or `"summary"`) and the test being run by each thread.
+            resume (bool): Whether to skip the tests recorded in the result journal of the work directory
+                by an earlier run, and include their results in the summary. Otherwise, the journal is replaced.
+                Only results whose test fingerprint is unchanged are reused.
+            rerun (Optional[str]): Reuse the results in the result journal of the work directory whose test
+                fingerprint is unchanged. With `"changed"`, only the tests whose fingerprint changed, or which
+                have no result, are run. With `"failed"`, the tests which failed are also run.
+            last_failed (bool): Whether to only run the tests which failed in the previous run, according to
+                the result journal of the work directory. If no tests failed, every test is run. The results of
+                the other tests are kept in the journal.
+            failed_first (bool): Whether to start the tests which failed in the previous run before the
+                other tests.
+
+        Raises:
+            TestFailureError: If one or more tests failed.
         """
-        self._setup_run(filter, work_dir, num_threads)
+        for _ in self.iter_results(
+            verbose,
+            num_threads,
+            work_dir,
+            filter,
+            engine,
+            adaptive_concurrency,
+            use_cache,
+            refresh_cache,
+            record_cassette,
+            replay_cassette,
+            profiler,
+            resume,
+            rerun,
+            last_failed,
+            failed_first,
+        ):
+            pass
+
+        if self._num_tests - self._pass_count:
+            raise TestFailureError
 
-        log_run_start(verbose, self._num_tests, self._num_threads)
+    def iter_results(
+        self,
+        verbose: bool = False,
+        num_threads: Optional[int] = None,
+        work_dir: Optional[str] = None,
+        filter: Optional[str] = None,
+        engine: str = _THREADS_ENGINE,
+        adaptive_concurrency: bool = False,
+        use_cache: bool = True,
+        refresh_cache: bool = False,
+        record_cassette: Optional[str] = None,
+        replay_cassette: Optional[str] = None,
+        profiler: Optional[SamplingProfiler] = None,
+        resume: bool = False,
+        rerun: Optional[str] = None,
+        last_failed: bool = False,
+        failed_first: bool = False,
+    ) -> Iterator[JournalEntry]:
+        """Run the test plan, yielding the result of each test as soon as it completes.
+
+        Results are not kept in memory once they have been yielded. Tests keep running
+        while the caller handles a result, up to `num_threads` results ahead of the caller.
+        The summary is written once every result has been yielded, and is read back from
+        the result journal. If the caller stops iterating early, tests which have not
+        started are skipped and the summary is not written.
+
+        Unlike `run`, no `TestFailureError` is raised if tests fail.
+
+        Args:
+            See `run`.
 
-        start = time.time()
+        Yields:
+            JournalEntry: The result of a test, with the tokens used by the evaluator and the
+                durations of its steps. Tests skipped with `resume` or `rerun` are not yielded.
+        """
+        self._start_run(
+            verbose,
+            num_threads,
+            work_dir,
+            filter,
+            engine,
+            adaptive_concurrency,
+            use_cache,
+            refresh_cache,
+            record_cassette,
+            replay_cassette,
+            profiler,
+            resume,
+            rerun,
+            last_failed,
+            failed_first,
+        )
 
-        with Progress(transient=True) as self._progress:
-            self._tracker = self._progress.add_task("running...", total=self._num_tests)
-            self._run_concurrent()
+        # tests run on a background thread, or on the threads it starts, and their
+        # results are handed over through a queue, which blocks them while the caller
+        # is behind
+        self._completed = queue.Queue(maxsize=self._num_threads)
+        producer = threading.Thread(
+            target=self._run_engine, args=(engine,), daemon=True
+        )
 
-        fail_count = self._num_tests - self._pass_count
+        with self._profile_phase("evaluation", sample=False), self._open_run():
+            producer.start()
+            entry = None
+            try:
+                while not isinstance(entry := self._completed.get(), _RunEnd):
+                    yield entry
+            finally:
+                self._stopped.set()
+                # unblock the tests in flight, so they can finish
+                while producer.is_alive() and not isinstance(entry, _RunEnd):
+                    entry = self._completed.get()
+                producer.join()
+
+            if entry.error is not None:
+                raise entry.error
+
+        self._finish_run(verbose)
+
+    async def aiter_results(
+        self,
+        verbose: bool = False,
+        num_threads: Optional[int] = None,
+        work_dir: Optional[str] = None,
+        filter: Optional[str] = None,
+        adaptive_concurrency: bool = False,
+        use_cache: bool = True,
+        refresh_cache: bool = False,
+        record_cassette: Optional[str] = None,
+        replay_cassette: Optional[str] = None,
+        profiler: Optional[SamplingProfiler] = None,
+        resume: bool = False,
+        rerun: Optional[str] = None,
+        last_failed: bool = False,
+        failed_first: bool = False,
+    ) -> AsyncIterator[JournalEntry]:
+        """Run the test plan on the running event loop with the `asyncio` engine, yielding
+        the result of each test as soon as it completes.
+
+        Behaves like `iter_results`. Targets which only implement `invoke` are run in a
+        thread pool of `num_threads` threads, which is shut down once the run ends. The
+        default executor of the event loop is left unchanged.
 
-        log_run_end(
+        Args:
+            See `run`.
+
+        Yields:
+            JournalEntry: The result of a test, with the tokens used by the evaluator and the
+                durations of its steps. Tests skipped with `resume` or `rerun` are not yielded.
+        """
+        self._start_run(
             verbose,
-            self._results,
-            self._num_tests,
-            self._pass_count,
-            fail_count,
-            round(time.time() - start, 2),
-            sum(self._evaluator_input_token_counts),
-            sum(self._evaluator_output_token_counts),
+            num_threads,
+            work_dir,
+            filter,
+            _ASYNCIO_ENGINE,
+            adaptive_concurrency,
+            use_cache,
+            refresh_cache,
+            record_cassette,
+            replay_cassette,
+            profiler,
+            resume,
+            rerun,
+            last_failed,
+            failed_first,
         )
 
-        create_markdown_summary(
-            self._work_dir,
-            self._pass_count,
-            self._num_tests,
-            self._test_suite.tests,
-            list(self._results.values()),
-        )
+        self._acompleted = asyncio.Queue(maxsize=self._num_threads)
+        producer = asyncio.create_task(self._arun_engine())
 
-        if fail_count:
-            raise TestFailureError
+        with self._profile_phase("evaluation"), self._open_run():
+            entry = None
+            try:
+                while not isinstance(entry := await self._acompleted.get(), _RunEnd):
+                    yield entry
+            finally:
+                self._stopped.set()
+                # unblock the tests in flight, so they can finish
+                while not producer.done() and not isinstance(entry, _RunEnd):
+                    entry = await self._acompleted.get()
+                await producer
+
+            if entry.error is not None:
+                raise entry.error
+
+        self._finish_run(verbose)
+
+    def _start_run(
+        self,
+        verbose: bool,
+        num_threads: Optional[int],
+        work_dir: Optional[str],
+        filter: Optional[str],
+        engine: str,
+        adaptive_concurrency: bool,
+        use_cache: bool,
+        refresh_cache: bool,
+        record_cassette: Optional[str],
+        replay_cassette: Optional[str],
+        profiler: Optional[SamplingProfiler],
+        resume: bool,
+        rerun: Optional[str],
+        last_failed: bool,
+        failed_first: bool,
+    ):
+        if engine not in ENGINES:
+            raise ValueError(f"Unsupported engine: {engine}")
+        if rerun is not None and rerun not in RERUN_MODES:
+            raise ValueError(f"Unsupported rerun mode: {rerun}")
+        if record_cassette and replay_cassette:
+            raise ValueError("Cannot record and replay a cassette in the same run")
+
+        self._profiler = profiler
+
+        with self._profile_phase("setup"):
+            self._setup_run(
+                filter,
+                work_dir,
+                num_threads,
+                verbose,
+                adaptive_concurrency,
+                use_cache,
+                refresh_cache,
+                record_cassette,
+                replay_cassette,
+                resume,
+                rerun,
+                last_failed,
+                failed_first,
+            )
+
+        log_run_start(verbose, self._num_tests, self._num_threads)
+        if resume:
+            log_resume(self._num_tests - len(self._pending_tests))
+        elif rerun:
+            log_reuse(self._num_tests - len(self._pending_tests))
+        if last_failed:
+            log_last_failed(len(self._failed_tests))
+        elif failed_first:
+            log_failed_first(len(self._failed_tests))
+
+        self._start_time = time.time()
+
+    @contextlib.contextmanager
+    def _open_run(self):
+        # results are journaled as soon as each test completes, so an
+        # interrupted run can be resumed
+        self._journal = ResultJournal.in_work_dir(self._work_dir)
+        self._journal.open(resume=self._append_journal)
+        try:
+            with Progress(transient=True) as self._progress:
+                self._tracker = self._progress.add_task(
+                    "running...",
+                    total=self._num_tests,
+                    completed=self._num_tests - len(self._pending_tests),
+                )
+                yield
+        finally:
+            self._journal.close()
+            for sink in self._sinks:
+                sink.close()
+            # keep the responses recorded before a failure
+            if self._record_cassette is not None:
+                self._record_cassette.save()
+
+    def _run_engine(self, engine: str):
+        error = None
+        try:
+            if engine == _ASYNCIO_ENGINE:
+                # tests share the thread running the event loop with the asyncio engine
+                with self._profile_thread("evaluation"):
+                    asyncio.run(self._arun_concurrent())
+            else:
+                self._run_concurrent()
+        except BaseException as e:
+            error = e
+        self._completed.put(_RunEnd(error))
+
+    async def _arun_engine(self):
+        error = None
+        try:
+            await self._arun_concurrent()
+        except Exception as e:
+            error = e
+        await self._acompleted.put(_RunEnd(error))
+
+    def _finish_run(self, verbose: bool):
+        with self._profile_phase("summary"):
+            latencies = calculate_latency_percentiles(self._durations)
+
+            log_run_end(
+                verbose,
+                {test.name: self._statuses[test.name] for test in self._test_suite},
+                self._num_tests,
+                self._pass_count,
+                self._num_tests - self._pass_count,
+                round(time.time() - self._start_time, 2),
+                sum(self._evaluator_input_token_counts),
+                sum(self._evaluator_output_token_counts),
+                sum(self._evaluator_cache_read_input_token_counts),
+                sum(self._evaluator_cache_write_input_token_counts),
+                latencies,
+            )
+
+            # results are read back from the journal one at a time as the summary is
+            # written, so they are not kept in memory
+            entries = self._journal.iter_entries(
+                [test.name for test in self._test_suite]
+            )
+            create_markdown_summary(
+                self._work_dir,
+                self._pass_count,
+                self._num_tests,
+                self._test_suite.tests,
+                (entry.result for entry in entries),
+                self._statuses,
+                split=self.config.get("summary", {}).get("split", False),
+            )
+            create_latency_summary(self._work_dir, latencies)
 
     def _setup_run(
-        self, filter: Optional[str], work_dir: Optional[str], num_threads: Optional[int]
+        self,
+        filter: Optional[str],
+        work_dir: Optional[str],
+        num_threads: Optional[int],
+        verbose: bool = False,
+        adaptive_concurrency: bool = False,
+        use_cache: bool = True,
+        refresh_cache: bool = False,
+        record_cassette: Optional[str] = None,
+        replay_cassette: Optional[str] = None,
+        resume: bool = False,
+        rerun: Optional[str] = None,
+        last_failed: bool = False,
+        failed_first: bool = False,
     ):
         self._evaluator_factory = EvaluatorFactory(config=self.config["evaluator"])
         self._target_factory = TargetFactory(config=self.config["target"])
+        self._work_dir = work_dir or os.getcwd()
         self._test_suite = TestSuite.load(self.config["tests"], filter)
+
+        # the results of earlier runs are kept in the journal when they are reused,
+        # or when only the tests which failed are run
+        reuse = resume or rerun is not None
+        self._append_journal = reuse or last_failed
+        journaled = (
+            ResultJournal.in_work_dir(self._work_dir).load()
+            if reuse or last_failed or failed_first
+            else {}
+        )
+        self._failed_tests = {
+            test.name
+            for test in self._test_suite
+            if test.name in journaled and journaled[test.name].result.passed is not True
+        }
+        if last_failed and self._failed_tests:
+            self._test_suite = TestSuite(
+                tests=[
+                    test for test in self._test_suite if test.name in self._failed_tests
+                ]
+            )
+
         self._lock = threading.Lock()
         self._num_tests = self._test_suite.num_tests
-        self._work_dir = work_dir or os.getcwd()
         self._num_threads = self._resolve_num_threads(self._num_tests, num_threads)
-        self._results = {test.name: None for test in self._test_suite}
+        # clients are shared by all tests, so size their pools to the calls made by
+        # every thread at the same time. Targets are invoked between the calls of
+        # the evaluator, so they do not add to the calls of a test.
+        configure_boto3_client_pool(
+            max_pool_connections=self._num_threads
+            * self._evaluator_factory.max_concurrent_calls()
+        )
+        self._adaptive_concurrency_limiter = (
+            AdaptiveConcurrencyLimiter(
+                max_concurrency=self._num_threads,
+                on_change=lambda previous, current, reason: log_concurrency_change(
+                    verbose, previous, current, reason
+                ),
+            )
+            if adaptive_concurrency
+            else None
+        )
+        self._completion_cache = (
+            self._create_completion_cache(refresh_cache) if use_cache else None
+        )
+        self._record_cassette = Cassette(record_cassette) if record_cassette else None
+        self._replay_cassette = (
+            Cassette.load(replay_cassette) if replay_cassette else None
+        )
         self._evaluator_input_token_counts = []
         self._evaluator_output_token_counts = []
+        self._evaluator_cache_read_input_token_counts = []
+        self._evaluator_cache_write_input_token_counts = []
+        self._durations: dict[str, list[float]] = {}
         self._pass_count = 0
+        self._statuses: dict[str, bool] = {}
+
+        # results are written to the sinks as soon as each test completes, including
+        # the results of the tests skipped when resuming
+        self._sinks = [
+            create_sink(sink_config, self._work_dir)
+            for sink_config in self.config.get("sinks", [])
+        ]
+
+        # the journal and the queue of completed tests are created once the run starts
+        self._journal: Optional[ResultJournal] = None
+        self._completed: Optional[queue.Queue] = None
+        self._acompleted: Optional[asyncio.Queue] = None
+        self._stopped = threading.Event()
+
+        # results are reused while the inputs of their test are unchanged
+        self._fingerprints = {
+            test.name: fingerprint_test(
+                test, self.config["evaluator"], self.config["target"]
+            )
+            for test in self._test_suite
+        }
+        self._pending_tests = []
+        for test in self._test_suite:
+            entry = journaled.get(test.name) if reuse else None
+            if self._is_reusable(test, entry, rerun):
+                self._add_journal_entry(test, entry)
+            else:
+                self._pending_tests.append(test)
+
+        if failed_first:
+            # the sort is stable, so tests keep their order otherwise
+            self._pending_tests.sort(
+                key=lambda test: test.name not in self._failed_tests
+            )
+
+    def _is_reusable(
+        self, test, entry: Optional[JournalEntry], rerun: Optional[str]
+    ) -> bool:
+        if entry is None or entry.fingerprint != self._fingerprints[test.name]:
+            return False
+        return rerun != _RERUN_FAILED or entry.result.passed is True
+
+    def _create_completion_cache(
+        self, refresh_cache: bool
+    ) -> Optional[CompletionCache]:
+        cache_config = self.config["evaluator"].get("cache")
+        if not cache_config:
+            return None
+
+        # the cache can be enabled with `cache: true`
+        if cache_config is True:
+            cache_config = {}
+
+        return CompletionCache(
+            **{"cache_dir": os.path.join(self._work_dir, _CACHE_DIR), **cache_config},
+            refresh=refresh_cache,
+        )
 
     def _run_concurrent(self):
         with concurrent.futures.ThreadPoolExecutor(
             max_workers=self._num_threads
         ) as executor:
             futures = [
-                executor.submit(self._run_test, test) for test in self._test_suite
+                executor.submit(self._run_test, test) for test in self._pending_tests
             ]
             for future in concurrent.futures.as_completed(futures):
                 try:
@@ -197,20 +662,147 @@ class Plan(BaseModel):
                 except Exception as e:
                     raise e
 
-    def _run_test(self, test):
+    async def _arun_concurrent(self):
+        # each worker runs one test at a time, which bounds the number of
+        # conversations in flight without creating a task per test up front
+        tests = iter(self._pending_tests)
+
+        async def worker():
+            for test in tests:
+                if self._stopped.is_set():
+                    break
+                await self._arun_test(test)
+
+        # targets which do not support asyncio are invoked in worker threads, which
+        # are kept apart from the default executor of a caller's event loop
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=self._num_threads)
+        try:
+            with use_executor(executor):
+                await asyncio.gather(*(worker() for _ in range(self._num_threads)))
+        finally:
+            await close_async_boto3_clients()
+            await asyncio.to_thread(executor.shutdown)
+
+    def _create_target(self, test):
+        # replayed targets are never created, so no calls are made to the target
+        if self._replay_cassette is not None:
+            return ReplayTarget(
+                self._replay_cassette, test.name, self._target_factory.target_name
+            )
+
         target = self._target_factory.create()
-        evaluator = self._evaluator_factory.create(
+        if self._record_cassette is not None:
+            return RecordingTarget(target, self._record_cassette, test.name)
+        return target
+
+    def _create_evaluator(self, test):
+        target = self._create_target(test)
+        return self._evaluator_factory.create(
             test=test,
             target=target,
             work_dir=self._work_dir,
+            target_concurrency_limiter=self._target_factory.concurrency_limiter,
+            adaptive_concurrency_limiter=self._adaptive_concurrency_limiter,
+            completion_cache=self._completion_cache,
+            trace_config=self.config.get("trace"),
+        )
+
+    def _profile_phase(self, name: str, sample: bool = True):
+        if self._profiler is None:
+            return contextlib.nullcontext()
+        return self._profiler.phase(name, sample)
+
+    def _profile_thread(self, label: str):
+        if self._profiler is None:
+            return contextlib.nullcontext()
+        return self._profiler.thread(label)
+
+    def _run_test(self, test):
+        # the caller of `iter_results` stopped iterating
+        if self._stopped.is_set():
+            return
+
+        start = time.perf_counter()
+
+        # tests run on their own threads with the threads engine, so their samples
+        # can be attributed to the test
+        with self._profile_thread(f"evaluation;{test.name}"):
+            evaluator = self._create_evaluator(test)
+
+            # a null context supports both `with` and `async with`
+            with self._adaptive_concurrency_limiter or contextlib.nullcontext():
+                with telemetry.span(
+                    _TEST_SPAN_NAME, {"agenteval.test": test.name}
+                ) as span:
+                    result = evaluator.run()
+                    self._end_test_span(span, result)
+
+            entry = self._record_result(
+                test, evaluator, result, time.perf_counter() - start
+            )
+
+        if self._completed is not None:
+            self._completed.put(entry)
+
+    async def _arun_test(self, test):
+        start = time.perf_counter()
+        evaluator = self._create_evaluator(test)
+
+        async with self._adaptive_concurrency_limiter or contextlib.nullcontext():
+            with telemetry.span(_TEST_SPAN_NAME, {"agenteval.test": test.name}) as span:
+                result = await evaluator.arun()
+                self._end_test_span(span, result)
+
+        entry = self._record_result(
+            test, evaluator, result, time.perf_counter() - start
         )
 
-        result = evaluator.run()
+        if self._acompleted is not None:
+            await self._acompleted.put(entry)
+        elif self._completed is not None:
+            # the event loop runs on its own thread with `iter_results`, and the queue
+            # blocks while the caller is behind, so wait for it off the event loop
+            await asyncio.to_thread(self._completed.put, entry)
+
+    @staticmethod
+    def _end_test_span(span, result):
+        # spans are `None` if OpenTelemetry is not installed
+        if span is not None:
+            span.set_attribute("agenteval.test.passed", bool(result.passed))
+
+    def _record_result(self, test, evaluator, result, duration: float = 0.0):
+        entry = JournalEntry(
+            result=result,
+            input_token_count=evaluator.input_token_count,
+            output_token_count=evaluator.output_token_count,
+            cache_read_input_token_count=evaluator.cache_read_input_token_count,
+            cache_write_input_token_count=evaluator.cache_write_input_token_count,
+            duration=duration,
+            durations=evaluator.trace.durations,
+            fingerprint=self._fingerprints[test.name],
+        )
+        if self._journal is not None:
+            self._journal.append(entry)
 
         with self._lock:
-            if result.passed is True:
-                self._pass_count += 1
-            self._results[test.name] = result
-            self._evaluator_input_token_counts.append(evaluator.input_token_count)
-            self._evaluator_output_token_counts.append(evaluator.output_token_count)
+            self._add_journal_entry(test, entry)
             self._progress.update(self._tracker, advance=1)
+
+        return entry
+
+    def _add_journal_entry(self, test, entry: JournalEntry):
+        if entry.result.passed is True:
+            self._pass_count += 1
+        self._statuses[test.name] = entry.result.passed is True
+        self._evaluator_input_token_counts.append(entry.input_token_count)
+        self._evaluator_output_token_counts.append(entry.output_token_count)
+        self._evaluator_cache_read_input_token_counts.append(
+            entry.cache_read_input_token_count
+        )
+        self._evaluator_cache_write_input_token_counts.append(
+            entry.cache_write_input_token_count
+        )
+        for name, durations in entry.durations.items():
+            self._durations.setdefault(name, []).extend(durations)
+        for sink in self._sinks:
+            sink.write(test, entry)
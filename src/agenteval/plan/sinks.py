@@ -0,0 +1,264 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import html
+import json
+import os
+import re
+from abc import ABC, abstractmethod
+
+from agenteval.plan.journal import JournalEntry
+from agenteval.test import Test
+from agenteval.utils import import_class
+
+_DEFAULT_BUFFER_SIZE = 10
+
+_JUNIT_FILE_NAME = "agenteval_results.xml"
+_JSONL_FILE_NAME = "agenteval_results.jsonl"
+
+_JUNIT_SUITE_NAME = "agenteval"
+# the header is rewritten in place with the latest counts, so it has a fixed width
+_JUNIT_HEADER_WIDTH = 128
+_JUNIT_FOOTER = "</testsuite>\n</testsuites>\n"
+
+# characters which are not allowed in XML 1.0 documents
+_INVALID_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+_XML_ATTR_WHITESPACE = str.maketrans({"\n": "&#10;", "\r": "&#13;", "\t": "&#9;"})
+
+
+class BaseSink(ABC):
+    """Defines the common interface for result sinks, which write the result of each
+    test as soon as it completes.
+
+    Results are buffered, and written with `write_batch` once `buffer_size` results
+    are buffered or the sink is closed. Calls are serialized by the plan, so sinks do
+    not need to be thread-safe.
+
+    Attributes:
+        work_dir (str): The work directory of the run.
+        buffer_size (int): The maximum number of results buffered before they are written.
+    """
+
+    def __init__(self, work_dir: str, buffer_size: int = _DEFAULT_BUFFER_SIZE):
+        """Initialize the sink.
+
+        Args:
+            work_dir (str): The work directory of the run.
+            buffer_size (int): The maximum number of results buffered before they are written.
+
+        Raises:
+            ValueError: If `buffer_size` is less than `1`.
+        """
+        if buffer_size < 1:
+            raise ValueError(f"Invalid buffer_size: {buffer_size}")
+
+        self.work_dir = work_dir
+        self.buffer_size = buffer_size
+        self._buffer: list[tuple[Test, JournalEntry]] = []
+
+    def write(self, test: Test, entry: JournalEntry):
+        """Buffer the result of a test, writing the buffered results if the buffer is full.
+
+        Args:
+            test (Test): The test.
+            entry (JournalEntry): The result of the test.
+        """
+        self._buffer.append((test, entry))
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered results."""
+        if self._buffer:
+            self.write_batch(self._buffer)
+            self._buffer = []
+
+    def close(self):
+        """Write the buffered results, and release any resources held by the sink."""
+        self.flush()
+
+    @abstractmethod
+    def write_batch(self, entries: list[tuple[Test, JournalEntry]]):
+        """Write a batch of results.
+
+        Args:
+            entries (list[tuple[Test, JournalEntry]]): The tests and their results,
+                in the order they completed.
+        """
+        pass
+
+
+class JSONLSink(BaseSink):
+    """Writes the result of each test to a JSON Lines file.
+
+    Attributes:
+        path (str): The path of the file.
+    """
+
+    def __init__(
+        self,
+        work_dir: str,
+        path: str = _JSONL_FILE_NAME,
+        buffer_size: int = _DEFAULT_BUFFER_SIZE,
+    ):
+        """Initialize the sink.
+
+        Args:
+            work_dir (str): The work directory of the run.
+            path (str): The path of the file, relative to the work directory.
+            buffer_size (int): The maximum number of results buffered before they are written.
+        """
+        super().__init__(work_dir, buffer_size)
+        self.path = os.path.join(work_dir, path)
+        self._file = _open(self.path)
+
+    def write_batch(self, entries: list[tuple[Test, JournalEntry]]):
+        for test, entry in entries:
+            record = {
+                "test_name": test.name,
+                "passed": entry.result.passed,
+                "result": entry.result.result,
+                "reasoning": entry.result.reasoning,
+                "turns": entry.result.conversation.turns,
+                "duration": entry.duration,
+                "input_token_count": entry.input_token_count,
+                "output_token_count": entry.output_token_count,
+                "cache_read_input_token_count": entry.cache_read_input_token_count,
+                "cache_write_input_token_count": entry.cache_write_input_token_count,
+                "conversation": entry.result.conversation.messages,
+            }
+            self._file.write(
+                json.dumps(record, separators=(",", ":"), default=str) + "\n"
+            )
+        self._file.flush()
+
+    def close(self):
+        super().close()
+        self._file.close()
+
+
+class JUnitSink(BaseSink):
+    """Writes the result of each test as a test case to a JUnit XML file.
+
+    The file is a complete document after every batch, so the results written before
+    a run is interrupted can be read by CI systems.
+
+    Attributes:
+        path (str): The path of the file.
+    """
+
+    def __init__(
+        self,
+        work_dir: str,
+        path: str = _JUNIT_FILE_NAME,
+        buffer_size: int = _DEFAULT_BUFFER_SIZE,
+    ):
+        """Initialize the sink.
+
+        Args:
+            work_dir (str): The work directory of the run.
+            path (str): The path of the file, relative to the work directory.
+            buffer_size (int): The maximum number of results buffered before they are written.
+        """
+        super().__init__(work_dir, buffer_size)
+        self.path = os.path.join(work_dir, path)
+        self._file = _open(self.path)
+        self._num_tests = 0
+        self._num_failures = 0
+        self._time = 0.0
+
+        self._write_header()
+        self._cases_end = self._file.tell()
+        self._file.write(_JUNIT_FOOTER)
+        self._file.flush()
+
+    def _write_header(self):
+        self._file.seek(0)
+        suite = (
+            f'<testsuite name="{_JUNIT_SUITE_NAME}" tests="{self._num_tests}" '
+            f'failures="{self._num_failures}" time="{self._time:.3f}"'
+        )
+        self._file.write(
+            '<?xml version="1.0" encoding="utf-8"?>\n<testsuites>\n'
+            f"{suite.ljust(_JUNIT_HEADER_WIDTH)}>\n"
+        )
+
+    def write_batch(self, entries: list[tuple[Test, JournalEntry]]):
+        # append the test cases in place of the footer
+        self._file.seek(self._cases_end)
+        for test, entry in entries:
+            self._file.write(self._format_test_case(test, entry))
+            self._num_tests += 1
+            self._num_failures += entry.result.passed is not True
+            self._time += entry.duration
+        self._cases_end = self._file.tell()
+        self._file.write(_JUNIT_FOOTER)
+
+        self._write_header()
+        self._file.flush()
+
+    @staticmethod
+    def _format_test_case(test: Test, entry: JournalEntry) -> str:
+        result = entry.result
+        conversation = "\n".join(
+            f"[{sender}] {message}" for sender, message in result.conversation
+        )
+
+        test_case = (
+            f"<testcase name={_xml_attr(test.name)} "
+            f'classname="{_JUNIT_SUITE_NAME}" time="{entry.duration:.3f}">\n'
+        )
+        if result.passed is not True:
+            test_case += (
+                f"<failure message={_xml_attr(result.result)}>"
+                f"{_xml_text(result.reasoning)}</failure>\n"
+            )
+        test_case += f"<system-out>{_xml_text(conversation)}</system-out>\n"
+        return test_case + "</testcase>\n"
+
+    def close(self):
+        super().close()
+        self._file.close()
+
+
+_SINK_MAP = {
+    "jsonl": JSONLSink,
+    "junit": JUnitSink,
+}
+
+
+def create_sink(config: dict, work_dir: str) -> BaseSink:
+    """Create a sink from its configuration.
+
+    Args:
+        config (dict): The configuration of the sink, where `type` is either the name of
+            a built-in sink or the module path to a `BaseSink` subclass, and the other
+            parameters are passed to the sink.
+        work_dir (str): The work directory of the run.
+
+    Returns:
+        BaseSink
+    """
+    if config["type"] in _SINK_MAP:
+        sink_cls = _SINK_MAP[config["type"]]
+    else:
+        sink_cls = import_class(config["type"], parent_class=BaseSink)
+
+    return sink_cls(
+        work_dir=work_dir, **{k: v for k, v in config.items() if k != "type"}
+    )
+
+
+def _open(path: str):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    return open(path, "w", encoding="utf-8")
+
+
+def _xml_text(text: str) -> str:
+    return html.escape(_INVALID_XML_CHARS.sub("", str(text)), quote=False)
+
+
+def _xml_attr(text: str) -> str:
+    # whitespace is escaped as well, since it is normalized to spaces in attributes
+    escaped = html.escape(_INVALID_XML_CHARS.sub("", str(text)), quote=True)
+    return f'"{escaped.translate(_XML_ATTR_WHITESPACE)}"'
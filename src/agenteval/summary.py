@@ -1,7 +1,9 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 
+import json
 import os
+from typing import Iterable, Optional
 
 from agenteval import jinja_env
 from agenteval.metrics import calculate_pass_rate_metric
@@ -9,6 +11,9 @@ from agenteval.test import Test, TestResult
 
 _TEMPLATE_ROOT = "summary"
 _TEMPLATE_FILE_NAME = "agenteval_summary.md.jinja"
+_TEST_TEMPLATE_FILE_NAME = "agenteval_summary_test.md.jinja"
+_PAGES_DIR_NAME = "agenteval_summary"
+_LATENCY_FILE_NAME = "agenteval_latencies.json"
 
 
 def create_markdown_summary(
@@ -16,7 +21,9 @@ def create_markdown_summary(
     pass_count: int,
     num_tests: int,
     tests: list[Test],
-    test_results: list[TestResult],
+    test_results: Iterable[TestResult],
+    statuses: Optional[dict[str, bool]] = None,
+    split: bool = False,
 ):
     """
     Create a Markdown summary of the test results.
@@ -24,28 +31,76 @@ def create_markdown_summary(
     This function uses a Jinja2 template to render a Markdown summary of the
     provided tests and test results.
 
-    The summary is then written to a file in the specified working directory.
+    The summary is streamed to a file in the specified working directory as it is
+    rendered, so the summary of every test is not held in memory. If `split` is set,
+    the summary of each test is written to its own page under `agenteval_summary/`,
+    and the summary file is an index which links to each page.
 
     Args:
         work_dir (str): The directory where the summary file will be created.
         pass_count (int): The number of tests that passed.
         num_tests (int): The total number of tests.
         tests (list[Test]): A list of tests.
-        test_results (list[TestResult]): A list of test results.
+        test_results (Iterable[TestResult]): The test results, in the same order as
+            `tests`, which are iterated once.
+        statuses (Optional[dict[str, bool]]): A map of test names to whether they
+            passed, which is listed before the test results are iterated. If unspecified,
+            it is created from `test_results`.
+        split (bool): Whether to write the summary of each test to its own page.
 
     Returns:
         None
     """
+    if statuses is None:
+        test_results = list(test_results)
+        statuses = {result.test_name: bool(result.passed) for result in test_results}
+
     template = jinja_env.get_template(os.path.join(_TEMPLATE_ROOT, _TEMPLATE_FILE_NAME))
     summary_path = os.path.join(work_dir, os.path.splitext(_TEMPLATE_FILE_NAME)[0])
 
     metrics = {"pass_rate": calculate_pass_rate_metric(pass_count, num_tests)}
 
-    rendered = template.render(
-        tests=tests, results=test_results, zip=zip, metrics=metrics
+    if split:
+        _write_pages(work_dir, tests, test_results)
+
+    template.stream(
+        tests=tests,
+        results=[] if split else test_results,
+        statuses=statuses,
+        pages_dir=_PAGES_DIR_NAME if split else None,
+        zip=zip,
+        metrics=metrics,
+    ).dump(summary_path, encoding="utf-8")
+
+
+def _write_pages(work_dir: str, tests: list[Test], test_results: Iterable[TestResult]):
+    template = jinja_env.get_template(
+        os.path.join(_TEMPLATE_ROOT, _TEST_TEMPLATE_FILE_NAME)
     )
+    pages_dir = os.path.join(work_dir, _PAGES_DIR_NAME)
+    os.makedirs(pages_dir, exist_ok=True)
+
+    for test, result in zip(tests, test_results):
+        template.stream(test=test, result=result).dump(
+            os.path.join(pages_dir, f"{test.name}.md"), encoding="utf-8"
+        )
+
+
+def create_latency_summary(work_dir: str, latencies: dict[str, dict[str, float]]):
+    """
+    Write the latencies of each step, as calculated by `calculate_latency_percentiles`,
+    to a JSON file next to the Markdown summary.
+
+    Args:
+        work_dir (str): The directory where the latency file will be created.
+        latencies (dict[str, dict[str, float]]): The latencies of each step.
 
-    _write_summary(summary_path, rendered)
+    Returns:
+        None
+    """
+    _write_summary(
+        os.path.join(work_dir, _LATENCY_FILE_NAME), json.dumps(latencies, indent=2)
+    )
 
 
 def _write_summary(path: str, summary: str):
@@ -4,6 +4,16 @@
 from .target_response import TargetResponse
 from .base_target import BaseTarget
 from .boto3_target import Boto3Target
+from .cassette import Cassette, CassetteMissError, RecordingTarget, ReplayTarget
 from .target_factory import TargetFactory
 
-__all__ = ["TargetResponse", "BaseTarget", "TargetFactory", "Boto3Target"]
+__all__ = [
+    "TargetResponse",
+    "BaseTarget",
+    "TargetFactory",
+    "Boto3Target",
+    "Cassette",
+    "CassetteMissError",
+    "RecordingTarget",
+    "ReplayTarget",
+]
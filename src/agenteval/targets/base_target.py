@@ -6,11 +6,17 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 
 from agenteval.targets import TargetResponse
+from agenteval.utils.concurrency import to_thread
 
 
 class BaseTarget(ABC):
     """Defines the common interface for target classes."""
 
+    @property
+    def target_name(self) -> str:
+        """The name of the target, which identifies it in telemetry."""
+        return type(self).__name__
+
     @abstractmethod
     def invoke(self, prompt: str) -> TargetResponse:
         """Invoke the target with a prompt.
@@ -22,3 +28,17 @@ class BaseTarget(ABC):
             TargetResponse
         """
         pass
+
+    async def ainvoke(self, prompt: str) -> TargetResponse:
+        """Invoke the target with a prompt from the `asyncio` engine.
+
+        By default, `invoke` is run in a worker thread. Override this method
+        if the target can be invoked natively with `asyncio`.
+
+        Args:
+            prompt (str): The prompt as a string.
+
+        Returns:
+            TargetResponse
+        """
+        return await to_thread(self.invoke, prompt)
@@ -0,0 +1,230 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import tempfile
+import threading
+from typing import IO, Optional
+
+from agenteval.targets import BaseTarget, TargetResponse
+
+_GZIP_SUFFIX = ".gz"
+
+
+class CassetteMissError(Exception):
+    """Raised when a replayed target is invoked with a prompt that was not recorded."""
+
+
+class Cassette:
+    """A recording of target responses, keyed by test name, turn and prompt.
+
+    Cassettes are stored as JSON Lines with one interaction per line, and are
+    compressed with gzip if the path ends with `.gz`.
+
+    Attributes:
+        path (str): The path of the cassette file.
+    """
+
+    def __init__(self, path: str):
+        """Initialize an empty cassette.
+
+        Args:
+            path (str): The path of the cassette file.
+        """
+        self.path = path
+        self._interactions: dict[tuple[str, int, str], dict] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._interactions)
+
+    @classmethod
+    def load(cls, path: str) -> Cassette:
+        """Load a cassette from a file.
+
+        Args:
+            path (str): The path of the cassette file.
+
+        Returns:
+            Cassette
+        """
+        cassette = cls(path)
+
+        with _open(path, "rt", _is_compressed(path)) as f:
+            for line in f:
+                if line.strip():
+                    interaction = json.loads(line)
+                    cassette._interactions[
+                        (
+                            interaction["test"],
+                            interaction["turn"],
+                            interaction["prompt"],
+                        )
+                    ] = interaction["response"]
+
+        return cassette
+
+    def save(self):
+        """Write the cassette to its file.
+
+        If the file exists, the responses it holds for tests which were not recorded to
+        this cassette are kept, so a run of a subset of the tests does not discard the
+        responses recorded for the other tests. The responses of the recorded tests
+        are replaced.
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+
+        with self._lock:
+            interactions = dict(self._interactions)
+
+        if os.path.exists(self.path):
+            recorded_tests = {test_name for test_name, _, _ in interactions}
+            for key, response in Cassette.load(self.path)._interactions.items():
+                if key[0] not in recorded_tests:
+                    interactions[key] = response
+
+        fd, tmp_path = tempfile.mkstemp(dir=directory)
+        os.close(fd)
+        # the temporary file has no suffix, so compress based on the cassette's path
+        with _open(tmp_path, "wt", _is_compressed(self.path)) as f:
+            for (test_name, turn, prompt), response in sorted(interactions.items()):
+                f.write(
+                    json.dumps(
+                        {
+                            "test": test_name,
+                            "turn": turn,
+                            "prompt": prompt,
+                            "response": response,
+                        },
+                        separators=(",", ":"),
+                        default=str,
+                    )
+                    + "\n"
+                )
+        os.replace(tmp_path, self.path)
+
+    def record(self, test_name: str, turn: int, prompt: str, response: TargetResponse):
+        """Record a response.
+
+        Args:
+            test_name (str): The name of the test.
+            turn (int): The turn of the conversation, starting at `1`.
+            prompt (str): The prompt sent to the target.
+            response (TargetResponse): The target's response.
+        """
+        with self._lock:
+            self._interactions[(test_name, turn, prompt)] = response.model_dump()
+
+    def play(self, test_name: str, turn: int, prompt: str) -> TargetResponse:
+        """Get a recorded response.
+
+        Args:
+            test_name (str): The name of the test.
+            turn (int): The turn of the conversation, starting at `1`.
+            prompt (str): The prompt sent to the target.
+
+        Returns:
+            TargetResponse
+
+        Raises:
+            CassetteMissError: If no response was recorded for the prompt.
+        """
+        with self._lock:
+            response = self._interactions.get((test_name, turn, prompt))
+
+        if response is None:
+            raise CassetteMissError(
+                f"No response recorded for test {test_name}, turn {turn}: {prompt!r}"
+            )
+
+        return TargetResponse(**response)
+
+
+class RecordingTarget(BaseTarget):
+    """Wraps a target, recording its responses to a cassette.
+
+    Attributes:
+        target (BaseTarget): The target being recorded.
+        cassette (Cassette): The cassette the responses are recorded to.
+        test_name (str): The name of the test invoking the target.
+    """
+
+    def __init__(self, target: BaseTarget, cassette: Cassette, test_name: str):
+        """Initialize the target.
+
+        Args:
+            target (BaseTarget): The target being recorded.
+            cassette (Cassette): The cassette the responses are recorded to.
+            test_name (str): The name of the test invoking the target.
+        """
+        self.target = target
+        self.cassette = cassette
+        self.test_name = test_name
+        self._turn = 0
+
+    @property
+    def target_name(self) -> str:
+        return self.target.target_name
+
+    def invoke(self, prompt: str) -> TargetResponse:
+        self._turn += 1
+        turn = self._turn
+        response = self.target.invoke(prompt)
+        self.cassette.record(self.test_name, turn, prompt, response)
+        return response
+
+    async def ainvoke(self, prompt: str) -> TargetResponse:
+        self._turn += 1
+        turn = self._turn
+        response = await self.target.ainvoke(prompt)
+        self.cassette.record(self.test_name, turn, prompt, response)
+        return response
+
+
+class ReplayTarget(BaseTarget):
+    """Serves the responses recorded to a cassette, without invoking a target.
+
+    Attributes:
+        cassette (Cassette): The cassette the responses are served from.
+        test_name (str): The name of the test invoking the target.
+    """
+
+    def __init__(
+        self, cassette: Cassette, test_name: str, target_name: Optional[str] = None
+    ):
+        """Initialize the target.
+
+        Args:
+            cassette (Cassette): The cassette the responses are served from.
+            test_name (str): The name of the test invoking the target.
+            target_name (Optional[str]): The name of the target whose responses were
+                recorded. Defaults to the name of this class.
+        """
+        self.cassette = cassette
+        self.test_name = test_name
+        self._target_name = target_name
+        self._turn = 0
+
+    @property
+    def target_name(self) -> str:
+        return self._target_name or super().target_name
+
+    def invoke(self, prompt: str) -> TargetResponse:
+        self._turn += 1
+        return self.cassette.play(self.test_name, self._turn, prompt)
+
+    async def ainvoke(self, prompt: str) -> TargetResponse:
+        return self.invoke(prompt)
+
+
+def _is_compressed(path: str) -> bool:
+    return path.endswith(_GZIP_SUFFIX)
+
+
+def _open(path: str, mode: str, compress: bool) -> IO:
+    return gzip.open(path, mode) if compress else open(path, mode)
@@ -1,7 +1,9 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 
-from pydantic import BaseModel
+from typing import Optional
+
+from pydantic import BaseModel, PrivateAttr
 
 from agenteval.targets import BaseTarget
 from agenteval.targets.bedrock_agent import BedrockAgentTarget
@@ -11,6 +13,7 @@ from agenteval.targets.lexv2 import LexV2Target
 from agenteval.targets.q_business import QBusinessTarget
 from agenteval.targets.sagemaker_endpoint import SageMakerEndpointTarget
 from agenteval.utils import import_class
+from agenteval.utils.concurrency import ConcurrencyLimiter
 
 _TARGET_MAP = {
     "bedrock-agent": BedrockAgentTarget,
@@ -21,6 +24,8 @@ _TARGET_MAP = {
     "lex-v2": LexV2Target,
 }
 
+_RESERVED_CONFIG_KEYS = {"type", "max_concurrency", "version"}
+
 
 class TargetFactory(BaseModel):
     """A factory for creating instances of `BaseTarget` subclasses.
@@ -32,6 +37,25 @@ class TargetFactory(BaseModel):
 
     config: dict
 
+    _concurrency_limiter: Optional[ConcurrencyLimiter] = PrivateAttr(default=None)
+
+    def model_post_init(self, __context):
+        if "max_concurrency" in self.config:
+            self._concurrency_limiter = ConcurrencyLimiter(
+                self.config["max_concurrency"]
+            )
+
+    @property
+    def concurrency_limiter(self) -> Optional[ConcurrencyLimiter]:
+        """The limiter shared by all targets created by this factory, if
+        `max_concurrency` is configured."""
+        return self._concurrency_limiter
+
+    @property
+    def target_name(self) -> str:
+        """The name of the target class specified in the configuration."""
+        return self._get_target_class().__name__
+
     def create(self) -> BaseTarget:
         """Create an instance of the target class specified in the configuration.
 
@@ -41,7 +65,9 @@ class TargetFactory(BaseModel):
         """
         target_cls = self._get_target_class()
 
-        return target_cls(**{k: v for k, v in self.config.items() if k != "type"})
+        return target_cls(
+            **{k: v for k, v in self.config.items() if k not in _RESERVED_CONFIG_KEYS}
+        )
 
     def _get_target_class(self) -> type[BaseTarget]:
         if self.config["type"] in _TARGET_MAP:
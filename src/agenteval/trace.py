@@ -1,55 +1,163 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 
-import inspect
+import contextlib
+import gzip
+import hashlib
 import json
 import os
+import sys
+import threading
+import time
 from datetime import datetime, timezone
-from typing import Optional
+from importlib.util import find_spec
+from typing import IO, Optional, Union
+
+from agenteval.utils import telemetry
 
 _TRACE_DIR = "agenteval_traces"
 
+_JSON_FORMAT = "json"
+_JSONL_FORMAT = "jsonl"
+TRACE_FORMATS = [_JSON_FORMAT, _JSONL_FORMAT]
+
+_DEFAULT_FLUSH_INTERVAL = 1.0
+
+_GZIP_COMPRESSION = "gzip"
+_ZSTD_COMPRESSION = "zstd"
+_COMPRESSION_SUFFIXES = {_GZIP_COMPRESSION: ".gz", _ZSTD_COMPRESSION: ".zst"}
+
+# retention levels of payloads, which can also be truncated to a number of bytes
+_FULL_RETENTION = "full"
+_HASH_RETENTION = "hash"
+_DROP_RETENTION = "drop"
+_RETENTION_LEVELS = {_FULL_RETENTION, _HASH_RETENTION, _DROP_RETENTION}
+
+# payloads from targets are nested under this key of a step
+_DATA_KEY = "data"
+
+# the type of each record in a JSONL trace
+_START_EVENT = "start"
+_STEP_EVENT = "step"
+_END_EVENT = "end"
+
 
 class Trace:
     """A context manager which captures steps taken during evaluation.
 
-    Once the context manager exits, the trace is dumped to a JSON file.
+    With the `json` format, steps are kept in memory and the trace is dumped to a JSON
+    file once the context manager exits. With the `jsonl` format, each step is appended
+    to a JSON Lines file as it is added and is not kept in memory. Use `read_trace` to
+    read a JSONL trace in the same form as a JSON trace.
+
+    Trace files can be compressed, and the payloads of steps (such as `prompt` or the
+    `bedrock_agent_trace` returned by a target) can be kept in full, truncated, hashed
+    or dropped.
 
     Attributes:
         test_name (str): Name of the test.
         trace_dir (str): Directory to store the trace.
+        trace_format (str): The format of the trace file (`"json"` or `"jsonl"`).
         start_time (datetime): Start time of the trace.
         end_time (datetime): End time of the trace.
-        steps (list): List of steps in the trace.
+        steps (list): List of steps in the trace. Always empty with the `jsonl` format.
+        durations (dict[str, list[float]]): The durations in seconds of the timed steps,
+            by step name, which are kept in memory with either format.
 
     """
 
-    def __init__(self, test_name: str, work_dir: str):
+    def __init__(
+        self,
+        test_name: str,
+        work_dir: str,
+        format: str = _JSON_FORMAT,
+        flush_interval: float = _DEFAULT_FLUSH_INTERVAL,
+        compression: Optional[str] = None,
+        retention: Optional[dict[str, Union[str, int]]] = None,
+    ):
         """
         Initialize the trace handler.
 
         Args:
             test_name (str): Name of the test.
             work_dir (str): Directory to store the trace.
+            format (str): The format of the trace file (`"json"` or `"jsonl"`).
+            flush_interval (float): With the `jsonl` format, the maximum number of seconds
+                a step is buffered before it is flushed to the trace file. With `0`, each
+                step is flushed as it is added.
+            compression (Optional[str]): The codec used to compress the trace file
+                (`"gzip"` or `"zstd"`). If `None`, the trace file is not compressed.
+            retention (Optional[dict[str, Union[str, int]]]): A map of payload keys to
+                how they are retained: `"full"`, `"hash"`, `"drop"`, or a number of bytes
+                to truncate the payload to. Payloads are kept in full by default.
+
+        Raises:
+            ValueError: If the format, compression or a retention level is not supported.
+            ImportError: If `zstd` compression is used without `zstandard` installed.
         """
+        if format not in TRACE_FORMATS:
+            raise ValueError(f"Unsupported trace format: {format}")
+        if compression is not None and compression not in _COMPRESSION_SUFFIXES:
+            raise ValueError(f"Unsupported trace compression: {compression}")
+        if compression == _ZSTD_COMPRESSION and find_spec("zstandard") is None:
+            raise ImportError(
+                "zstd trace compression requires the `zstd` extra to be installed"
+            )
+        for key, level in (retention or {}).items():
+            if not _is_valid_retention(level):
+                raise ValueError(f"Unsupported retention for {key}: {level}")
+
         self.test_name = test_name
         self.trace_dir = os.path.join(work_dir, _TRACE_DIR)
+        self.trace_format = format
+        self.compression = compression
         self.start_time = None
         self.end_time = None
         self.steps = []
+        self.durations: dict[str, list[float]] = {}
+        self._flush_interval = flush_interval
+        self._retention = retention or {}
+        self._file: Optional[IO] = None
+        self._flushed_at = 0.0
+        self._flush_timer: Optional[threading.Timer] = None
+        self._closed = False
+        # steps may be added from worker threads by the same evaluator
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> str:
+        """The path of the trace file."""
+        return os.path.join(
+            self.trace_dir,
+            f"{self.test_name}.{self.trace_format}"
+            + _COMPRESSION_SUFFIXES.get(self.compression, ""),
+        )
 
     def __enter__(self):
         self.start_time = datetime.now(timezone.utc)
+        if self.trace_format == _JSONL_FORMAT:
+            with self._lock:
+                self._open()
         return self
 
     def __exit__(self, *exc):
         self.end_time = datetime.now(timezone.utc)
-        self._dump_trace()
+        if self.trace_format == _JSONL_FORMAT:
+            with self._lock:
+                self._write({"event": _END_EVENT, "end_time": self.end_time})
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+                self._file.close()
+                self._file = None
+                self._closed = True
+        else:
+            self._dump_trace()
 
     def _dump_trace(self):
         os.makedirs(self.trace_dir, exist_ok=True)
 
-        with open(os.path.join(self.trace_dir, f"{self.test_name}.json"), "w") as f:
+        with _open(self.path, "wt", self.compression) as f:
             json.dump(self._get_trace(), f, default=str)
 
     def _get_trace(self) -> str:
@@ -60,14 +168,213 @@ class Trace:
             "steps": self.steps,
         }
 
-    def add_step(self, step_name: Optional[str] = None, **kwargs):
+    def _open(self):
+        os.makedirs(self.trace_dir, exist_ok=True)
+
+        self._file = _open(self.path, "wt", self.compression)
+        self._write(
+            {
+                "event": _START_EVENT,
+                "test_name": self.test_name,
+                "start_time": self.start_time,
+            }
+        )
+
+    def _write(self, record: dict):
+        self._file.write(json.dumps(record, default=str) + "\n")
+
+        now = time.monotonic()
+        if now - self._flushed_at >= self._flush_interval:
+            self._flush(now)
+        elif self._flush_timer is None:
+            # flush the buffered records once the interval has passed, even if no
+            # other step is added by then
+            self._flush_timer = threading.Timer(
+                self._flushed_at + self._flush_interval - now, self._flush_on_schedule
+            )
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def flush(self):
+        """Write the steps buffered with the `jsonl` format to the trace file, so they
+        can be read with `read_trace` before the trace is closed.
+        """
+        with self._lock:
+            if self._file is not None:
+                self._flush(time.monotonic())
+
+    def _flush(self, now: float):
+        self._file.flush()
+        self._flushed_at = now
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+    def _flush_on_schedule(self):
+        with self._lock:
+            # the trace may have been closed, or flushed by a later step, since the
+            # timer was started
+            if self._file is not None and self._flush_timer is not None:
+                self._flush_timer = None
+                self._flush(time.monotonic())
+
+    def record_duration(self, name: str, duration: float):
+        """Record the duration of a step, without adding it to the trace.
+
+        Args:
+            name (str): The name of the step.
+            duration (float): The duration of the step in seconds.
+        """
+        with self._lock:
+            self.durations.setdefault(name, []).append(duration)
+        telemetry.record_duration(name, duration)
+
+    @contextlib.contextmanager
+    def timer(self, name: str):
+        """Record the duration of the code run within the context.
+
+        Args:
+            name (str): The name of the step.
+        """
+        started_at = time.monotonic()
+        try:
+            yield
+        finally:
+            self.record_duration(name, time.monotonic() - started_at)
+
+    def add_step(
+        self,
+        step_name: Optional[str] = None,
+        started_at: Optional[float] = None,
+        ended_at: Optional[float] = None,
+        **kwargs,
+    ):
         """Add a step to the trace.
 
+        Steps can't be added to a `jsonl` trace once it has been closed, since the
+        trace file is complete.
+
         Args:
             step_name (Optional[str]): The name of the step. Defaults to
                 the name of the caller function
+            started_at (Optional[float]): The time at which the step started, as returned
+                by `time.monotonic()`. If provided, the duration of the step is recorded.
+            ended_at (Optional[float]): The time at which the step ended, as returned
+                by `time.monotonic()`. Defaults to the time the step is added.
+
+        Raises:
+            RuntimeError: If the trace uses the `jsonl` format and has been closed.
         """
-        step_name = step_name or inspect.stack()[1].function
+        if self._closed:
+            raise RuntimeError(
+                f"Cannot add a step to the closed trace of {self.test_name}"
+            )
+
+        # look up the caller's frame directly, since `inspect.stack` resolves
+        # the source context of every frame in the stack
+        step_name = step_name or sys._getframe(1).f_code.co_name
         step = {"timestamp": datetime.now(timezone.utc), "step_name": step_name}
+        if started_at is not None:
+            if ended_at is None:
+                ended_at = time.monotonic()
+            step["duration"] = ended_at - started_at
+            self.record_duration(step_name, step["duration"])
         step.update(kwargs)
-        self.steps.append(step)
+        if self._retention:
+            step = self._retain(step)
+
+        if self.trace_format == _JSONL_FORMAT:
+            with self._lock:
+                # steps added before entering the context manager open the file
+                if self._file is None:
+                    self._open()
+                self._write({"event": _STEP_EVENT, "step": step})
+        else:
+            self.steps.append(step)
+
+    def _retain(self, payloads: dict) -> dict:
+        retained = {}
+        for key, value in payloads.items():
+            if key == _DATA_KEY and isinstance(value, dict):
+                value = self._retain(value)
+
+            level = self._retention.get(key, _FULL_RETENTION)
+            if level == _DROP_RETENTION:
+                continue
+            if level == _HASH_RETENTION:
+                value = "sha256:" + hashlib.sha256(_serialize(value)).hexdigest()
+            elif isinstance(level, int):
+                value = _serialize(value)[:level].decode(errors="ignore")
+            retained[key] = value
+
+        return retained
+
+
+def _is_valid_retention(level: Union[str, int]) -> bool:
+    # booleans are integers, but are not a number of bytes
+    if isinstance(level, int) and not isinstance(level, bool):
+        return level >= 0
+    return level in _RETENTION_LEVELS
+
+
+def _serialize(value) -> bytes:
+    if not isinstance(value, str):
+        value = json.dumps(value, default=str, sort_keys=True)
+    return value.encode()
+
+
+def _get_compression(path: str) -> Optional[str]:
+    for compression, suffix in _COMPRESSION_SUFFIXES.items():
+        if path.endswith(suffix):
+            return compression
+    return None
+
+
+def _open(path: str, mode: str, compression: Optional[str]) -> IO:
+    if compression == _GZIP_COMPRESSION:
+        return gzip.open(path, mode)
+    if compression == _ZSTD_COMPRESSION:
+        import zstandard
+
+        return zstandard.open(path, mode)
+    return open(path, mode)
+
+
+def read_trace(path: str) -> dict:
+    """Read a trace file in either format, decompressing it if needed.
+
+    Args:
+        path (str): The path of the trace file.
+
+    Returns:
+        dict: The trace, in the form of a JSON trace, with the `test_name`, `start_time`,
+            `end_time` and `steps` of the trace. The `end_time` is `None` if the test
+            has not finished.
+    """
+    compression = _get_compression(path)
+    uncompressed_path = path.removesuffix(_COMPRESSION_SUFFIXES.get(compression, ""))
+
+    with _open(path, "rt", compression) as f:
+        if not uncompressed_path.endswith(f".{_JSONL_FORMAT}"):
+            return json.load(f)
+
+        trace = {"test_name": None, "start_time": None, "end_time": None, "steps": []}
+
+        try:
+            for line in f:
+                # the last line may be partially written if the test has not finished
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+
+                event = record.pop("event")
+                if event == _STEP_EVENT:
+                    trace["steps"].append(record["step"])
+                else:
+                    trace.update(record)
+        except EOFError:
+            # the end of a compressed stream is only written once the test finishes
+            pass
+
+        return trace
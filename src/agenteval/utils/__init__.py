@@ -1,7 +1,7 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 
-from .aws import create_boto3_client
+from .aws import configure_boto3_client_pool, create_boto3_client
 from .imports import import_class
 
-__all__ = ["import_class", "create_boto3_client"]
+__all__ = ["import_class", "create_boto3_client", "configure_boto3_client_pool"]
@@ -1,6 +1,10 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 
+import asyncio
+import functools
+import threading
+from importlib.util import find_spec
 from typing import Optional
 
 import boto3
@@ -9,6 +13,40 @@ from botocore.config import Config
 
 _RETRY_MODE = "adaptive"
 
+# botocore default
+_DEFAULT_MAX_POOL_CONNECTIONS = 10
+
+_client_pool: dict[tuple, BaseClient] = {}
+_client_pool_lock = threading.Lock()
+_max_pool_connections = _DEFAULT_MAX_POOL_CONNECTIONS
+
+# async clients are bound to the event loop they were created in
+_async_client_pool: dict[tuple, asyncio.Task] = {}
+
+
+def configure_boto3_client_pool(max_pool_connections: int):
+    """Configure the size of the connection pool used by clients created with
+    `create_boto3_client`.
+
+    Cached clients are discarded if the size of the connection pool changes.
+
+    Args:
+        max_pool_connections (int): The maximum number of connections to keep in
+            the connection pool of each client.
+    """
+    global _max_pool_connections
+
+    with _client_pool_lock:
+        if max_pool_connections != _max_pool_connections:
+            _max_pool_connections = max_pool_connections
+            _client_pool.clear()
+
+
+def clear_boto3_client_pool():
+    """Discard all cached clients."""
+    with _client_pool_lock:
+        _client_pool.clear()
+
 
 def create_boto3_client(
     boto3_service_name: str,
@@ -19,6 +57,10 @@ def create_boto3_client(
 ) -> BaseClient:
     """Create a `boto3` client.
 
+    Clients are cached for the lifetime of the process, so calls with the same
+    arguments return the same client and share its connection pool. `boto3` clients
+    are thread-safe, but sessions are not, so clients are created under a lock.
+
     Args:
         boto3_service_name (str): The `boto3` service name (e.g `"bedrock-runtime"`).
         aws_profile (Optional[str]): The AWS profile name.
@@ -29,8 +71,118 @@ def create_boto3_client(
     Returns:
         BaseClient
     """
+    key = (boto3_service_name, aws_profile, aws_region, endpoint_url, max_retry)
+
+    with _client_pool_lock:
+        client = _client_pool.get(key)
+
+        if client is None:
+            config = Config(
+                retries={"max_attempts": max_retry, "mode": _RETRY_MODE},
+                max_pool_connections=_max_pool_connections,
+            )
+
+            session = boto3.Session(profile_name=aws_profile, region_name=aws_region)
+            client = session.client(
+                boto3_service_name, endpoint_url=endpoint_url, config=config
+            )
+            _client_pool[key] = client
+
+    return client
+
+
+def async_boto3_client_available() -> bool:
+    """Check if `aiobotocore` is installed, which is required to create async clients.
+
+    Returns:
+        bool
+    """
+    return find_spec("aiobotocore") is not None
+
+
+async def create_async_boto3_client(
+    boto3_service_name: str,
+    aws_profile: Optional[str],
+    aws_region: Optional[str],
+    endpoint_url: Optional[str],
+    max_retry: int,
+):
+    """Create an `aiobotocore` client.
+
+    Clients are cached per event loop, so calls with the same arguments return the
+    same client. Clients must be closed with `close_async_boto3_clients` before the
+    event loop is closed.
+
+    Args:
+        boto3_service_name (str): The `boto3` service name (e.g `"bedrock-runtime"`).
+        aws_profile (Optional[str]): The AWS profile name.
+        aws_region (Optional[str]): The AWS region.
+        endpoint_url (Optional[str]): The endpoint URL for the AWS service.
+        max_retry (int): The maximum number of retry attempts.
+
+    Returns:
+        AioBaseClient
+    """
+    key = (
+        asyncio.get_running_loop(),
+        boto3_service_name,
+        aws_profile,
+        aws_region,
+        endpoint_url,
+        max_retry,
+    )
+
+    # cache the task creating the client, so concurrent callers share one client
+    if key not in _async_client_pool:
+        task = asyncio.create_task(
+            _create_async_boto3_client(
+                boto3_service_name, aws_profile, aws_region, endpoint_url, max_retry
+            )
+        )
+        task.add_done_callback(functools.partial(_discard_failed_client, key))
+        _async_client_pool[key] = task
+
+    return await _async_client_pool[key]
+
+
+def _discard_failed_client(key: tuple, task: asyncio.Task):
+    # the client is created again by the next call, instead of raising the same error
+    if task.cancelled() or task.exception() is not None:
+        if _async_client_pool.get(key) is task:
+            del _async_client_pool[key]
+
+
+async def _create_async_boto3_client(
+    boto3_service_name: str,
+    aws_profile: Optional[str],
+    aws_region: Optional[str],
+    endpoint_url: Optional[str],
+    max_retry: int,
+):
+    from aiobotocore.config import AioConfig
+    from aiobotocore.session import AioSession
+
+    config = AioConfig(
+        retries={"max_attempts": max_retry, "mode": _RETRY_MODE},
+        max_pool_connections=_max_pool_connections,
+    )
+
+    session = AioSession(profile=aws_profile)
+    return await session.create_client(
+        boto3_service_name,
+        region_name=aws_region,
+        endpoint_url=endpoint_url,
+        config=config,
+    ).__aenter__()
+
+
+async def close_async_boto3_clients():
+    """Close the async clients created in the running event loop."""
+    loop = asyncio.get_running_loop()
 
-    config = Config(retries={"max_attempts": max_retry, "mode": _RETRY_MODE})
+    for key in [key for key in _async_client_pool if key[0] is loop]:
+        task = _async_client_pool.pop(key)
 
-    session = boto3.Session(profile_name=aws_profile, region_name=aws_region)
-    return session.client(boto3_service_name, endpoint_url=endpoint_url, config=config)
+        # skip clients which failed to be created
+        if task.done() and not task.cancelled() and task.exception() is None:
+            await task.result().close()
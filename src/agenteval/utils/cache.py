@@ -0,0 +1,165 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Optional
+
+_ENTRY_SUFFIX = ".json"
+
+_DEFAULT_MAX_SIZE_MB = 512
+_DEFAULT_TTL_DAYS = 30
+
+_BYTES_PER_MB = 1024 * 1024
+_SECONDS_PER_DAY = 24 * 60 * 60
+
+
+class CompletionCache:
+    """A persistent cache of model completions, stored as a JSON file per entry
+    and addressed by a hash of the request.
+
+    Entries expire `ttl_days` after they are written. Once the cache grows larger than
+    `max_size_mb`, the least recently used entries are evicted. Entries are written atomically, so the cache can
+    be shared by concurrent tests and runs.
+
+    Attributes:
+        cache_dir (str): The directory where entries are stored.
+        refresh (bool): Whether existing entries are ignored, so every entry is rewritten.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_size_mb: float = _DEFAULT_MAX_SIZE_MB,
+        ttl_days: float = _DEFAULT_TTL_DAYS,
+        refresh: bool = False,
+    ):
+        """Initialize the cache.
+
+        Args:
+            cache_dir (str): The directory where entries are stored.
+            max_size_mb (float): The maximum size of the cache in megabytes.
+            ttl_days (float): The number of days after which an entry expires.
+            refresh (bool): Whether to ignore existing entries.
+        """
+        self.cache_dir = cache_dir
+        self.refresh = refresh
+        self._max_size = max_size_mb * _BYTES_PER_MB
+        self._ttl = ttl_days * _SECONDS_PER_DAY
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """Create the key of an entry from the parts of a request, such as the
+        model ID and the request body.
+
+        Args:
+            *parts (str): The parts of the request.
+
+        Returns:
+            str
+        """
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part.encode())
+            # separate the parts, so they cannot be shifted into each other
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _get_path(self, key: str) -> str:
+        # spread entries across subdirectories to keep directories small
+        return os.path.join(self.cache_dir, key[:2], f"{key}{_ENTRY_SUFFIX}")
+
+    def get(self, key: str) -> Optional[dict]:
+        """Get an entry.
+
+        Args:
+            key (str): The key of the entry.
+
+        Returns:
+            Optional[dict]: The entry, or `None` if it is missing, expired or
+                the cache is being refreshed.
+        """
+        if self.refresh:
+            return None
+
+        path = self._get_path(key)
+        try:
+            modified_at = os.path.getmtime(path)
+            if time.time() - modified_at > self._ttl:
+                return None
+            with open(path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        # the access time orders entries for eviction, while the modification time
+        # is kept to expire the entry
+        with contextlib.suppress(OSError):
+            os.utime(path, (time.time(), modified_at))
+
+        return entry
+
+    def put(self, key: str, entry: dict):
+        """Store an entry, evicting the least recently used entries if the cache
+        is full.
+
+        Args:
+            key (str): The key of the entry.
+            entry (dict): The entry, which must be serializable to JSON.
+        """
+        path = self._get_path(key)
+        data = json.dumps(entry)
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, "w") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            if self._size is None:
+                self._evict()
+            else:
+                self._size += len(data)
+                if self._size > self._max_size:
+                    self._evict()
+
+    def evict(self):
+        """Remove expired entries, then the least recently used entries until the cache
+        is no larger than its maximum size."""
+        with self._lock:
+            self._evict()
+
+    def _evict(self):
+        entries = []
+        for dir_path, _, file_names in os.walk(self.cache_dir):
+            for file_name in file_names:
+                if file_name.endswith(_ENTRY_SUFFIX):
+                    path = os.path.join(dir_path, file_name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    entries.append((stat.st_atime, stat.st_mtime, stat.st_size, path))
+
+        now = time.time()
+        size = 0
+
+        # keep the most recently used entries which fit in the cache
+        for _, mtime, entry_size, path in sorted(entries, reverse=True):
+            if now - mtime > self._ttl or size + entry_size > self._max_size:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            else:
+                size += entry_size
+
+        self._size = size
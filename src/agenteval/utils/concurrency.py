@@ -0,0 +1,308 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import concurrent.futures
+import contextlib
+import contextvars
+import functools
+import threading
+import time
+from typing import Callable, Optional
+
+from botocore.exceptions import ClientError
+
+_THROTTLING_ERROR_CODES = {
+    "ThrottlingException",
+    "ServiceQuotaExceededException",
+    "TooManyRequestsException",
+}
+
+# multiplicative decrease applied to the limit when congestion is detected
+_DECREASE_FACTOR = 0.5
+
+# a call is considered congested if its latency exceeds the usual latency by this factor
+_LATENCY_THRESHOLD = 2.0
+
+# weight of the latest latency in the moving average of latencies
+_LATENCY_SMOOTHING = 0.1
+
+# a call is only considered congested if its latency also exceeds the usual latency by
+# this many seconds, so jitter in very fast calls is not mistaken for congestion
+_MIN_LATENCY_INCREASE = 0.05
+
+# the reasons the limit is decreased, passed to `on_change`
+THROTTLING = "throttling"
+LATENCY = "latency"
+
+# the executor which runs blocking calls in the current context, see `use_executor`
+_executor: contextvars.ContextVar[Optional[concurrent.futures.Executor]] = (
+    contextvars.ContextVar("executor", default=None)
+)
+
+
+class ConcurrencyLimiter:
+    """Limits the number of calls in flight.
+
+    Use as a context manager from threads, or as an async context manager
+    from the `asyncio` engine.
+
+    Attributes:
+        max_concurrency (int): The maximum number of calls in flight.
+    """
+
+    def __init__(self, max_concurrency: int):
+        """Initialize the limiter.
+
+        Args:
+            max_concurrency (int): The maximum number of calls in flight.
+
+        Raises:
+            ValueError: If `max_concurrency` is less than `1`.
+        """
+        if max_concurrency < 1:
+            raise ValueError(f"Invalid max_concurrency: {max_concurrency}")
+
+        self.max_concurrency = max_concurrency
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._async_semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def __enter__(self):
+        self._semaphore.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self._semaphore.release()
+
+    def _get_async_semaphore(self) -> asyncio.Semaphore:
+        # asyncio semaphores must be used from a single event loop
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._async_semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._async_semaphore
+
+    async def __aenter__(self):
+        await self._get_async_semaphore().acquire()
+        return self
+
+    async def __aexit__(self, *exc):
+        self._async_semaphore.release()
+
+
+class AdaptiveConcurrencyLimiter:
+    """Limits the number of calls in flight, adjusting the limit with additive increase
+    and multiplicative decrease (AIMD) based on the calls observed with `observe`.
+
+    The limit starts at `initial_concurrency` and doubles every round-trip until
+    congestion is first detected, after which it grows by one every round-trip.
+    It is halved when a call is throttled or its latency rises well above the moving
+    average latency of calls from the same source, at most once per round-trip. The
+    average includes slow calls, so it adapts to a lasting change in latency.
+
+    Use as a context manager from threads, or as an async context manager
+    from the `asyncio` engine.
+
+    Attributes:
+        limit (int): The current number of calls allowed in flight.
+        max_concurrency (int): The maximum number of calls allowed in flight.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        initial_concurrency: int = 1,
+        on_change: Optional[Callable[[int, int, Optional[str]], None]] = None,
+    ):
+        """Initialize the limiter.
+
+        Args:
+            max_concurrency (int): The maximum number of calls allowed in flight.
+            initial_concurrency (int): The number of calls allowed in flight initially.
+            on_change (Optional[Callable[[int, int, Optional[str]], None]]): Called with
+                the previous and new limit whenever the limit changes, and the reason the
+                limit was decreased (`THROTTLING` or `LATENCY`), which is `None` if the
+                limit was increased.
+
+        Raises:
+            ValueError: If `max_concurrency` is less than `1`.
+        """
+        if max_concurrency < 1:
+            raise ValueError(f"Invalid max_concurrency: {max_concurrency}")
+
+        self.max_concurrency = max_concurrency
+        self.limit = max(1, min(initial_concurrency, max_concurrency))
+        self._on_change = on_change
+        self._lock = threading.Lock()
+        self._condition = threading.Condition(self._lock)
+        self._waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self._in_flight = 0
+        self._slow_start = True
+        self._successes = 0
+        self._completions = 0
+        self._next_decrease_at = 0
+        self._latency_baselines: dict[str, float] = {}
+
+    def __enter__(self):
+        with self._condition:
+            self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+        return self
+
+    def __exit__(self, *exc):
+        with self._lock:
+            self._in_flight -= 1
+            self._notify()
+
+    async def __aenter__(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                if self._in_flight < self.limit:
+                    self._in_flight += 1
+                    return self
+                future = loop.create_future()
+                self._waiters.append((loop, future))
+            await future
+
+    async def __aexit__(self, *exc):
+        self.__exit__(*exc)
+
+    def _notify(self):
+        # signals may be recorded from worker threads, so wake up
+        # waiting tasks through their event loop
+        self._condition.notify_all()
+        for loop, future in self._waiters:
+            loop.call_soon_threadsafe(_set_result_unless_done, future)
+        self._waiters.clear()
+
+    @contextlib.contextmanager
+    def observe(self, source: str):
+        """Observe a call, recording its latency if it succeeds, or congestion
+        if it is throttled.
+
+        Args:
+            source (str): The source of the call (e.g. `"target"`), used to compare
+                the latency of the call to earlier calls from the same source.
+        """
+        start = time.monotonic()
+        try:
+            yield
+        except ClientError as e:
+            if is_throttling_error(e):
+                self.record_congestion()
+            raise
+        else:
+            self.record_latency(source, time.monotonic() - start)
+
+    def record_latency(self, source: str, latency: float):
+        """Record the latency of a successful call.
+
+        Args:
+            source (str): The source of the call.
+            latency (float): The latency of the call in seconds.
+        """
+        with self._lock:
+            self._completions += 1
+            baseline = self._latency_baselines.get(source, latency)
+            self._latency_baselines[source] = baseline + _LATENCY_SMOOTHING * (
+                latency - baseline
+            )
+
+            if (
+                latency > baseline * _LATENCY_THRESHOLD
+                and latency - baseline > _MIN_LATENCY_INCREASE
+            ):
+                self._decrease(LATENCY)
+            else:
+                self._increase()
+
+    def record_congestion(self):
+        """Record a throttled or retried call."""
+        with self._lock:
+            self._completions += 1
+            self._decrease(THROTTLING)
+
+    def _increase(self):
+        self._successes += 1
+
+        # grow by one per call during slow start, otherwise by one per round-trip
+        if self._slow_start or self._successes >= self.limit:
+            self._successes = 0
+            self._set_limit(min(self.limit + 1, self.max_concurrency))
+
+    def _decrease(self, reason: str):
+        # only decrease once per round-trip, as calls in flight at the time of
+        # the last decrease may report the same congestion
+        if self._completions < self._next_decrease_at:
+            return
+
+        self._slow_start = False
+        self._successes = 0
+        self._next_decrease_at = self._completions + self._in_flight
+        self._set_limit(max(1, int(self.limit * _DECREASE_FACTOR)), reason)
+
+    def _set_limit(self, limit: int, reason: Optional[str] = None):
+        previous, self.limit = self.limit, limit
+
+        if limit > previous:
+            self._notify()
+        if limit != previous and self._on_change:
+            self._on_change(previous, limit, reason)
+
+
+def is_throttling_error(error: Exception) -> bool:
+    """Check if an error was raised because a call to an AWS service was throttled.
+
+    Args:
+        error (Exception): The error.
+
+    Returns:
+        bool
+    """
+    return (
+        isinstance(error, ClientError)
+        and error.response.get("Error", {}).get("Code") in _THROTTLING_ERROR_CODES
+    )
+
+
+@contextlib.contextmanager
+def use_executor(executor: concurrent.futures.Executor):
+    """Run the blocking calls made with `to_thread` in the current context, and in the
+    tasks created within it, in an executor instead of the default executor of the
+    event loop.
+
+    Args:
+        executor (concurrent.futures.Executor): The executor.
+    """
+    token = _executor.set(executor)
+    try:
+        yield
+    finally:
+        _executor.reset(token)
+
+
+async def to_thread(func: Callable, /, *args, **kwargs):
+    """Run a blocking function in a worker thread, like `asyncio.to_thread`.
+
+    The function runs in the executor set with `use_executor`, or in the default
+    executor of the event loop, with a copy of the current context.
+
+    Args:
+        func (Callable): The function.
+        *args: The positional arguments of the function.
+        **kwargs: The keyword arguments of the function.
+
+    Returns:
+        The result of the function.
+    """
+    context = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(
+        _executor.get(), functools.partial(context.run, func, *args, **kwargs)
+    )
+
+
+def _set_result_unless_done(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
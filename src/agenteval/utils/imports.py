@@ -4,7 +4,7 @@
 from importlib import import_module
 from typing import Optional
 
-_ALLOWED_MODULE_NAME_SUFFIX = ["_hook", "_target"]
+_ALLOWED_MODULE_NAME_SUFFIX = ["_hook", "_sink", "_target"]
 
 
 def import_class(module_path: str, parent_class: Optional[type] = None) -> type:
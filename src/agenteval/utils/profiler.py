@@ -0,0 +1,151 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import collections
+import contextlib
+import os
+import sys
+import threading
+import time
+from typing import Optional
+
+_DEFAULT_INTERVAL = 0.005
+
+
+class SamplingProfiler:
+    """A wall-clock profiler which periodically samples the stacks of labelled threads.
+
+    Unlike `cProfile`, which only profiles the thread it is enabled in, the stacks of
+    every thread running a test are sampled. Samples are grouped by the label of their
+    thread, and can be written as folded stacks, which can be read by flame graph tools
+    such as `flamegraph.pl` and speedscope. The wall-clock and CPU time of each phase
+    of a run is also measured.
+
+    Attributes:
+        interval (float): The number of seconds between samples.
+        phase_timings (dict[str, tuple[float, float]]): A map of phase names to their
+            wall-clock and process CPU time in seconds.
+    """
+
+    def __init__(self, interval: float = _DEFAULT_INTERVAL):
+        """Initialize the profiler.
+
+        Args:
+            interval (float): The number of seconds between samples.
+        """
+        self.interval = interval
+        self.phase_timings: dict[str, tuple[float, float]] = {}
+        self._samples: collections.Counter = collections.Counter()
+        self._labels: dict[int, str] = {}
+        self._stopped = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start sampling in a background thread."""
+        self._stopped.clear()
+        self._sampler = threading.Thread(target=self._sample_periodically, daemon=True)
+        self._sampler.start()
+
+    def stop(self):
+        """Stop sampling."""
+        self._stopped.set()
+        if self._sampler:
+            self._sampler.join()
+            self._sampler = None
+
+    @contextlib.contextmanager
+    def phase(self, name: str, sample: bool = True):
+        """Measure the wall-clock and CPU time of a phase of the run.
+
+        Args:
+            name (str): The name of the phase.
+            sample (bool): Whether to sample the current thread during the phase,
+                labelled with the name of the phase.
+        """
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            with self.thread(name) if sample else contextlib.nullcontext():
+                yield
+        finally:
+            self.phase_timings[name] = (
+                time.perf_counter() - wall_start,
+                time.process_time() - cpu_start,
+            )
+
+    @contextlib.contextmanager
+    def thread(self, label: str):
+        """Sample the current thread while in the context.
+
+        Args:
+            label (str): The label of the samples (e.g. `"setup"`), which is the root
+                frame of the folded stacks. Use `;` to nest labels.
+        """
+        ident = threading.get_ident()
+        previous = self._labels.get(ident)
+        self._labels[ident] = label
+        try:
+            yield
+        finally:
+            if previous is None:
+                del self._labels[ident]
+            else:
+                self._labels[ident] = previous
+
+    def _sample_periodically(self):
+        while not self._stopped.wait(self.interval):
+            self._sample()
+
+    def _sample(self):
+        labels = dict(self._labels)
+        for ident, frame in sys._current_frames().items():
+            label = labels.get(ident)
+            if label is None:
+                continue
+
+            stack = []
+            while frame is not None:
+                stack.append(_format_frame(frame))
+                frame = frame.f_back
+            stack.append(label)
+            self._samples[tuple(reversed(stack))] += 1
+
+    def write_folded(self, path: str):
+        """Write the samples as folded stacks, with one stack and its number of
+        samples per line.
+
+        Args:
+            path (str): The path of the file.
+        """
+        with open(path, "w") as f:
+            for stack, count in sorted(self._samples.items()):
+                f.write(f"{';'.join(stack)} {count}\n")
+
+    def hotspots(self, limit: int = 10) -> list[tuple[str, float]]:
+        """Get the functions in which the most samples were taken.
+
+        Args:
+            limit (int): The maximum number of functions.
+
+        Returns:
+            list[tuple[str, float]]: The functions and the percentage of samples taken
+                in each function, from the most to the least samples.
+        """
+        total = sum(self._samples.values())
+        if not total:
+            return []
+
+        leaves = collections.Counter()
+        for stack, count in self._samples.items():
+            leaves[stack[-1]] += count
+
+        return [
+            (function, round(count / total * 100, 1))
+            for function, count in leaves.most_common(limit)
+        ]
+
+
+def _format_frame(frame) -> str:
+    code = frame.f_code
+    # semicolons and spaces separate frames and counts in folded stacks
+    file_name = os.path.basename(code.co_filename).replace(" ", "_")
+    return f"{code.co_name}({file_name}:{code.co_firstlineno})"
@@ -0,0 +1,188 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import math
+import threading
+import time
+from typing import Optional
+
+_SECONDS_PER_MINUTE = 60
+
+# rough number of characters per token, used to size requests before they are sent
+_CHARS_PER_TOKEN = 4
+
+_rate_limiters: dict[str, "RateLimiter"] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+class _TokenBucket:
+    """A token bucket which holds up to one minute of capacity and refills at a
+    constant rate. Access must be synchronized by the caller."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = per_minute
+        self._refill_rate = per_minute / _SECONDS_PER_MINUTE
+        self._tokens = float(per_minute)
+        self._updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated_at) * self._refill_rate
+        )
+        self._updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        self._refill()
+        return max(0.0, (amount - self._tokens) / self._refill_rate)
+
+    def take(self, amount: float):
+        self._tokens -= amount
+
+    def give(self, amount: float):
+        # the balance can go negative if more tokens were used than reserved
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens + amount)
+
+
+class RateLimiter:
+    """A thread-safe rate limiter for requests per minute and tokens per minute.
+
+    Capacity for a request is acquired before it is sent, based on an estimate of
+    its tokens. Once the actual number of tokens is known, the difference between
+    the tokens reserved by `acquire` and the tokens used is settled with `settle`.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+    ):
+        """Initialize the rate limiter.
+
+        Args:
+            requests_per_minute (Optional[int]): The maximum number of requests per minute.
+                If `None`, requests are not limited.
+            tokens_per_minute (Optional[int]): The maximum number of tokens per minute.
+                If `None`, tokens are not limited.
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._request_bucket = (
+            _TokenBucket(requests_per_minute) if requests_per_minute else None
+        )
+        self._token_bucket = (
+            _TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        )
+        self._lock = threading.Lock()
+
+    @property
+    def limits(self) -> tuple[Optional[int], Optional[int]]:
+        """The requests per minute and tokens per minute limits."""
+        return self.requests_per_minute, self.tokens_per_minute
+
+    def _try_acquire(self, tokens: int) -> tuple[float, int]:
+        with self._lock:
+            wait_time = 0.0
+
+            if self._request_bucket:
+                wait_time = self._request_bucket.wait_time(1)
+            if self._token_bucket:
+                # a request larger than the bucket would otherwise never be sent
+                tokens = min(tokens, self._token_bucket.capacity)
+                wait_time = max(wait_time, self._token_bucket.wait_time(tokens))
+
+            if wait_time == 0.0:
+                if self._request_bucket:
+                    self._request_bucket.take(1)
+                if self._token_bucket:
+                    self._token_bucket.take(tokens)
+
+            return wait_time, tokens
+
+    def acquire(self, tokens: int) -> int:
+        """Block until there is capacity for a request.
+
+        Args:
+            tokens (int): The estimated number of tokens for the request.
+
+        Returns:
+            int: The number of tokens reserved, which is at most the tokens per minute
+                limit, and should be passed to `settle`.
+        """
+        while True:
+            wait_time, reserved_tokens = self._try_acquire(tokens)
+            if not wait_time:
+                return reserved_tokens
+            time.sleep(wait_time)
+
+    async def aacquire(self, tokens: int) -> int:
+        """Wait until there is capacity for a request without blocking the event loop.
+
+        Args:
+            tokens (int): The estimated number of tokens for the request.
+
+        Returns:
+            int: The number of tokens reserved, which is at most the tokens per minute
+                limit, and should be passed to `settle`.
+        """
+        while True:
+            wait_time, reserved_tokens = self._try_acquire(tokens)
+            if not wait_time:
+                return reserved_tokens
+            await asyncio.sleep(wait_time)
+
+    def settle(self, reserved_tokens: int, used_tokens: int):
+        """Refund the difference between the tokens reserved for a request and the
+        tokens it used.
+
+        Args:
+            reserved_tokens (int): The number of tokens reserved for the request, as
+                returned by `acquire`.
+            used_tokens (int): The number of tokens the request used.
+        """
+        if self._token_bucket:
+            with self._lock:
+                self._token_bucket.give(reserved_tokens - used_tokens)
+
+
+def get_rate_limiter(
+    key: str,
+    requests_per_minute: Optional[int] = None,
+    tokens_per_minute: Optional[int] = None,
+) -> RateLimiter:
+    """Get the rate limiter shared by all callers using the same key, such as a model ID.
+
+    A new rate limiter is created if the limits for the key have changed.
+
+    Args:
+        key (str): The key of the rate limiter.
+        requests_per_minute (Optional[int]): The maximum number of requests per minute.
+        tokens_per_minute (Optional[int]): The maximum number of tokens per minute.
+
+    Returns:
+        RateLimiter
+    """
+    with _rate_limiters_lock:
+        rate_limiter = _rate_limiters.get(key)
+
+        limits = (requests_per_minute, tokens_per_minute)
+
+        if rate_limiter is None or rate_limiter.limits != limits:
+            rate_limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+            _rate_limiters[key] = rate_limiter
+
+        return rate_limiter
+
+
+def estimate_token_count(text: str) -> int:
+    """Estimate the number of tokens in a piece of text.
+
+    Args:
+        text (str): The text.
+
+    Returns:
+        int
+    """
+    return math.ceil(len(text) / _CHARS_PER_TOKEN)
@@ -0,0 +1,133 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import contextlib
+from typing import Optional
+
+from agenteval.utils.concurrency import is_throttling_error
+
+# spans and metrics are reported to the providers configured by the application, and
+# are no-ops until a provider is configured. If `opentelemetry-api` is not installed,
+# every function in this module returns immediately.
+try:
+    from opentelemetry import metrics as otel_metrics
+    from opentelemetry import trace as otel_trace
+except ImportError:
+    otel_metrics = otel_trace = None
+
+_INSTRUMENTATION_NAME = "agenteval"
+
+if otel_trace is not None:
+    # the API returns proxies, so providers can be configured after this module is imported
+    _tracer = otel_trace.get_tracer(_INSTRUMENTATION_NAME)
+    _meter = otel_metrics.get_meter(_INSTRUMENTATION_NAME)
+    _token_counter = _meter.create_counter(
+        "agenteval.evaluator.tokens",
+        unit="{token}",
+        description="Tokens processed and generated by the evaluator model.",
+    )
+    _throttle_counter = _meter.create_counter(
+        "agenteval.throttles",
+        unit="{call}",
+        description="Calls to the evaluator model or the target which were throttled.",
+    )
+    _retry_counter = _meter.create_counter(
+        "agenteval.retries",
+        unit="{attempt}",
+        description="Retry attempts made for calls to the evaluator model.",
+    )
+    _duration_histogram = _meter.create_histogram(
+        "agenteval.step.duration",
+        unit="s",
+        description="Duration of evaluator stages, target invocations and hooks.",
+    )
+
+
+def telemetry_available() -> bool:
+    """Check if `opentelemetry-api` is installed, which is required to report telemetry.
+
+    Returns:
+        bool
+    """
+    return otel_trace is not None
+
+
+def span(name: str, attributes: Optional[dict] = None):
+    """Start a span, which is the current span within the context.
+
+    Args:
+        name (str): The name of the span.
+        attributes (Optional[dict]): The attributes of the span.
+
+    Returns:
+        A context manager which yields the span, or `None` if OpenTelemetry
+            is not installed.
+    """
+    if otel_trace is None:
+        return contextlib.nullcontext()
+    return _tracer.start_as_current_span(name, attributes=attributes)
+
+
+def record_tokens(model_id: str, token_counts: dict[str, int]):
+    """Record the tokens used by a call to the evaluator model.
+
+    Args:
+        model_id (str): The ID of the model.
+        token_counts (dict[str, int]): A map of token types (e.g. `"input"`) to counts.
+    """
+    if otel_trace is None:
+        return
+    for token_type, count in token_counts.items():
+        if count:
+            _token_counter.add(
+                count,
+                {"agenteval.model_id": model_id, "agenteval.token_type": token_type},
+            )
+
+
+def record_retries(source: str, attempts: int):
+    """Record the retry attempts made for a call.
+
+    Args:
+        source (str): The source of the call (e.g. `"evaluator"`).
+        attempts (int): The number of retry attempts.
+    """
+    if otel_trace is None or not attempts:
+        return
+    _retry_counter.add(attempts, {"agenteval.source": source})
+
+
+def record_duration(name: str, duration: float):
+    """Record the duration of a step.
+
+    Args:
+        name (str): The name of the step.
+        duration (float): The duration of the step in seconds.
+    """
+    if otel_trace is None:
+        return
+    _duration_histogram.record(duration, {"agenteval.step": name})
+
+
+@contextlib.contextmanager
+def _count_throttles(source: str):
+    try:
+        yield
+    except Exception as e:
+        if is_throttling_error(e):
+            _throttle_counter.add(1, {"agenteval.source": source})
+        raise
+
+
+def count_throttles(source: str):
+    """Count the calls made within the context which are throttled.
+
+    Args:
+        source (str): The source of the calls (e.g. `"evaluator"`).
+
+    Returns:
+        A context manager.
+    """
+    if otel_trace is None:
+        return contextlib.nullcontext()
+    return _count_throttles(source)
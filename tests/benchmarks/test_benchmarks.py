@@ -0,0 +1,62 @@
+import json
+
+import pytest
+from botocore.exceptions import ClientError
+
+from agenteval.utils import aws
+from benchmarks import run, trace
+from benchmarks.fake_aws import FakeAWSConfig, fake_aws
+
+
+def test_fake_bedrock_runtime_client_stops_at_stop_sequence():
+    with fake_aws(FakeAWSConfig(latency=0, completion_bytes=8)):
+        client = aws.create_boto3_client("bedrock-runtime", None, None, None, 1)
+        response = client.invoke_model(
+            modelId="model",
+            body=json.dumps({"stop_sequences": ["</initial_prompt>"]}),
+        )
+
+    body = json.loads(response["body"].read())
+    assert body["content"][0]["text"] == (
+        "<thinking>xxxxxxxx</thinking>"
+        "<initial_prompt>What is the status of my claim?"
+    )
+    assert body["stop_reason"] == "stop_sequence"
+    assert response["ResponseMetadata"]["RetryAttempts"] == 0
+
+
+def test_fake_client_throttles():
+    with fake_aws(FakeAWSConfig(latency=0, throttle_rate=1, max_attempts=2)):
+        client = aws.create_boto3_client("bedrock-agent-runtime", None, None, None, 1)
+
+        with pytest.raises(ClientError) as e:
+            client.invoke_agent(inputText="prompt")
+
+    assert e.value.response["Error"]["Code"] == "ThrottlingException"
+
+
+@pytest.mark.parametrize("engine", ["threads", "asyncio"])
+def test_run_benchmarks(engine):
+    report = run.run_benchmarks(
+        [3], [2], [engine], FakeAWSConfig(latency=0), isolate=False
+    )
+
+    result = report["results"][0]
+    assert result["num_tests"] == 3
+    assert result["failed_tests"] == 0
+    assert result["test_latency"]["count"] == 3
+    assert "_invoke_target" in result["step_latencies"]
+    assert report["fake_aws"]["latency"] == 0
+
+
+def test_run_trace_benchmarks(tmp_path):
+    report = trace.run_benchmarks(10, str(tmp_path))
+
+    results = report["results"]
+    assert {(result["format"], result["explicit_name"]) for result in results} == {
+        ("json", True),
+        ("json", False),
+        ("jsonl", True),
+        ("jsonl", False),
+    }
+    assert all(result["microseconds_per_step"] > 0 for result in results)
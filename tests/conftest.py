@@ -0,0 +1,16 @@
+import pytest
+
+from agenteval.utils import aws
+from src.agenteval.utils import aws as src_aws
+
+
+@pytest.fixture(autouse=True)
+def clear_boto3_client_pool():
+    # clients are cached for the lifetime of the process, so make sure
+    # mocked clients do not leak between tests. Tests import the package both as
+    # `agenteval` and as `src.agenteval`, which have their own pools.
+    for module in (aws, src_aws):
+        module.clear_boto3_client_pool()
+    yield
+    for module in (aws, src_aws):
+        module.clear_boto3_client_pool()
@@ -1,5 +1,5 @@
 import json
-from agenteval.evaluators.bedrock_request.bedrock_request_handler import BedrockRequestHandler
+from agenteval.evaluators.bedrock_request.bedrock_request_handler import BedrockRequestHandler, PROMPT_CACHE_BREAKPOINT
 from agenteval.evaluators.model_config.bedrock_model_config import BedrockModelConfig, ModelProvider
 import pytest
 from unittest.mock import MagicMock
@@ -51,7 +51,110 @@ def test_parse_completion_from_response_anthropic(model_config_anthropic):
     
     assert result == "test completion"
 
+def test_get_max_tokens_meta(model_config_meta):
+    assert BedrockRequestHandler.get_max_tokens({"max_gen_len": 300}, model_config_meta) == 300
+
+
+def test_get_max_tokens_anthropic(model_config_anthropic):
+    assert BedrockRequestHandler.get_max_tokens({"max_tokens": 300}, model_config_anthropic) == 300
+    assert BedrockRequestHandler.get_max_tokens({}, model_config_anthropic) == 0
+
+
 def test_unsupported_model_throws():
     with pytest.raises(ValueError, match="Unsupported model ID: stability.ai-v0"):
         BedrockRequestHandler.build_request_body({}, BedrockModelConfig(model_id="stability.ai-v0", request_body={}), "", "")
 
+
+def test_parse_completion_from_chunk_meta(model_config_meta):
+    chunk = {"generation": "test", "prompt_token_count": 10}
+
+    assert BedrockRequestHandler.parse_completion_from_chunk(chunk, model_config_meta) == "test"
+    assert BedrockRequestHandler.parse_input_token_counts_from_chunk(chunk, model_config_meta) == (10, 0, 0)
+
+
+def test_parse_completion_from_chunk_anthropic(model_config_anthropic):
+    message_start = {"type": "message_start", "message": {"usage": {"input_tokens": 10, "cache_read_input_tokens": 1000, "cache_creation_input_tokens": 50}}}
+    content_block_delta = {"type": "content_block_delta", "delta": {"type": "text_delta", "text": "test"}}
+
+    assert BedrockRequestHandler.parse_completion_from_chunk(message_start, model_config_anthropic) == ""
+    assert BedrockRequestHandler.parse_completion_from_chunk(content_block_delta, model_config_anthropic) == "test"
+    assert BedrockRequestHandler.parse_input_token_counts_from_chunk(message_start, model_config_anthropic) == (10, 1000, 50)
+    assert BedrockRequestHandler.parse_input_token_counts_from_chunk(content_block_delta, model_config_anthropic) is None
+
+
+def test_build_request_body_generation_settings_meta(model_config_meta):
+    result = BedrockRequestHandler.build_request_body({"max_gen_len": 300}, model_config_meta, TEST_SYSTEM_PROMPT, TEST_PROMPT, max_tokens=100, stop_sequences=["</category>"])
+
+    assert result["max_gen_len"] == 100
+    assert "stop_sequences" not in result
+
+
+def test_build_request_body_generation_settings_anthropic(model_config_anthropic):
+    request_body = {"max_tokens": 300, "messages": [{"content": [{"text": ""}]}]}
+
+    result = BedrockRequestHandler.build_request_body(request_body, model_config_anthropic, TEST_SYSTEM_PROMPT, TEST_PROMPT, max_tokens=100, stop_sequences=["</category>"])
+
+    assert result["max_tokens"] == 100
+    assert result["stop_sequences"] == ["</category>"]
+    assert request_body["max_tokens"] == 300
+
+
+def test_parse_completion_with_stop_sequence_anthropic(model_config_anthropic):
+    response_mock = MagicMock()
+    response_mock.get.return_value.read.return_value = json.dumps({"content": [{"text": "<category>A"}], "stop_reason": "stop_sequence", "stop_sequence": "</category>"}).encode()
+    message_delta = {"type": "message_delta", "delta": {"stop_reason": "stop_sequence", "stop_sequence": "</category>"}}
+
+    assert BedrockRequestHandler.parse_completion_from_response(response_mock, model_config_anthropic) == "<category>A</category>"
+    assert BedrockRequestHandler.parse_completion_from_chunk(message_delta, model_config_anthropic) == "</category>"
+
+
+def test_parse_output_token_count_from_chunk(model_config_meta, model_config_anthropic):
+    message_delta = {"type": "message_delta", "delta": {"stop_reason": "end_turn"}, "usage": {"output_tokens": 9}}
+    content_block_delta = {"type": "content_block_delta", "delta": {"text": "text"}}
+
+    assert BedrockRequestHandler.parse_output_token_count_from_chunk(message_delta, model_config_anthropic) == 9
+    assert BedrockRequestHandler.parse_output_token_count_from_chunk(content_block_delta, model_config_anthropic) is None
+    assert BedrockRequestHandler.parse_output_token_count_from_chunk({"generation": "text", "generation_token_count": 1}, model_config_meta) is None
+
+
+def test_build_request_body_prompt_caching_anthropic(model_config_anthropic):
+    request_body = {"messages": [{"content": [{"type": "text", "text": ""}]}]}
+    prompt = f"turn 1{PROMPT_CACHE_BREAKPOINT}turn 2{PROMPT_CACHE_BREAKPOINT}turn 3{PROMPT_CACHE_BREAKPOINT}end"
+
+    result = BedrockRequestHandler.build_request_body(request_body, model_config_anthropic, TEST_SYSTEM_PROMPT, prompt, prompt_caching=True)
+
+    assert result["system"] == [{"type": "text", "text": TEST_SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}]
+    # only the latest turns are cached
+    assert result["messages"][0]["content"] == [
+        {"type": "text", "text": "turn 1"},
+        {"type": "text", "text": "turn 2", "cache_control": {"type": "ephemeral"}},
+        {"type": "text", "text": "turn 3", "cache_control": {"type": "ephemeral"}},
+        {"type": "text", "text": "end"},
+    ]
+
+
+def test_build_request_body_prompt_caching_empty_latest_turn(model_config_anthropic):
+    request_body = {"messages": [{"content": [{"type": "text", "text": ""}]}]}
+    prompt = f"turn 1{PROMPT_CACHE_BREAKPOINT}turn 2{PROMPT_CACHE_BREAKPOINT}{PROMPT_CACHE_BREAKPOINT}end"
+
+    result = BedrockRequestHandler.build_request_body(request_body, model_config_anthropic, TEST_SYSTEM_PROMPT, prompt, prompt_caching=True)
+
+    # the empty turn cannot be marked, so both breakpoints are kept on the turns before it
+    assert result["messages"][0]["content"] == [
+        {"type": "text", "text": "turn 1", "cache_control": {"type": "ephemeral"}},
+        {"type": "text", "text": "turn 2", "cache_control": {"type": "ephemeral"}},
+        {"type": "text", "text": "end"},
+    ]
+
+
+def test_build_request_body_without_prompt_caching(model_config_meta, model_config_anthropic):
+    prompt = f"turn 1{PROMPT_CACHE_BREAKPOINT}end"
+
+    result = BedrockRequestHandler.build_request_body({"messages": [{"content": [{"text": ""}]}]}, model_config_anthropic, TEST_SYSTEM_PROMPT, prompt)
+
+    assert result["system"] == TEST_SYSTEM_PROMPT
+    assert result["messages"][0]["content"][0]["text"] == "turn 1end"
+
+    result = BedrockRequestHandler.build_request_body({}, model_config_meta, TEST_SYSTEM_PROMPT, prompt, prompt_caching=True)
+
+    assert "turn 1end" in result["prompt"]
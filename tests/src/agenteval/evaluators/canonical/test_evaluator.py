@@ -1,10 +1,19 @@
+import asyncio
+import copy
 import io
+import json
+import threading
 
 import pytest
 
+from agenteval.evaluators.model_config.bedrock_model_config import BedrockModelConfig
 from agenteval.evaluators.model_config.preconfigured_model_configs import DEFAULT_CLAUDE_3_MODEL_CONFIG
+from agenteval.evaluators import base_evaluator as evaluator_base
 from src.agenteval.evaluators.canonical import evaluator
+from src.agenteval.targets import base_target, cassette
 from src.agenteval.utils import aws
+from agenteval.utils.cache import CompletionCache
+from agenteval import trace
 from src.agenteval.test import Test
 
 
@@ -80,12 +89,13 @@ class TestCanonical:
         )
         mock_extract_content_from_xml.return_value = "test output", "test reasoning"
 
-        request_body = evaluator_fixture.model_config.request_body
+        request_body = copy.deepcopy(evaluator_fixture.model_config.request_body)
         request_body["system"] = "test system prompt"
         request_body["messages"][0]["content"][0]["text"] = "test prompt"
+        request_body["stop_sequences"] = ["</test_element_name>"]
 
         result = evaluator_fixture._generate(
-            "test system prompt", "test prompt", "test_element_name"
+            "test system prompt", "test prompt", ["test_element_name"]
         )
 
         assert result == ("test output", "test reasoning")
@@ -198,3 +208,870 @@ class TestCanonical:
 
         assert result.passed is False
         assert mock_generate_user_response.call_count == 1
+
+    def test_arun_single_turn_pass(self, mocker, evaluator_fixture):
+        mock_ainvoke_target = mocker.patch.object(
+            evaluator_fixture, "_ainvoke_target", return_value="test agent response"
+        )
+
+        mocker.patch.object(
+            evaluator_fixture,
+            "_agenerate_test_status",
+            return_value=evaluator.TestStatusCategories.ALL_STEPS_ATTEMPTED.value,
+        )
+        mocker.patch.object(
+            evaluator_fixture,
+            "_agenerate_evaluation",
+            return_value=(
+                evaluator.EvaluationCategories.ALL_EXPECTED_RESULTS_OBSERVED.value,
+                "",
+            ),
+        )
+
+        result = asyncio.run(evaluator_fixture.aevaluate())
+
+        assert result.passed is True
+        mock_ainvoke_target.assert_awaited_once_with("test prompt")
+
+    @pytest.mark.parametrize("use_asyncio", [False, True])
+    def test_run_post_evaluate_reads_jsonl_trace(
+        self, mocker, tmp_path, evaluator_fixture, use_asyncio
+    ):
+        evaluator_fixture.trace = trace.Trace(
+            "my_test", str(tmp_path), format="jsonl", flush_interval=60
+        )
+        steps = []
+
+        class ReadTraceHook:
+            @staticmethod
+            def pre_evaluate(test, trace):
+                pass
+
+            @staticmethod
+            def post_evaluate(test, test_result, hook_trace):
+                steps.extend(trace.read_trace(hook_trace.path)["steps"])
+
+        mocker.patch.object(
+            evaluator_fixture, "_get_hook_cls", return_value=ReadTraceHook
+        )
+
+        def evaluate():
+            evaluator_fixture.trace.add_step(step_name="test step")
+            return mocker.MagicMock()
+
+        async def aevaluate():
+            return evaluate()
+
+        mocker.patch.object(evaluator_fixture, "evaluate", side_effect=evaluate)
+        mocker.patch.object(evaluator_fixture, "aevaluate", side_effect=aevaluate)
+
+        if use_asyncio:
+            asyncio.run(evaluator_fixture.arun())
+        else:
+            evaluator_fixture.run()
+
+        # the buffered steps are written before the hook runs
+        assert [step["step_name"] for step in steps] == ["test step"]
+
+    def test_arun_multi_turn_fail(self, mocker, evaluator_fixture):
+        mocker.patch.object(evaluator_fixture, "_ainvoke_target")
+
+        mock_agenerate_user_response = mocker.patch.object(
+            evaluator_fixture,
+            "_agenerate_user_response",
+            return_value="test user response",
+        )
+        mocker.patch.object(
+            evaluator_fixture,
+            "_agenerate_test_status",
+            side_effect=[
+                evaluator.TestStatusCategories.NOT_ALL_STEPS_ATTEMPTED.value,
+                evaluator.TestStatusCategories.ALL_STEPS_ATTEMPTED.value,
+            ],
+        )
+        mocker.patch.object(
+            evaluator_fixture,
+            "_agenerate_evaluation",
+            return_value=(
+                evaluator.EvaluationCategories.NOT_ALL_EXPECTED_RESULTS_OBSERVED.value,
+                "test reasoning",
+            ),
+        )
+
+        result = asyncio.run(evaluator_fixture.aevaluate())
+
+        assert result.passed is False
+        assert result.reasoning == "test reasoning"
+        assert mock_agenerate_user_response.await_count == 1
+
+    def test_agenerate_stage(self, mocker, evaluator_fixture):
+        mock_ainvoke_model = mocker.patch.object(evaluator_fixture, "ainvoke_model")
+        mock_ainvoke_model.return_value = {
+            "body": io.BytesIO(
+                b'{"content": [{"text": "<thinking>test reasoning</thinking><category>A</category>"}]}'
+            )
+        }
+
+        test_status = asyncio.run(evaluator_fixture._agenerate_test_status())
+
+        assert test_status == "A"
+        step = evaluator_fixture.trace.steps[0]
+        assert step["step_name"] == "_generate_test_status"
+        assert step["test_status"] == "A"
+        assert step["reasoning"] == "test reasoning"
+
+    def test_ainvoke_model_without_async_client(self, mocker, evaluator_fixture):
+        mocker.patch.object(
+            evaluator_base,
+            "async_boto3_client_available",
+            return_value=False,
+        )
+        mock_invoke_model = mocker.patch.object(evaluator_fixture, "invoke_model")
+
+        response = asyncio.run(evaluator_fixture.ainvoke_model({"test": "body"}))
+
+        mock_invoke_model.assert_called_once_with({"test": "body"})
+        assert response == mock_invoke_model.return_value
+
+    def test_ainvoke_model_with_async_client(self, mocker, evaluator_fixture):
+        mocker.patch.object(
+            evaluator_base, "async_boto3_client_available", return_value=True
+        )
+
+        mock_stream = mocker.AsyncMock()
+        mock_stream.__aenter__.return_value = mock_stream
+        mock_stream.read.return_value = b"test body"
+
+        mock_client = mocker.AsyncMock()
+        mock_client.invoke_model.return_value = {
+            "body": mock_stream,
+            "ResponseMetadata": {
+                "HTTPHeaders": {
+                    "x-amzn-bedrock-input-token-count": "10",
+                    "x-amzn-bedrock-output-token-count": "5",
+                }
+            },
+        }
+        mocker.patch.object(
+            evaluator_base, "create_async_boto3_client", return_value=mock_client
+        )
+
+        response = asyncio.run(evaluator_fixture.ainvoke_model({"test": "body"}))
+
+        assert response["body"].read() == b"test body"
+        assert evaluator_fixture.input_token_count == 10
+        assert evaluator_fixture.output_token_count == 5
+
+    def test_invoke_model_rate_limited(self, mocker, test_fixture, target_fixture):
+        mocker.patch.object(aws.boto3, "Session")
+        model_id = DEFAULT_CLAUDE_3_MODEL_CONFIG.model_id
+
+        fixture = evaluator.CanonicalEvaluator(
+            model_config=DEFAULT_CLAUDE_3_MODEL_CONFIG,
+            test=test_fixture,
+            target=target_fixture,
+            work_dir="test_dir",
+            rate_limits={
+                model_id: {"requests_per_minute": 10, "tokens_per_minute": 10000}
+            },
+        )
+        mock_acquire = mocker.patch.object(fixture._rate_limiter, "acquire")
+        mock_settle = mocker.patch.object(fixture._rate_limiter, "settle")
+
+        mock_invoke_model = mocker.patch.object(
+            fixture.bedrock_runtime_client, "invoke_model"
+        )
+        mock_invoke_model.return_value = {
+            "ResponseMetadata": {
+                "HTTPHeaders": {
+                    "x-amzn-bedrock-input-token-count": "10",
+                    "x-amzn-bedrock-output-token-count": "5",
+                }
+            }
+        }
+
+        fixture.invoke_model({"max_tokens": 300, "system": "test"})
+
+        assert mock_acquire.call_args.args[0] > 300
+        mock_settle.assert_called_once_with(mock_acquire.return_value, 15)
+
+    def test_invoke_model_rate_limited_error(
+        self, mocker, test_fixture, target_fixture
+    ):
+        mocker.patch.object(aws.boto3, "Session")
+        model_id = DEFAULT_CLAUDE_3_MODEL_CONFIG.model_id
+
+        fixture = evaluator.CanonicalEvaluator(
+            model_config=DEFAULT_CLAUDE_3_MODEL_CONFIG,
+            test=test_fixture,
+            target=target_fixture,
+            work_dir="test_dir",
+            rate_limits={model_id: {"tokens_per_minute": 10000}},
+        )
+        mocker.patch.object(fixture._rate_limiter, "acquire")
+        mock_settle = mocker.patch.object(fixture._rate_limiter, "settle")
+        mocker.patch.object(
+            fixture.bedrock_runtime_client, "invoke_model", side_effect=RuntimeError
+        )
+
+        with pytest.raises(RuntimeError):
+            fixture.invoke_model({"max_tokens": 300})
+
+        assert mock_settle.call_args.args[1] == 0
+
+    def test_no_rate_limiter_for_other_models(self, mocker, test_fixture, target_fixture):
+        mocker.patch.object(aws.boto3, "Session")
+
+        fixture = evaluator.CanonicalEvaluator(
+            model_config=DEFAULT_CLAUDE_3_MODEL_CONFIG,
+            test=test_fixture,
+            target=target_fixture,
+            work_dir="test_dir",
+            rate_limits={"other-model": {"requests_per_minute": 10}},
+        )
+
+        assert fixture._rate_limiter is None
+
+    def test_invoke_target_concurrency_limited(
+        self, mocker, test_fixture, target_fixture
+    ):
+        mocker.patch.object(aws.boto3, "Session")
+        target_concurrency_limiter = mocker.MagicMock()
+        concurrency_limiter = mocker.MagicMock()
+
+        fixture = evaluator.CanonicalEvaluator(
+            model_config=DEFAULT_CLAUDE_3_MODEL_CONFIG,
+            test=test_fixture,
+            target=target_fixture,
+            work_dir="test_dir",
+            concurrency_limiter=concurrency_limiter,
+            target_concurrency_limiter=target_concurrency_limiter,
+        )
+        target_fixture.invoke.return_value.response = "test response"
+
+        assert fixture._invoke_target("test prompt") == "test response"
+        target_concurrency_limiter.__enter__.assert_called_once()
+        target_concurrency_limiter.__exit__.assert_called_once()
+        concurrency_limiter.__enter__.assert_not_called()
+
+    def test_invoke_target_span(self, mocker, tmp_path, evaluator_fixture):
+        class MyTarget(base_target.BaseTarget):
+            def invoke(self, prompt):
+                return base_target.TargetResponse(response="test response")
+
+        mock_span = mocker.patch.object(evaluator.telemetry, "span")
+        # recorded targets are named after the target they wrap
+        evaluator_fixture.target = cassette.RecordingTarget(
+            MyTarget(), cassette.Cassette(str(tmp_path / "cassette.jsonl")), "my_test"
+        )
+
+        evaluator_fixture._invoke_target("test prompt")
+
+        mock_span.assert_called_once_with(
+            evaluator._TARGET_SPAN_NAME, {"agenteval.target": "MyTarget"}
+        )
+        mock_span.return_value.__enter__.assert_called_once()
+
+    def test_invoke_model_observed(self, mocker, test_fixture, target_fixture):
+        mocker.patch.object(aws.boto3, "Session")
+        adaptive_concurrency_limiter = mocker.MagicMock()
+
+        fixture = evaluator.CanonicalEvaluator(
+            model_config=DEFAULT_CLAUDE_3_MODEL_CONFIG,
+            test=test_fixture,
+            target=target_fixture,
+            work_dir="test_dir",
+            adaptive_concurrency_limiter=adaptive_concurrency_limiter,
+        )
+        mock_invoke_model = mocker.patch.object(
+            fixture.bedrock_runtime_client, "invoke_model"
+        )
+        mock_invoke_model.return_value = {
+            "ResponseMetadata": {"HTTPHeaders": {}, "RetryAttempts": 2}
+        }
+        target_fixture.invoke.return_value.response = "test response"
+
+        fixture.invoke_model({"test": "body"})
+        with fixture.track_stage("generate_test_status"):
+            fixture.invoke_model({"test": "body"})
+        fixture._invoke_target("test prompt")
+
+        # latencies of the model are compared within each stage
+        assert [
+            call.args for call in adaptive_concurrency_limiter.observe.call_args_list
+        ] == [("evaluator",), ("evaluator.generate_test_status",), ("target",)]
+        # retried calls are treated as throttled
+        assert adaptive_concurrency_limiter.record_congestion.call_count == 2
+
+    @staticmethod
+    def _stream_events(*chunks):
+        return [{"chunk": {"bytes": json.dumps(chunk).encode()}} for chunk in chunks]
+
+    def test_invoke_model_with_response_stream(self, mocker, evaluator_fixture):
+        mock_stream = mocker.MagicMock()
+        mock_stream.__iter__.return_value = iter(
+            self._stream_events(
+                {"type": "message_start", "message": {"usage": {"input_tokens": 10}}},
+                {"type": "content_block_delta", "delta": {"text": "<category>A"}},
+                {"type": "content_block_delta", "delta": {"text": "</category>"}},
+                {"type": "content_block_delta", "delta": {"text": " trailing text"}},
+            )
+        )
+        mock_invoke_model_with_response_stream = mocker.patch.object(
+            evaluator_fixture.bedrock_runtime_client,
+            "invoke_model_with_response_stream",
+        )
+        mock_invoke_model_with_response_stream.return_value = {
+            "body": mock_stream,
+            "ResponseMetadata": {},
+        }
+
+        completion = evaluator_fixture.invoke_model_with_response_stream(
+            {"test": "body"}, stop="</category>"
+        )
+
+        # the stream is closed once the stop text is generated
+        assert completion == "<category>A</category>"
+        mock_stream.close.assert_called_once()
+        assert evaluator_fixture.input_token_count == 10
+        assert evaluator_fixture.output_token_count == 6
+
+    def test_invoke_model_with_response_stream_stop_sequence(
+        self, mocker, evaluator_fixture
+    ):
+        mock_stream = mocker.MagicMock()
+        mock_stream.__iter__.return_value = iter(
+            self._stream_events(
+                {
+                    "type": "message_start",
+                    "message": {"usage": {"input_tokens": 10, "output_tokens": 1}},
+                },
+                {
+                    "type": "content_block_start",
+                    "index": 0,
+                    "content_block": {"type": "text", "text": ""},
+                },
+                {
+                    "type": "content_block_delta",
+                    "index": 0,
+                    "delta": {"type": "text_delta", "text": "<thinking>test reasoning"},
+                },
+                {
+                    "type": "content_block_delta",
+                    "index": 0,
+                    "delta": {"type": "text_delta", "text": "</thinking><category>A"},
+                },
+                {"type": "content_block_stop", "index": 0},
+                {
+                    "type": "message_delta",
+                    "delta": {
+                        "stop_reason": "stop_sequence",
+                        "stop_sequence": "</category>",
+                    },
+                    "usage": {"output_tokens": 9},
+                },
+                {
+                    "type": "message_stop",
+                    "amazon-bedrock-invocationMetrics": {
+                        "inputTokenCount": 10,
+                        "outputTokenCount": 9,
+                    },
+                },
+            )
+        )
+        mocker.patch.object(
+            evaluator_fixture.bedrock_runtime_client,
+            "invoke_model_with_response_stream",
+            return_value={"body": mock_stream, "ResponseMetadata": {}},
+        )
+        mock_rate_limiter = mocker.MagicMock()
+        mock_rate_limiter.acquire.return_value = 100
+        evaluator_fixture._rate_limiter = mock_rate_limiter
+
+        completion = evaluator_fixture.invoke_model_with_response_stream(
+            {"test": "body"}, stop="</category>"
+        )
+
+        # the stream is closed at the stop sequence, before the invocation metrics,
+        # and the output token count is read from the stop reason
+        assert completion == "<thinking>test reasoning</thinking><category>A</category>"
+        assert evaluator_fixture.input_token_count == 10
+        assert evaluator_fixture.output_token_count == 9
+        mock_rate_limiter.settle.assert_called_once_with(100, 19)
+
+    def test_invoke_model_with_response_stream_to_end(self, mocker, evaluator_fixture):
+        mock_stream = mocker.MagicMock()
+        mock_stream.__iter__.return_value = iter(
+            self._stream_events(
+                {"generation": "<category>", "prompt_token_count": 10},
+                {
+                    "generation": "A",
+                    "amazon-bedrock-invocationMetrics": {
+                        "inputTokenCount": 10,
+                        "outputTokenCount": 3,
+                    },
+                },
+            )
+        )
+        mocker.patch.object(
+            evaluator_fixture.bedrock_runtime_client,
+            "invoke_model_with_response_stream",
+            return_value={"body": mock_stream, "ResponseMetadata": {}},
+        )
+        evaluator_fixture.model_config = BedrockModelConfig(
+            model_id="meta.llama-v0", request_body={}
+        )
+
+        completion = evaluator_fixture.invoke_model_with_response_stream(
+            {"test": "body"}, stop="</category>"
+        )
+
+        assert completion == "<category>A"
+        assert evaluator_fixture.input_token_count == 10
+        assert evaluator_fixture.output_token_count == 3
+
+    def test_ainvoke_model_with_response_stream(self, mocker, evaluator_fixture):
+        mocker.patch.object(
+            evaluator_base, "async_boto3_client_available", return_value=True
+        )
+
+        events = self._stream_events(
+            {"type": "content_block_delta", "delta": {"text": "<category>A</category>"}},
+            {"type": "content_block_delta", "delta": {"text": " trailing text"}},
+        )
+
+        mock_stream = mocker.MagicMock()
+        mock_stream.__aiter__.return_value = events
+
+        mock_client = mocker.AsyncMock()
+        mock_client.invoke_model_with_response_stream.return_value = {
+            "body": mock_stream,
+            "ResponseMetadata": {},
+        }
+        mocker.patch.object(
+            evaluator_base, "create_async_boto3_client", return_value=mock_client
+        )
+
+        completion = asyncio.run(
+            evaluator_fixture.ainvoke_model_with_response_stream(
+                {"test": "body"}, stop="</category>"
+            )
+        )
+
+        assert completion == "<category>A</category>"
+        mock_stream.close.assert_called_once()
+
+    def test_generate_streaming(self, mocker, evaluator_fixture):
+        evaluator_fixture.streaming = True
+        mock_invoke_model_with_response_stream = mocker.patch.object(
+            evaluator_fixture, "invoke_model_with_response_stream"
+        )
+        mock_invoke_model_with_response_stream.return_value = (
+            "<thinking>test reasoning</thinking><category>A</category>"
+        )
+        mock_invoke_model = mocker.patch.object(evaluator_fixture, "invoke_model")
+
+        result = evaluator_fixture._generate(
+            "test system prompt", "test prompt", ["category"]
+        )
+
+        assert result == ("A", "test reasoning")
+        assert (
+            mock_invoke_model_with_response_stream.call_args.kwargs["stop"]
+            == "</category>"
+        )
+        mock_invoke_model.assert_not_called()
+
+    def test_stage_max_tokens(self, mocker, test_fixture, target_fixture):
+        mocker.patch.object(aws.boto3, "Session")
+
+        fixture = evaluator.CanonicalEvaluator(
+            model_config=DEFAULT_CLAUDE_3_MODEL_CONFIG,
+            test=test_fixture,
+            target=target_fixture,
+            work_dir="test_dir",
+            stage_max_tokens={"generate_test_status": 100},
+        )
+        mock_invoke_model = mocker.patch.object(fixture, "invoke_model")
+        mock_invoke_model.return_value = {
+            "body": io.BytesIO(
+                b'{"content": [{"text": "<category>A"}], "stop_reason": "stop_sequence", "stop_sequence": "</category>"}'
+            )
+        }
+
+        assert fixture._generate_test_status() == "A"
+
+        request_body = mock_invoke_model.call_args.kwargs["request_body"]
+        assert request_body["max_tokens"] == 100
+        assert request_body["stop_sequences"] == ["</category>"]
+        assert DEFAULT_CLAUDE_3_MODEL_CONFIG.request_body["max_tokens"] == 300
+
+    def test_stage_max_tokens_unknown_stage(self, mocker, test_fixture, target_fixture):
+        mocker.patch.object(aws.boto3, "Session")
+
+        with pytest.raises(ValueError):
+            evaluator.CanonicalEvaluator(
+                model_config=DEFAULT_CLAUDE_3_MODEL_CONFIG,
+                test=test_fixture,
+                target=target_fixture,
+                work_dir="test_dir",
+                stage_max_tokens={"generate_summary": 100},
+            )
+
+    def test_generate_stage_prompt_caching(self, mocker, evaluator_fixture):
+        evaluator_fixture.prompt_caching = True
+        evaluator_fixture.conversation.add_turn("test message", "test response")
+        evaluator_fixture.conversation.add_turn("test message", "test response")
+        mock_invoke_model = mocker.patch.object(evaluator_fixture, "invoke_model")
+        mock_invoke_model.return_value = {
+            "body": io.BytesIO(b'{"content": [{"text": "<category>A</category>"}]}')
+        }
+
+        evaluator_fixture._generate_test_status()
+
+        request_body = mock_invoke_model.call_args.kwargs["request_body"]
+        content = request_body["messages"][0]["content"]
+        assert len(content) == 3
+        assert [block.get("cache_control") for block in content] == [
+            {"type": "ephemeral"},
+            {"type": "ephemeral"},
+            None,
+        ]
+        # the trace records the prompt without breakpoints
+        assert evaluator_fixture.trace.steps[0]["prompt"] == "".join(
+            block["text"] for block in content
+        )
+
+    def test_invoke_model_cache_token_counts(self, mocker, evaluator_fixture):
+        mocker.patch.object(
+            evaluator_fixture.bedrock_runtime_client,
+            "invoke_model",
+            return_value={
+                "ResponseMetadata": {
+                    "HTTPHeaders": {
+                        "x-amzn-bedrock-input-token-count": "10",
+                        "x-amzn-bedrock-output-token-count": "5",
+                        "x-amzn-bedrock-cache-read-input-token-count": "1000",
+                        "x-amzn-bedrock-cache-write-input-token-count": "50",
+                    }
+                }
+            },
+        )
+
+        evaluator_fixture.invoke_model({"test": "body"})
+
+        assert evaluator_fixture.input_token_count == 10
+        assert evaluator_fixture.cache_read_input_token_count == 1000
+        assert evaluator_fixture.cache_write_input_token_count == 50
+
+    def test_run_fused_stages(self, mocker, evaluator_fixture):
+        evaluator_fixture.fuse_stages = True
+        mock_invoke_target = mocker.patch.object(evaluator_fixture, "_invoke_target")
+        mock_generate_test_status_and_user_response = mocker.patch.object(
+            evaluator_fixture, "_generate_test_status_and_user_response"
+        )
+        mock_generate_test_status_and_user_response.return_value = (
+            evaluator.TestStatusCategories.NOT_ALL_STEPS_ATTEMPTED.value,
+            "test user response",
+        )
+        mock_generate_user_response = mocker.patch.object(
+            evaluator_fixture, "_generate_user_response"
+        )
+        mock_generate_test_status = mocker.patch.object(
+            evaluator_fixture, "_generate_test_status"
+        )
+        mock_generate_test_status.return_value = (
+            evaluator.TestStatusCategories.ALL_STEPS_ATTEMPTED.value
+        )
+        mocker.patch.object(
+            evaluator_fixture,
+            "_generate_evaluation",
+            return_value=(
+                evaluator.EvaluationCategories.ALL_EXPECTED_RESULTS_OBSERVED.value,
+                "",
+            ),
+        )
+
+        result = evaluator_fixture.evaluate()
+
+        assert result.passed is True
+        assert mock_invoke_target.call_args_list[1].args == ("test user response",)
+        mock_generate_test_status_and_user_response.assert_called_once()
+        mock_generate_user_response.assert_not_called()
+        # no user response is needed after the last turn
+        mock_generate_test_status.assert_called_once()
+
+    def test_run_fused_stages_missing_user_response(self, mocker, evaluator_fixture):
+        evaluator_fixture.fuse_stages = True
+        mocker.patch.object(evaluator_fixture, "_invoke_target")
+        mocker.patch.object(
+            evaluator_fixture,
+            "_generate_test_status_and_user_response",
+            return_value=(
+                evaluator.TestStatusCategories.NOT_ALL_STEPS_ATTEMPTED.value,
+                None,
+            ),
+        )
+        mock_generate_user_response = mocker.patch.object(
+            evaluator_fixture, "_generate_user_response"
+        )
+        mocker.patch.object(
+            evaluator_fixture,
+            "_generate_test_status",
+            return_value=evaluator.TestStatusCategories.NOT_ALL_STEPS_ATTEMPTED.value,
+        )
+
+        result = evaluator_fixture.evaluate()
+
+        assert result.result == evaluator.Results.MAX_TURNS_REACHED.value
+        mock_generate_user_response.assert_called_once()
+
+    def test_generate_test_status_and_user_response(self, mocker, evaluator_fixture):
+        mock_invoke_model = mocker.patch.object(evaluator_fixture, "invoke_model")
+        mock_invoke_model.return_value = {
+            "body": io.BytesIO(
+                b'{"content": [{"text": "<thinking>test reasoning</thinking><category>B</category><user_response>test user response</user_response>"}]}'
+            )
+        }
+
+        result = evaluator_fixture._generate_test_status_and_user_response()
+
+        assert result == ("B", "test user response")
+        request_body = mock_invoke_model.call_args.kwargs["request_body"]
+        assert request_body["stop_sequences"] == ["</user_response>"]
+        step = evaluator_fixture.trace.steps[0]
+        assert step["step_name"] == "_generate_test_status_and_user_response"
+        assert step["test_status"] == "B"
+        assert step["user_response"] == "test user response"
+        assert step["reasoning"] == "test reasoning"
+
+    def test_generate_stage_timings(self, mocker, evaluator_fixture):
+        def invoke_model(request_body):
+            evaluator_fixture._record_token_counts(0, 10, 5)
+            return {
+                "body": io.BytesIO(
+                    b'{"content": [{"text": "<thinking>test reasoning</thinking><category>A</category>"}]}'
+                )
+            }
+
+        mocker.patch.object(evaluator_fixture, "invoke_model", side_effect=invoke_model)
+
+        with evaluator_fixture.track_token_usage() as usage:
+            evaluator_fixture._generate_test_status()
+
+        step = evaluator_fixture.trace.steps[0]
+        assert step["input_token_count"] == 10
+        assert step["output_token_count"] == 5
+        assert evaluator_fixture.trace.durations == {
+            "_generate_test_status": [step["duration"]]
+        }
+        # nested usage is also counted by the outer context
+        assert usage.input_token_count == 10
+
+    def _mock_stages(self, mocker, fixture, stages):
+        # the stages are generated by the real `_generate_stage`, so their steps and
+        # durations are recorded as they would be with a model
+        def generate(**kwargs):
+            outputs, input_token_count = stages[evaluator_base._stage.get()]
+            if isinstance(outputs, Exception):
+                raise outputs
+            fixture._record_token_counts(0, input_token_count, 1)
+            return (*outputs, "test reasoning")
+
+        async def agenerate(**kwargs):
+            return generate(**kwargs)
+
+        mocker.patch.object(fixture, "_generate", side_effect=generate)
+        mocker.patch.object(fixture, "_agenerate", side_effect=agenerate)
+
+    @pytest.mark.parametrize("use_asyncio", [False, True])
+    def test_run_speculative_pass(self, mocker, evaluator_fixture, use_asyncio):
+        evaluator_fixture.speculative = True
+        evaluator_fixture.test.max_turns = 3
+        mocker.patch.object(evaluator_fixture, "_invoke_target")
+        mocker.patch.object(evaluator_fixture, "_ainvoke_target")
+        self._mock_stages(
+            mocker,
+            evaluator_fixture,
+            {
+                "generate_test_status": (
+                    (evaluator.TestStatusCategories.ALL_STEPS_ATTEMPTED.value,),
+                    10,
+                ),
+                "generate_evaluation": (
+                    (evaluator.EvaluationCategories.ALL_EXPECTED_RESULTS_OBSERVED.value,),
+                    20,
+                ),
+                "generate_user_response": (("test user response",), 30),
+            },
+        )
+
+        if use_asyncio:
+            result = asyncio.run(evaluator_fixture.aevaluate())
+        else:
+            result = evaluator_fixture.evaluate()
+
+        assert result.passed is True
+        assert evaluator_fixture.input_token_count == 60
+        steps = evaluator_fixture.trace.steps
+        assert [step["step_name"] for step in steps] == [
+            "_generate_test_status",
+            "_generate_evaluation",
+            "_discard_speculation",
+        ]
+        assert steps[1]["evaluation"] == "A"
+        assert steps[1]["input_token_count"] == 20
+        # the speculative user response was not needed, so only its tokens are recorded
+        assert steps[2] == {
+            "timestamp": mocker.ANY,
+            "step_name": "_discard_speculation",
+            "stage": "generate_user_response",
+            "wasted_input_token_count": 30,
+            "wasted_output_token_count": 1,
+        }
+        assert evaluator_fixture.trace.durations == {
+            "_generate_test_status": [steps[0]["duration"]],
+            "_generate_evaluation": [steps[1]["duration"]],
+        }
+
+    @pytest.mark.parametrize("use_asyncio", [False, True])
+    def test_run_speculative_next_turn(self, mocker, evaluator_fixture, use_asyncio):
+        evaluator_fixture.speculative = True
+        mock_invoke_target = mocker.patch.object(evaluator_fixture, "_invoke_target")
+        mock_ainvoke_target = mocker.patch.object(evaluator_fixture, "_ainvoke_target")
+        self._mock_stages(
+            mocker,
+            evaluator_fixture,
+            {
+                "generate_test_status": (
+                    (evaluator.TestStatusCategories.NOT_ALL_STEPS_ATTEMPTED.value,),
+                    10,
+                ),
+                "generate_evaluation": (RuntimeError(), 20),
+                "generate_user_response": (("test user response",), 30),
+            },
+        )
+
+        if use_asyncio:
+            result = asyncio.run(evaluator_fixture.aevaluate())
+            target_calls = mock_ainvoke_target.call_args_list
+        else:
+            result = evaluator_fixture.evaluate()
+            target_calls = mock_invoke_target.call_args_list
+
+        # errors from discarded speculations are ignored
+        assert result.result == evaluator.Results.MAX_TURNS_REACHED.value
+        assert target_calls[1].args == ("test user response",)
+        assert [step["step_name"] for step in evaluator_fixture.trace.steps] == [
+            "_generate_test_status",
+            "_generate_user_response",
+            "_generate_test_status",
+        ]
+        assert "_generate_evaluation" not in evaluator_fixture.trace.durations
+
+    def test_run_speculative_reuses_threads(self, mocker, evaluator_fixture):
+        evaluator_fixture.speculative = True
+        evaluator_fixture.test.max_turns = 3
+        mocker.patch.object(evaluator_fixture, "_invoke_target")
+        self._mock_stages(
+            mocker,
+            evaluator_fixture,
+            {
+                "generate_test_status": (
+                    (evaluator.TestStatusCategories.NOT_ALL_STEPS_ATTEMPTED.value,),
+                    10,
+                ),
+                "generate_evaluation": (
+                    (evaluator.EvaluationCategories.ALL_EXPECTED_RESULTS_OBSERVED.value,),
+                    20,
+                ),
+                "generate_user_response": (("test user response",), 30),
+            },
+        )
+        speculation_threads = set()
+        speculate = evaluator_fixture._speculate
+
+        def record_thread(generate):
+            speculation_threads.add(threading.current_thread())
+            return speculate(generate)
+
+        mocker.patch.object(evaluator_fixture, "_speculate", side_effect=record_thread)
+
+        evaluator_fixture.evaluate()
+
+        # the speculations of every turn share the threads of the evaluator, which
+        # are shut down once the test is evaluated
+        assert len(speculation_threads) <= 2
+        assert evaluator_fixture._speculation_executor is None
+
+    def test_invoke_model_completion_cache(
+        self, mocker, tmp_path, test_fixture, target_fixture
+    ):
+        mocker.patch.object(aws.boto3, "Session")
+        completion_cache = CompletionCache(cache_dir=str(tmp_path))
+
+        def create_evaluator():
+            return evaluator.CanonicalEvaluator(
+                model_config=DEFAULT_CLAUDE_3_MODEL_CONFIG,
+                test=test_fixture,
+                target=target_fixture,
+                work_dir="test_dir",
+                completion_cache=completion_cache,
+            )
+
+        fixture = create_evaluator()
+        mock_invoke_model = mocker.patch.object(
+            fixture.bedrock_runtime_client, "invoke_model"
+        )
+        mock_invoke_model.return_value = {
+            "body": io.BytesIO(b"test body"),
+            "ResponseMetadata": {
+                "HTTPHeaders": {
+                    "x-amzn-bedrock-input-token-count": "10",
+                    "x-amzn-bedrock-output-token-count": "5",
+                    "date": "test date",
+                }
+            },
+        }
+
+        assert fixture.invoke_model({"test": "body"})["body"].read() == b"test body"
+        assert fixture.input_token_count == 10
+
+        cached_fixture = create_evaluator()
+        mock_invoke_model.reset_mock()
+
+        response = cached_fixture.invoke_model({"test": "body"})
+
+        mock_invoke_model.assert_not_called()
+        assert response["body"].read() == b"test body"
+        assert response["ResponseMetadata"]["HTTPHeaders"] == {
+            "x-amzn-bedrock-input-token-count": "10",
+            "x-amzn-bedrock-output-token-count": "5",
+        }
+        # cached responses are not paid for
+        assert cached_fixture.input_token_count == 0
+
+    def test_invoke_model_with_response_stream_completion_cache(
+        self, mocker, tmp_path, evaluator_fixture
+    ):
+        evaluator_fixture._completion_cache = CompletionCache(cache_dir=str(tmp_path))
+        mock_stream = mocker.MagicMock()
+        mock_stream.__iter__.return_value = iter(
+            self._stream_events(
+                {"type": "content_block_delta", "delta": {"text": "<category>A"}},
+                {"type": "content_block_delta", "delta": {"text": "</category>"}},
+            )
+        )
+        mock_invoke_model_with_response_stream = mocker.patch.object(
+            evaluator_fixture.bedrock_runtime_client,
+            "invoke_model_with_response_stream",
+            return_value={"body": mock_stream, "ResponseMetadata": {}},
+        )
+
+        for _ in range(2):
+            completion = evaluator_fixture.invoke_model_with_response_stream(
+                {"test": "body"}, stop="</category>"
+            )
+            assert completion == "<category>A</category>"
+
+        mock_invoke_model_with_response_stream.assert_called_once()
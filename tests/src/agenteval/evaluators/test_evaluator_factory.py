@@ -47,9 +47,46 @@ class TestEvaluatorFactory:
         factory.create(test, target, work_dir)
 
         mock_evaluator_cls.assert_called_once_with(
-            test=test, target=target, work_dir=work_dir, aws_region="us-west-2", model_config=expected_model_config
+            test=test,
+            target=target,
+            work_dir=work_dir,
+            aws_region="us-west-2",
+            model_config=expected_model_config,
+            concurrency_limiter=None,
+            target_concurrency_limiter=None,
+            adaptive_concurrency_limiter=None,
+            completion_cache=None,
+            trace_config=None,
         )
 
+    def test_create_with_max_concurrency(self, mocker):
+        factory = evaluator_factory.EvaluatorFactory(
+            config={"model": "claude-3", "max_concurrency": 5}
+        )
+        mock_evaluator_cls = mocker.patch.object(
+            evaluator_factory, evaluator_factory._EVALUATOR_METHOD_MAP["canonical"].__name__
+        )
+        mocker.patch.object(factory, "_get_evaluator_class", return_value=mock_evaluator_cls)
+        target_concurrency_limiter = mocker.MagicMock()
+
+        factory.create(
+            mocker.MagicMock(),
+            mocker.MagicMock(),
+            os.getcwd(),
+            target_concurrency_limiter=target_concurrency_limiter,
+        )
+        factory.create(mocker.MagicMock(), mocker.MagicMock(), os.getcwd())
+
+        first_call, second_call = mock_evaluator_cls.call_args_list
+        assert "max_concurrency" not in first_call.kwargs
+        assert first_call.kwargs["concurrency_limiter"].max_concurrency == 5
+        # the limiter is shared by all evaluators created by the factory
+        assert (
+            first_call.kwargs["concurrency_limiter"]
+            is second_call.kwargs["concurrency_limiter"]
+        )
+        assert first_call.kwargs["target_concurrency_limiter"] is target_concurrency_limiter
+
     def test_get_evaluator_class_works_as_expected(self, target_factory_fixture, target_factory_custom_config_fixture):
         broken_config = evaluator_factory.EvaluatorFactory(
             config={"model": "claude-3", "eval_method": "canoncial", "aws_region": "us-west-2"}
@@ -0,0 +1,69 @@
+from src.agenteval.plan import fingerprint
+from src.agenteval.test import Test
+import pytest
+
+
+@pytest.fixture
+def test_fixture():
+    return Test(
+        name="test_1",
+        steps=["step 1"],
+        expected_results=["result 1"],
+        max_turns=2,
+    )
+
+
+evaluator_config = {"model": "claude-3"}
+target_config = {"type": "bedrock-agent", "bedrock_agent_alias_id": "alias-1"}
+
+
+def test_fingerprint_test_unchanged(test_fixture):
+    assert fingerprint.fingerprint_test(
+        test_fixture, evaluator_config, target_config
+    ) == fingerprint.fingerprint_test(
+        test_fixture.model_copy(), dict(evaluator_config), dict(target_config)
+    )
+
+
+@pytest.mark.parametrize(
+    "test_update,evaluator_update,target_update",
+    [
+        ({"steps": ["step 2"]}, {}, {}),
+        ({"max_turns": 3}, {}, {}),
+        ({}, {"model": "claude-3-5-sonnet"}, {}),
+        ({}, {}, {"bedrock_agent_alias_id": "alias-2"}),
+        ({}, {}, {"version": "2"}),
+    ],
+)
+def test_fingerprint_test_changed(
+    test_fixture, test_update, evaluator_update, target_update
+):
+    assert fingerprint.fingerprint_test(
+        test_fixture, evaluator_config, target_config
+    ) != fingerprint.fingerprint_test(
+        test_fixture.model_copy(update=test_update),
+        {**evaluator_config, **evaluator_update},
+        {**target_config, **target_update},
+    )
+
+
+def test_fingerprint_test_ignores_request_limits(test_fixture):
+    assert fingerprint.fingerprint_test(
+        test_fixture, evaluator_config, target_config
+    ) == fingerprint.fingerprint_test(
+        test_fixture,
+        {**evaluator_config, "max_concurrency": 2, "cache": True},
+        {**target_config, "max_concurrency": 2},
+    )
+
+
+def test_templates_version_changes_with_templates(mocker):
+    version = fingerprint.templates_version()
+    fingerprint.templates_version.cache_clear()
+    mock_get_source = mocker.patch.object(fingerprint.jinja_env.loader, "get_source")
+    mock_get_source.return_value = ("changed", None, None)
+
+    try:
+        assert fingerprint.templates_version() != version
+    finally:
+        fingerprint.templates_version.cache_clear()
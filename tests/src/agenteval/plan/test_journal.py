@@ -0,0 +1,97 @@
+# test results are validated against the conversation class imported by the package
+from agenteval.conversation import Conversation
+from src.agenteval.plan import journal
+from src.agenteval.test import TestResult
+
+
+def create_entry(test_name, passed=True):
+    conversation = Conversation()
+    conversation.add_turn("user message", "agent response")
+    return journal.JournalEntry(
+        result=TestResult(
+            test_name=test_name,
+            result="result",
+            reasoning="reasoning",
+            passed=passed,
+            conversation=conversation,
+        ),
+        input_token_count=10,
+        output_token_count=5,
+        durations={"_invoke_target": [0.5]},
+        fingerprint="fingerprint",
+    )
+
+
+def test_append_and_load(tmp_path):
+    result_journal = journal.ResultJournal.in_work_dir(str(tmp_path))
+    result_journal.open()
+    result_journal.append(create_entry("test_1"))
+    result_journal.append(create_entry("test_2", passed=False))
+    result_journal.close()
+
+    entries = result_journal.load()
+
+    assert list(entries) == ["test_1", "test_2"]
+    entry = entries["test_2"]
+    assert entry.result.passed is False
+    assert entry.result.conversation.messages == [
+        ("USER", "user message"),
+        ("AGENT", "agent response"),
+    ]
+    assert entry.result.conversation.turns == 1
+    assert entry.input_token_count == 10
+    assert entry.durations == {"_invoke_target": [0.5]}
+    assert entry.fingerprint == "fingerprint"
+
+
+def test_load_missing(tmp_path):
+    assert journal.ResultJournal(str(tmp_path / "missing.jsonl")).load() == {}
+
+
+def test_resume_after_partial_entry(tmp_path):
+    result_journal = journal.ResultJournal.in_work_dir(str(tmp_path))
+    result_journal.open()
+    result_journal.append(create_entry("test_1"))
+    result_journal.close()
+
+    # an entry cut off by an interrupted run
+    with open(result_journal.path, "a") as f:
+        f.write('{"result": {"test_name": "test_2"')
+
+    assert list(result_journal.load()) == ["test_1"]
+
+    result_journal.open(resume=True)
+    result_journal.append(create_entry("test_3"))
+    result_journal.close()
+
+    assert list(result_journal.load()) == ["test_1", "test_3"]
+
+
+def test_open_truncates(tmp_path):
+    result_journal = journal.ResultJournal.in_work_dir(str(tmp_path))
+    result_journal.open()
+    result_journal.append(create_entry("test_1"))
+    result_journal.close()
+
+    result_journal.open()
+    result_journal.close()
+
+    assert result_journal.load() == {}
+
+
+def test_iter_entries(tmp_path):
+    result_journal = journal.ResultJournal.in_work_dir(str(tmp_path))
+    result_journal.open()
+    result_journal.append(create_entry("test_1", passed=False))
+    result_journal.append(create_entry("test_2"))
+    # a test which was run again
+    result_journal.append(create_entry("test_1"))
+    result_journal.close()
+    with open(result_journal.path, "a") as f:
+        f.write('{"result": {"test_name": "test_3"')
+
+    entries = list(result_journal.iter_entries(["test_2", "test_1"]))
+
+    assert [entry.result.test_name for entry in entries] == ["test_2", "test_1"]
+    assert entries[1].result.passed is True
+    assert entries[1].result.conversation.turns == 1
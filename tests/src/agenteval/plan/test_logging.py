@@ -18,17 +18,10 @@ def test_log_run_start(caplog):
     ]
 
 
-def test_log_run_end(caplog, mocker):
-    results = {
-        "test_1": mocker.MagicMock(
-            spec=["success", "test_name"], test_name="test_1", passed=True
-        ),
-        "test_2": mocker.MagicMock(
-            spec=["success", "test_name"], test_name="test_2", passed=True
-        ),
-    }
+def test_log_run_end(caplog):
+    statuses = {"test_1": True, "test_2": True}
 
-    logging.log_run_end(True, results, 2, 2, 0, 60.0, 1000, 500)
+    logging.log_run_end(True, statuses, 2, 2, 0, 60.0, 1000, 500)
 
     assert caplog.record_tuples == [
         (
@@ -64,17 +57,10 @@ def test_log_run_end(caplog, mocker):
     ]
 
 
-def test_log_run_end_with_failed_test(caplog, mocker):
-    results = {
-        "test_1": mocker.MagicMock(
-            spec=["success", "test_name"], test_name="test_1", passed=True
-        ),
-        "test_2": mocker.MagicMock(
-            spec=["success", "test_name"], test_name="test_2", passed=False
-        ),
-    }
+def test_log_run_end_with_failed_test(caplog):
+    statuses = {"test_1": True, "test_2": False}
 
-    logging.log_run_end(True, results, 2, 1, 1, 60.0, 1000, 500)
+    logging.log_run_end(True, statuses, 2, 1, 1, 60.0, 1000, 500)
 
     assert caplog.record_tuples == [
         (
@@ -108,3 +94,77 @@ def test_log_run_end_with_failed_test(caplog, mocker):
             "Output tokens generated by evaluator: 500",
         ),
     ]
+
+
+def test_log_concurrency_change(caplog):
+    logging.log_concurrency_change(False, 4, 2)
+    logging.log_concurrency_change(False, 2, 3)
+    logging.log_concurrency_change(True, 3, 4)
+    logging.log_concurrency_change(False, 4, 2, "throttling")
+    logging.log_concurrency_change(False, 2, 1, "latency")
+
+    assert caplog.record_tuples == [
+        (
+            logging.logger.name,
+            logging.logging.WARNING,
+            "[yellow]Throttling detected, reducing concurrency from 4 to 2",
+        ),
+        (
+            logging.logger.name,
+            logging.logging.INFO,
+            "Increasing concurrency from 3 to 4",
+        ),
+        (
+            logging.logger.name,
+            logging.logging.WARNING,
+            "[yellow]Throttling detected, reducing concurrency from 4 to 2",
+        ),
+        (
+            logging.logger.name,
+            logging.logging.WARNING,
+            "[yellow]Latency increased, reducing concurrency from 2 to 1",
+        ),
+    ]
+
+
+def test_log_run_end_with_prompt_caching(caplog, mocker):
+    logging.log_run_end(True, {}, 0, 0, 0, 60.0, 1000, 500, 4000, 200)
+
+    assert caplog.record_tuples[-2:] == [
+        (
+            logging.logger.name,
+            logging.logging.INFO,
+            "Input tokens read from cache by evaluator: 4000",
+        ),
+        (
+            logging.logger.name,
+            logging.logging.INFO,
+            "Input tokens written to cache by evaluator: 200",
+        ),
+    ]
+
+
+def test_log_run_end_with_latencies(caplog):
+    latencies = {
+        "_invoke_target": {"count": 4, "total": 8.0, "p50": 1.5, "p95": 3.0, "p99": 3.0}
+    }
+
+    logging.log_run_end(True, {}, 0, 0, 0, 60.0, 1000, 500, latencies=latencies)
+
+    assert caplog.record_tuples[-1] == (
+        logging.logger.name,
+        logging.logging.INFO,
+        "_invoke_target: p50 1.5s, p95 3.0s, p99 3.0s (4 calls)",
+    )
+
+
+def test_log_profile(caplog):
+    logging.log_profile(
+        {"setup": (1.5, 0.25)}, [("invoke_model(base_evaluator.py:1)", 50.0)], "path"
+    )
+
+    assert [message for _, _, message in caplog.record_tuples] == [
+        "Profile of setup: 1.50 seconds, 0.25 CPU seconds",
+        "50.0% invoke_model(base_evaluator.py:1)",
+        "Profile saved to path",
+    ]
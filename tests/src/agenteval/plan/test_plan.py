@@ -1,6 +1,16 @@
+import asyncio
+import concurrent.futures
+import copy
+import json
 import os
+import queue
+import threading
 
+# test results are validated against the conversation class imported by the package
+from agenteval.conversation import Conversation
+from agenteval.utils.concurrency import to_thread
 from src.agenteval.plan import plan
+from src.agenteval.test import TestResult
 import pytest
 
 
@@ -34,6 +44,49 @@ def plan_fixture():
     return plan.Plan(config=config)
 
 
+def create_mock_evaluator(mocker, test, passed=True):
+    evaluator = mocker.MagicMock(
+        input_token_count=1,
+        output_token_count=2,
+        cache_read_input_token_count=0,
+        cache_write_input_token_count=0,
+    )
+    evaluator.trace.durations = {"_invoke_target": [1.0]}
+    evaluator.run.return_value = TestResult(
+        test_name=test.name,
+        result="result",
+        reasoning="reasoning",
+        passed=passed,
+        conversation=Conversation(),
+    )
+    evaluator.arun = mocker.AsyncMock(return_value=evaluator.run.return_value)
+    return evaluator
+
+
+def mock_journal_results(mocker):
+    # tests which are not run have no results in the journal
+    mocker.patch.object(
+        plan.ResultJournal,
+        "iter_entries",
+        side_effect=lambda test_names: (mocker.MagicMock() for _ in test_names),
+    )
+
+
+def complete_tests(plan_fixture, pass_count):
+    # stands in for the tests being run, passing the first `pass_count` tests
+    plan_fixture._pass_count = pass_count
+    plan_fixture._statuses = {
+        test.name: i < pass_count for i, test in enumerate(plan_fixture._test_suite)
+    }
+
+
+@pytest.fixture(autouse=True)
+def work_dir(monkeypatch, tmp_path):
+    # runs default to the current working directory, so keep their output out of the repo
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
 class TestPlan:
     def test_load(self, mocker):
         mock_load_yaml = mocker.patch.object(plan.Plan, "_load_yaml")
@@ -85,33 +138,42 @@ class TestPlan:
         mock_log_run_start = mocker.patch.object(plan, "log_run_start")
 
         mock_run_concurrent = mocker.patch.object(plan_fixture, "_run_concurrent")
-        mock_run_concurrent.side_effect = lambda: setattr(
-            plan_fixture, "_pass_count", plan_fixture._num_tests
+        mock_run_concurrent.side_effect = lambda: complete_tests(
+            plan_fixture, plan_fixture._num_tests
         )
 
         mock_log_run_end = mocker.patch.object(plan, "log_run_end")
         mock_create_markdown_summary = mocker.patch.object(
             plan, "create_markdown_summary"
         )
+        mock_create_latency_summary = mocker.patch.object(
+            plan, "create_latency_summary"
+        )
+        mock_journal_results(mocker)
 
         plan_fixture.run(False, None, None, None)
 
-        spy_setup_run.assert_called_once_with(None, None, None)
+        spy_setup_run.assert_called_once_with(
+            None, None, None, False, False, True, False, None, None, False, None, False, False
+        )
         mock_log_run_start.assert_called_once()
         mock_run_concurrent.assert_called_once()
         mock_log_run_end.assert_called_once()
         mock_create_markdown_summary.assert_called_once()
+        mock_create_latency_summary.assert_called_once()
 
     def test_run_failed_test(self, mocker, plan_fixture):
         mocker.patch.object(plan, "log_run_start")
 
         mock_run_concurrent = mocker.patch.object(plan_fixture, "_run_concurrent")
-        mock_run_concurrent.side_effect = lambda: setattr(
-            plan_fixture, "_pass_count", plan_fixture._num_tests - 1
+        mock_run_concurrent.side_effect = lambda: complete_tests(
+            plan_fixture, plan_fixture._num_tests - 1
         )
 
         mocker.patch.object(plan, "log_run_end")
         mocker.patch.object(plan, "create_markdown_summary")
+        mocker.patch.object(plan, "create_latency_summary")
+        mock_journal_results(mocker)
 
         with pytest.raises(plan.TestFailureError):
             plan_fixture.run(False, None, None, None)
@@ -133,3 +195,537 @@ class TestPlan:
         mock_as_completed.assert_called_once_with(
             [mock_submit.return_value for _ in range(plan_fixture._num_tests)]
         )
+
+    @pytest.mark.parametrize(
+        "speculative,max_pool_connections", [(False, 2), (True, 6)]
+    )
+    def test_setup_run_configures_client_pool(
+        self, mocker, plan_fixture, speculative, max_pool_connections
+    ):
+        mock_configure_boto3_client_pool = mocker.patch.object(
+            plan, "configure_boto3_client_pool"
+        )
+        plan_fixture.config = {
+            **plan_fixture.config,
+            "evaluator": {**plan_fixture.config["evaluator"], "speculative": speculative},
+        }
+
+        plan_fixture._setup_run(None, None, 2)
+
+        # speculative tests make up to 3 calls to the model at the same time
+        mock_configure_boto3_client_pool.assert_called_once_with(
+            max_pool_connections=max_pool_connections
+        )
+
+    def test_run_asyncio_engine(self, mocker, plan_fixture):
+        mocker.patch.object(plan, "log_run_start")
+        mocker.patch.object(plan, "log_run_end")
+        mocker.patch.object(plan, "create_markdown_summary")
+        mocker.patch.object(plan, "create_latency_summary")
+        mock_journal_results(mocker)
+
+        mock_run_concurrent = mocker.patch.object(plan_fixture, "_run_concurrent")
+
+        async def arun_concurrent():
+            complete_tests(plan_fixture, plan_fixture._num_tests)
+
+        mock_arun_concurrent = mocker.patch.object(
+            plan_fixture, "_arun_concurrent", side_effect=arun_concurrent
+        )
+
+        plan_fixture.run(engine="asyncio")
+
+        mock_arun_concurrent.assert_called_once()
+        mock_run_concurrent.assert_not_called()
+
+    def test_run_unsupported_engine(self, plan_fixture):
+        with pytest.raises(ValueError):
+            plan_fixture.run(engine="processes")
+
+    def test_arun_concurrent(self, mocker, plan_fixture):
+        plan_fixture._setup_run(None, None, 2)
+
+        tests_run = []
+
+        async def arun_test(test):
+            tests_run.append(test.name)
+
+        mocker.patch.object(plan_fixture, "_arun_test", side_effect=arun_test)
+        mock_close_async_boto3_clients = mocker.patch.object(
+            plan, "close_async_boto3_clients"
+        )
+
+        asyncio.run(plan_fixture._arun_concurrent())
+
+        assert sorted(tests_run) == [test.name for test in plan_fixture._test_suite]
+        mock_close_async_boto3_clients.assert_awaited_once()
+
+    def test_setup_run_adaptive_concurrency(self, plan_fixture):
+        plan_fixture._setup_run(None, None, 4)
+
+        assert plan_fixture._adaptive_concurrency_limiter is None
+
+        plan_fixture._setup_run(None, None, 4, adaptive_concurrency=True)
+
+        assert plan_fixture._adaptive_concurrency_limiter.max_concurrency == 4
+        assert plan_fixture._adaptive_concurrency_limiter.limit == 1
+
+    def test_run_test_adaptive_concurrency(self, mocker, plan_fixture):
+        plan_fixture._setup_run(None, None, 4, adaptive_concurrency=True)
+        plan_fixture._progress = mocker.MagicMock()
+        plan_fixture._tracker = None
+        limiter = plan_fixture._adaptive_concurrency_limiter
+
+        mock_create_evaluator = mocker.patch.object(plan_fixture, "_create_evaluator")
+        mock_create_evaluator.return_value.run.side_effect = lambda: (
+            mocker.MagicMock(passed=True) if limiter._in_flight == 1 else None
+        )
+
+        plan_fixture._run_test(plan_fixture._test_suite.tests[0])
+
+        assert limiter._in_flight == 0
+        assert plan_fixture._pass_count == 1
+
+    def test_setup_run_completion_cache(self, tmp_path, plan_fixture):
+        plan_fixture._setup_run(None, str(tmp_path), None)
+
+        assert plan_fixture._completion_cache is None
+
+        # avoid modifying the shared config
+        plan_fixture.config["evaluator"] = {**plan_fixture.config["evaluator"]}
+        plan_fixture.config["evaluator"]["cache"] = True
+        plan_fixture._setup_run(None, str(tmp_path), None, refresh_cache=True)
+
+        assert plan_fixture._completion_cache.cache_dir == os.path.join(
+            str(tmp_path), "agenteval_cache"
+        )
+        assert plan_fixture._completion_cache.refresh is True
+
+        plan_fixture.config["evaluator"]["cache"] = {"cache_dir": "test_cache"}
+        plan_fixture._setup_run(None, str(tmp_path), None)
+
+        assert plan_fixture._completion_cache.cache_dir == "test_cache"
+
+        plan_fixture._setup_run(None, str(tmp_path), None, use_cache=False)
+
+        assert plan_fixture._completion_cache is None
+
+    def test_run_record_and_replay_cassette(self, plan_fixture):
+        with pytest.raises(ValueError):
+            plan_fixture.run(record_cassette="a.jsonl", replay_cassette="b.jsonl")
+
+    def test_create_target_record_cassette(self, mocker, tmp_path, plan_fixture):
+        mock_create = mocker.patch.object(plan.TargetFactory, "create")
+        plan_fixture._setup_run(
+            None, None, None, record_cassette=str(tmp_path / "cassette.jsonl")
+        )
+        test = plan_fixture._test_suite.tests[0]
+
+        target = plan_fixture._create_target(test)
+
+        assert isinstance(target, plan.RecordingTarget)
+        assert target.target is mock_create.return_value
+        assert target.test_name == test.name
+
+    def test_create_target_replay_cassette(self, mocker, tmp_path, plan_fixture):
+        cassette_path = tmp_path / "cassette.jsonl"
+        plan.Cassette(str(cassette_path)).save()
+        mock_create = mocker.patch.object(plan.TargetFactory, "create")
+        plan_fixture._setup_run(None, None, None, replay_cassette=str(cassette_path))
+
+        target = plan_fixture._create_target(plan_fixture._test_suite.tests[0])
+
+        assert isinstance(target, plan.ReplayTarget)
+        # the replayed target is named after the configured target
+        assert target.target_name == "BedrockAgentTarget"
+        mock_create.assert_not_called()
+
+    def test_run_saves_cassette_on_failure(self, mocker, tmp_path, plan_fixture):
+        cassette_path = tmp_path / "cassette.jsonl"
+        mocker.patch.object(plan, "log_run_start")
+        mocker.patch.object(
+            plan_fixture, "_run_concurrent", side_effect=RuntimeError("test error")
+        )
+
+        with pytest.raises(RuntimeError):
+            plan_fixture.run(record_cassette=str(cassette_path))
+
+        assert cassette_path.exists()
+
+    def test_record_result_durations(self, mocker, plan_fixture):
+        plan_fixture._setup_run(None, None, None)
+        plan_fixture._progress = mocker.MagicMock()
+        plan_fixture._tracker = None
+
+        for test, durations in zip(plan_fixture._test_suite, ([1.0], [2.0, 3.0])):
+            evaluator = mocker.MagicMock()
+            evaluator.trace.durations = {"_invoke_target": durations}
+            plan_fixture._record_result(test, evaluator, mocker.MagicMock())
+
+        assert plan_fixture._durations == {"_invoke_target": [1.0, 2.0, 3.0]}
+
+    def test_run_resume(self, mocker, work_dir, plan_fixture):
+        mocker.patch.object(plan, "log_run_start")
+        mocker.patch.object(plan, "log_run_end")
+        mock_create_markdown_summary = mocker.patch.object(
+            plan, "create_markdown_summary"
+        )
+        mocker.patch.object(plan, "create_latency_summary")
+
+        mocker.patch.object(
+            plan_fixture,
+            "_create_evaluator",
+            side_effect=lambda test: create_mock_evaluator(mocker, test),
+        )
+
+        mock_run_test = mocker.spy(plan_fixture, "_run_test")
+        # a run which was interrupted after the first test
+        plan_fixture.run(num_threads=1, filter="test_1")
+
+        plan_fixture.run(num_threads=1, resume=True)
+
+        assert [call.args[0].name for call in mock_run_test.call_args_list] == [
+            "test_1",
+            "test_2",
+            "test_3",
+        ]
+        assert len(plan.ResultJournal.in_work_dir(str(work_dir)).load()) == 3
+        pass_count, num_tests, _, results, statuses = (
+            mock_create_markdown_summary.call_args.args[1:]
+        )
+        assert (pass_count, num_tests) == (3, 3)
+        assert [result.test_name for result in results] == ["test_1", "test_2", "test_3"]
+        assert statuses == {"test_1": True, "test_2": True, "test_3": True}
+        assert sum(plan_fixture._evaluator_input_token_counts) == 3
+        assert plan_fixture._durations == {"_invoke_target": [1.0, 1.0, 1.0]}
+
+    def test_run_changed_only(self, mocker, plan_fixture):
+        mocker.patch.object(plan, "create_markdown_summary")
+        mocker.patch.object(plan, "create_latency_summary")
+
+        def create_evaluator(test):
+            return create_mock_evaluator(mocker, test)
+
+        mocker.patch.object(
+            plan_fixture, "_create_evaluator", side_effect=create_evaluator
+        )
+        plan_fixture.run(num_threads=1)
+
+        changed_config = copy.deepcopy(config)
+        changed_config["tests"]["test_2"]["steps"] = ["step 2"]
+        changed_plan = plan.Plan(config=changed_config)
+        mocker.patch.object(
+            changed_plan, "_create_evaluator", side_effect=create_evaluator
+        )
+        mock_run_test = mocker.spy(changed_plan, "_run_test")
+
+        changed_plan.run(num_threads=1, rerun="changed")
+
+        assert [call.args[0].name for call in mock_run_test.call_args_list] == [
+            "test_2"
+        ]
+        assert changed_plan._pass_count == 3
+
+    def test_run_rerun_failed(self, mocker, plan_fixture):
+        mocker.patch.object(plan, "create_markdown_summary")
+        mocker.patch.object(plan, "create_latency_summary")
+        mocker.patch.object(
+            plan_fixture,
+            "_create_evaluator",
+            side_effect=lambda test: create_mock_evaluator(
+                mocker, test, passed=test.name != "test_2"
+            ),
+        )
+        with pytest.raises(plan.TestFailureError):
+            plan_fixture.run(num_threads=1)
+
+        mock_run_test = mocker.spy(plan_fixture, "_run_test")
+        with pytest.raises(plan.TestFailureError):
+            plan_fixture.run(num_threads=1, rerun="failed")
+
+        assert [call.args[0].name for call in mock_run_test.call_args_list] == [
+            "test_2"
+        ]
+
+    def test_run_last_failed(self, mocker, work_dir, plan_fixture):
+        mocker.patch.object(plan, "create_markdown_summary")
+        mocker.patch.object(plan, "create_latency_summary")
+        mocker.patch.object(
+            plan_fixture,
+            "_create_evaluator",
+            side_effect=lambda test: create_mock_evaluator(
+                mocker, test, passed=test.name != "test_2"
+            ),
+        )
+        with pytest.raises(plan.TestFailureError):
+            plan_fixture.run(num_threads=1)
+
+        mock_run_test = mocker.spy(plan_fixture, "_run_test")
+        with pytest.raises(plan.TestFailureError):
+            plan_fixture.run(num_threads=1, last_failed=True)
+
+        assert [call.args[0].name for call in mock_run_test.call_args_list] == [
+            "test_2"
+        ]
+        assert plan_fixture._num_tests == 1
+        # the results of the tests which passed are kept
+        assert len(plan.ResultJournal.in_work_dir(str(work_dir)).load()) == 3
+
+    def test_run_last_failed_without_failures(self, mocker, plan_fixture):
+        mocker.patch.object(plan, "create_markdown_summary")
+        mocker.patch.object(plan, "create_latency_summary")
+        mocker.patch.object(
+            plan_fixture,
+            "_create_evaluator",
+            side_effect=lambda test: create_mock_evaluator(mocker, test),
+        )
+        mock_run_test = mocker.spy(plan_fixture, "_run_test")
+
+        plan_fixture.run(num_threads=1, last_failed=True)
+
+        assert mock_run_test.call_count == 3
+
+    def test_run_failed_first(self, mocker, plan_fixture):
+        mocker.patch.object(plan, "create_markdown_summary")
+        mocker.patch.object(plan, "create_latency_summary")
+        mocker.patch.object(
+            plan_fixture,
+            "_create_evaluator",
+            side_effect=lambda test: create_mock_evaluator(
+                mocker, test, passed=test.name != "test_3"
+            ),
+        )
+        with pytest.raises(plan.TestFailureError):
+            plan_fixture.run(num_threads=1)
+
+        mock_run_test = mocker.spy(plan_fixture, "_run_test")
+        with pytest.raises(plan.TestFailureError):
+            plan_fixture.run(num_threads=1, failed_first=True)
+
+        assert [call.args[0].name for call in mock_run_test.call_args_list] == [
+            "test_3",
+            "test_1",
+            "test_2",
+        ]
+
+    def test_run_unsupported_rerun_mode(self, plan_fixture):
+        with pytest.raises(ValueError):
+            plan_fixture.run(rerun="unsupported")
+
+    def test_run_without_resume_replaces_journal(self, mocker, work_dir, plan_fixture):
+        journal = plan.ResultJournal.in_work_dir(str(work_dir))
+        journal.open()
+        journal.append(
+            plan.JournalEntry(
+                result=TestResult(
+                    test_name="test_1",
+                    result="result",
+                    reasoning="reasoning",
+                    passed=True,
+                    conversation=Conversation(),
+                )
+            )
+        )
+        journal.close()
+        mocker.patch.object(plan, "log_run_start")
+        mocker.patch.object(plan_fixture, "_run_concurrent")
+        mocker.patch.object(plan_fixture, "_finish_run")
+
+        with pytest.raises(plan.TestFailureError):
+            plan_fixture.run()
+
+        assert journal.load() == {}
+
+    @pytest.mark.parametrize("engine", ["threads", "asyncio"])
+    def test_iter_results(self, mocker, engine, plan_fixture):
+        mocker.patch.object(plan, "log_run_end")
+        mock_create_markdown_summary = mocker.patch.object(
+            plan, "create_markdown_summary"
+        )
+        mocker.patch.object(plan, "create_latency_summary")
+        mocker.patch.object(plan, "close_async_boto3_clients")
+        mocker.patch.object(
+            plan_fixture,
+            "_create_evaluator",
+            side_effect=lambda test: create_mock_evaluator(
+                mocker, test, passed=test.name != "test_2"
+            ),
+        )
+
+        # failed tests do not raise `TestFailureError`
+        entries = list(plan_fixture.iter_results(num_threads=2, engine=engine))
+
+        assert sorted(entry.result.test_name for entry in entries) == [
+            "test_1",
+            "test_2",
+            "test_3",
+        ]
+        assert sum(entry.input_token_count for entry in entries) == 3
+        pass_count, num_tests, _, results, statuses = (
+            mock_create_markdown_summary.call_args.args[1:]
+        )
+        assert (pass_count, num_tests) == (2, 3)
+        assert [result.test_name for result in results] == ["test_1", "test_2", "test_3"]
+        assert statuses == {"test_1": True, "test_2": False, "test_3": True}
+
+    def test_iter_results_stopped_early(self, mocker, plan_fixture):
+        mock_create_markdown_summary = mocker.patch.object(
+            plan, "create_markdown_summary"
+        )
+
+        def create_evaluator(test):
+            evaluator = create_mock_evaluator(mocker, test)
+            if test.name == "test_2":
+                # still running when the caller stops iterating
+                result = evaluator.run.return_value
+                evaluator.run.side_effect = lambda: (
+                    plan_fixture._stopped.wait() and result
+                )
+            return evaluator
+
+        mocker.patch.object(
+            plan_fixture, "_create_evaluator", side_effect=create_evaluator
+        )
+        mock_run_test = mocker.spy(plan_fixture, "_run_test")
+
+        for entry in plan_fixture.iter_results(num_threads=1):
+            assert entry.result.test_name == "test_1"
+            break
+
+        # the test in flight finishes, and the remaining tests are skipped
+        assert mock_run_test.call_count == 3
+        assert list(plan_fixture._journal.load()) == ["test_1", "test_2"]
+        mock_create_markdown_summary.assert_not_called()
+
+    def test_iter_results_error(self, mocker, plan_fixture):
+        mocker.patch.object(
+            plan_fixture, "_create_evaluator", side_effect=RuntimeError("test error")
+        )
+
+        with pytest.raises(RuntimeError):
+            list(plan_fixture.iter_results())
+
+    def test_aiter_results(self, mocker, plan_fixture):
+        mocker.patch.object(plan, "log_run_end")
+        mocker.patch.object(plan, "create_markdown_summary")
+        mocker.patch.object(plan, "create_latency_summary")
+        mock_close_async_boto3_clients = mocker.patch.object(
+            plan, "close_async_boto3_clients"
+        )
+        mocker.patch.object(
+            plan_fixture,
+            "_create_evaluator",
+            side_effect=lambda test: create_mock_evaluator(mocker, test),
+        )
+
+        async def collect():
+            return [entry async for entry in plan_fixture.aiter_results(num_threads=2)]
+
+        entries = asyncio.run(collect())
+
+        assert sorted(entry.result.test_name for entry in entries) == [
+            "test_1",
+            "test_2",
+            "test_3",
+        ]
+        assert plan_fixture._pass_count == 3
+        mock_close_async_boto3_clients.assert_awaited_once()
+
+    def test_iter_results_asyncio_engine_queue(self, mocker, plan_fixture):
+        mocker.patch.object(plan, "create_markdown_summary")
+        mocker.patch.object(plan, "create_latency_summary")
+        mocker.patch.object(plan, "close_async_boto3_clients")
+        loop_threads = set()
+        put_threads = set()
+
+        class RecordingQueue(queue.Queue):
+            def put(self, item, *args, **kwargs):
+                if isinstance(item, plan.JournalEntry):
+                    put_threads.add(threading.current_thread())
+                super().put(item, *args, **kwargs)
+
+        mocker.patch.object(plan.queue, "Queue", RecordingQueue)
+
+        def create_evaluator(test):
+            evaluator = create_mock_evaluator(mocker, test)
+            result = evaluator.run.return_value
+
+            async def arun():
+                loop_threads.add(threading.current_thread())
+                return result
+
+            evaluator.arun = arun
+            return evaluator
+
+        mocker.patch.object(
+            plan_fixture, "_create_evaluator", side_effect=create_evaluator
+        )
+
+        entries = list(plan_fixture.iter_results(num_threads=1, engine="asyncio"))
+
+        assert len(entries) == 3
+        # results are handed over without blocking the event loop
+        assert put_threads
+        assert not put_threads & loop_threads
+
+    def test_aiter_results_executor(self, mocker, plan_fixture):
+        mocker.patch.object(plan, "create_markdown_summary")
+        mocker.patch.object(plan, "create_latency_summary")
+        mocker.patch.object(plan, "close_async_boto3_clients")
+        worker_threads = []
+
+        def create_evaluator(test):
+            evaluator = create_mock_evaluator(mocker, test)
+            result = evaluator.run.return_value
+
+            async def arun():
+                worker_threads.append(await to_thread(threading.current_thread))
+                return result
+
+            evaluator.arun = arun
+            return evaluator
+
+        mocker.patch.object(
+            plan_fixture, "_create_evaluator", side_effect=create_evaluator
+        )
+
+        async def collect():
+            loop = asyncio.get_running_loop()
+            with concurrent.futures.ThreadPoolExecutor(
+                thread_name_prefix="caller"
+            ) as executor:
+                loop.set_default_executor(executor)
+                async for _ in plan_fixture.aiter_results(num_threads=2):
+                    pass
+                return await loop.run_in_executor(None, threading.current_thread)
+
+        # the default executor of the caller's event loop is left unchanged
+        assert asyncio.run(collect()).name.startswith("caller")
+        # blocking calls made by the tests run in the plan's own threads
+        assert len(worker_threads) == 3
+        assert not any(thread.name.startswith("caller") for thread in worker_threads)
+
+    def test_run_sinks(self, mocker, work_dir, plan_fixture):
+        mocker.patch.object(plan, "create_markdown_summary")
+        mocker.patch.object(plan, "create_latency_summary")
+        mocker.patch.object(
+            plan_fixture,
+            "_create_evaluator",
+            side_effect=lambda test: create_mock_evaluator(mocker, test),
+        )
+        plan_fixture.config = {
+            **plan_fixture.config,
+            "sinks": [{"type": "jsonl", "buffer_size": 100}],
+        }
+
+        plan_fixture.run(num_threads=1, filter="test_1")
+        plan_fixture.run(num_threads=1, resume=True)
+
+        # the results of resumed tests are written first
+        lines = (work_dir / "agenteval_results.jsonl").read_text().splitlines()
+        assert [json.loads(line)["test_name"] for line in lines] == [
+            "test_1",
+            "test_2",
+            "test_3",
+        ]
+        assert all(json.loads(line)["duration"] > 0 for line in lines)
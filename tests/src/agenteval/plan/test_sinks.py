@@ -0,0 +1,131 @@
+import json
+import xml.etree.ElementTree as ElementTree
+
+import pytest
+
+# test results are validated against the conversation class imported by the package
+from agenteval.conversation import Conversation
+from src.agenteval.plan import journal, sinks
+from src.agenteval.test import Test, TestResult
+
+
+def create_entry(test_name, passed=True, reasoning="reasoning"):
+    conversation = Conversation()
+    conversation.add_turn("user message", "agent <response> & more")
+    test = Test(
+        name=test_name,
+        steps=["step 1"],
+        expected_results=["result 1"],
+        initial_prompt=None,
+        max_turns=2,
+        hook=None,
+    )
+    entry = journal.JournalEntry(
+        result=TestResult(
+            test_name=test_name,
+            result="All expected results are observed" if passed else "Failed",
+            reasoning=reasoning,
+            passed=passed,
+            conversation=conversation,
+        ),
+        input_token_count=10,
+        output_token_count=5,
+        duration=1.5,
+    )
+    return test, entry
+
+
+def test_junit_sink(tmp_path):
+    sink = sinks.JUnitSink(str(tmp_path), buffer_size=1)
+
+    # the file is a complete document before any results are written
+    suite = ElementTree.parse(sink.path).getroot().find("testsuite")
+    assert suite.get("tests") == "0"
+
+    sink.write(*create_entry("test_1"))
+    sink.write(*create_entry("test_2", passed=False, reasoning="bad \x07 output"))
+
+    suite = ElementTree.parse(sink.path).getroot().find("testsuite")
+    assert suite.get("tests") == "2"
+    assert suite.get("failures") == "1"
+    assert suite.get("time") == "3.000"
+
+    test_1, test_2 = suite.findall("testcase")
+    assert test_1.get("name") == "test_1"
+    assert test_1.find("failure") is None
+    assert test_1.find("system-out").text == (
+        "[USER] user message\n[AGENT] agent <response> & more"
+    )
+    assert test_2.find("failure").get("message") == "Failed"
+    assert test_2.find("failure").text == "bad  output"
+
+    sink.close()
+
+    assert len(ElementTree.parse(sink.path).getroot().find("testsuite")) == 2
+
+
+def test_junit_sink_escapes_attributes(tmp_path):
+    sink = sinks.JUnitSink(str(tmp_path), buffer_size=1)
+    test, entry = create_entry("test \"1\" <'a'> & b", passed=False)
+    entry.result.result = "line 1\nline 2\t<done>"
+
+    sink.write(test, entry)
+    sink.close()
+
+    test_case = ElementTree.parse(sink.path).getroot().find("testsuite/testcase")
+    assert test_case.get("name") == "test \"1\" <'a'> & b"
+    assert test_case.find("failure").get("message") == "line 1\nline 2\t<done>"
+
+
+def test_jsonl_sink_buffers(tmp_path):
+    sink = sinks.JSONLSink(str(tmp_path), path="results/results.jsonl", buffer_size=2)
+
+    sink.write(*create_entry("test_1"))
+
+    assert (tmp_path / "results" / "results.jsonl").read_text() == ""
+
+    sink.write(*create_entry("test_2"))
+    sink.write(*create_entry("test_3"))
+
+    assert len((tmp_path / "results" / "results.jsonl").read_text().splitlines()) == 2
+
+    sink.close()
+
+    records = [
+        json.loads(line)
+        for line in (tmp_path / "results" / "results.jsonl").read_text().splitlines()
+    ]
+    assert [record["test_name"] for record in records] == ["test_1", "test_2", "test_3"]
+    assert records[0]["passed"] is True
+    assert records[0]["input_token_count"] == 10
+    assert records[0]["duration"] == 1.5
+    assert records[0]["conversation"] == [
+        ["USER", "user message"],
+        ["AGENT", "agent <response> & more"],
+    ]
+
+
+def test_invalid_buffer_size(tmp_path):
+    with pytest.raises(ValueError):
+        sinks.JSONLSink(str(tmp_path), buffer_size=0)
+
+
+def test_create_sink(mocker, tmp_path):
+    sink = sinks.create_sink({"type": "junit", "path": "junit.xml"}, str(tmp_path))
+
+    assert isinstance(sink, sinks.JUnitSink)
+    assert sink.path == str(tmp_path / "junit.xml")
+    sink.close()
+
+    mock_import_class = mocker.patch.object(sinks, "import_class")
+
+    sink = sinks.create_sink(
+        {"type": "my_sink.MySink", "parameter": "value"}, str(tmp_path)
+    )
+
+    mock_import_class.assert_called_once_with(
+        "my_sink.MySink", parent_class=sinks.BaseSink
+    )
+    mock_import_class.return_value.assert_called_once_with(
+        work_dir=str(tmp_path), parameter="value"
+    )
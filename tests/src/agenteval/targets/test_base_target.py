@@ -0,0 +1,14 @@
+import asyncio
+
+from src.agenteval.targets import base_target
+
+
+class MyTarget(base_target.BaseTarget):
+    def invoke(self, prompt):
+        return base_target.TargetResponse(response=f"response to {prompt}")
+
+
+def test_ainvoke():
+    response = asyncio.run(MyTarget().ainvoke("test prompt"))
+
+    assert response.response == "response to test prompt"
@@ -0,0 +1,105 @@
+import asyncio
+import gzip
+
+import pytest
+
+from src.agenteval.targets import base_target, cassette
+
+
+class MyTarget(base_target.BaseTarget):
+    def __init__(self):
+        self.prompts = []
+
+    def invoke(self, prompt):
+        self.prompts.append(prompt)
+        return base_target.TargetResponse(
+            response=f"response {len(self.prompts)}", data={"prompt": prompt}
+        )
+
+
+@pytest.fixture
+def cassette_path(tmp_path):
+    return str(tmp_path / "cassette.jsonl")
+
+
+class TestCassette:
+    def test_record_and_replay(self, cassette_path):
+        recording = cassette.Cassette(cassette_path)
+        target = cassette.RecordingTarget(MyTarget(), recording, "test_1")
+
+        target.invoke("hello")
+        target.invoke("hello")
+        recording.save()
+
+        replay = cassette.ReplayTarget(cassette.Cassette.load(cassette_path), "test_1")
+
+        assert replay.invoke("hello").response == "response 1"
+        response = replay.invoke("hello")
+        assert response.response == "response 2"
+        assert response.data == {"prompt": "hello"}
+
+    def test_replay_miss(self, cassette_path):
+        recording = cassette.Cassette(cassette_path)
+        cassette.RecordingTarget(MyTarget(), recording, "test_1").invoke("hello")
+
+        with pytest.raises(cassette.CassetteMissError):
+            cassette.ReplayTarget(recording, "test_1").invoke("goodbye")
+
+        with pytest.raises(cassette.CassetteMissError):
+            cassette.ReplayTarget(recording, "test_2").invoke("hello")
+
+    def test_save_merges_existing_cassette(self, cassette_path):
+        first = cassette.Cassette(cassette_path)
+        cassette.RecordingTarget(MyTarget(), first, "test_1").invoke("hello")
+        test_2 = cassette.RecordingTarget(MyTarget(), first, "test_2")
+        test_2.invoke("hello")
+        test_2.invoke("again")
+        first.save()
+
+        # a later run which only records test_2
+        second = cassette.Cassette(cassette_path)
+        target = MyTarget()
+        target.prompts = ["earlier prompt"]
+        cassette.RecordingTarget(target, second, "test_2").invoke("goodbye")
+        second.save()
+
+        loaded = cassette.Cassette.load(cassette_path)
+
+        # the responses of other tests are kept, and those of re-recorded tests replaced
+        assert len(loaded) == 2
+        assert cassette.ReplayTarget(loaded, "test_1").invoke("hello").response == (
+            "response 1"
+        )
+        assert cassette.ReplayTarget(loaded, "test_2").invoke("goodbye").response == (
+            "response 2"
+        )
+
+    def test_arecord_and_areplay(self, cassette_path):
+        recording = cassette.Cassette(cassette_path)
+        inner = MyTarget()
+        target = cassette.RecordingTarget(inner, recording, "test_1")
+
+        asyncio.run(target.ainvoke("hello"))
+
+        replay = cassette.ReplayTarget(recording, "test_1")
+
+        assert asyncio.run(replay.ainvoke("hello")).response == "response 1"
+        assert inner.prompts == ["hello"]
+
+    def test_save_compressed(self, tmp_path):
+        path = str(tmp_path / "cassette.jsonl.gz")
+        recording = cassette.Cassette(path)
+        cassette.RecordingTarget(MyTarget(), recording, "test_1").invoke("hello")
+        recording.save()
+
+        with gzip.open(path, "rt") as f:
+            assert len(f.readlines()) == 1
+
+        assert len(cassette.Cassette.load(path)) == 1
+
+    def test_target_name(self, cassette_path):
+        recording = cassette.Cassette(cassette_path)
+
+        assert cassette.RecordingTarget(MyTarget(), recording, "test_1").target_name == "MyTarget"
+        assert cassette.ReplayTarget(recording, "test_1", "MyTarget").target_name == "MyTarget"
+        assert cassette.ReplayTarget(recording, "test_1").target_name == "ReplayTarget"
@@ -50,3 +50,45 @@ class TestTargetFactory:
         )
 
         assert cls == mock_import_class.return_value
+
+    def test_create_with_max_concurrency(self, mocker, target_factory_fixture):
+        target_factory_fixture = target_factory.TargetFactory(
+            config={**target_factory_fixture.config, "max_concurrency": 2}
+        )
+        spy_target_cls = mocker.patch.object(
+            target_factory, target_factory._TARGET_MAP["bedrock-agent"].__name__
+        )
+        mocker.patch.object(
+            target_factory_fixture, "_get_target_class", return_value=spy_target_cls
+        )
+
+        target_factory_fixture.create()
+
+        spy_target_cls.assert_called_once_with(
+            bedrock_agent_id="test-agent-id",
+            bedrock_agent_alias_id="test-alias-id",
+            aws_region="us-west-2",
+        )
+        assert target_factory_fixture.concurrency_limiter.max_concurrency == 2
+
+    def test_concurrency_limiter_not_configured(self, target_factory_fixture):
+        assert target_factory_fixture.concurrency_limiter is None
+
+    def test_create_with_version(self, mocker, target_factory_fixture):
+        target_factory_fixture = target_factory.TargetFactory(
+            config={**target_factory_fixture.config, "version": "3"}
+        )
+        spy_target_cls = mocker.patch.object(
+            target_factory, target_factory._TARGET_MAP["bedrock-agent"].__name__
+        )
+        mocker.patch.object(
+            target_factory_fixture, "_get_target_class", return_value=spy_target_cls
+        )
+
+        target_factory_fixture.create()
+
+        spy_target_cls.assert_called_once_with(
+            bedrock_agent_id="test-agent-id",
+            bedrock_agent_alias_id="test-alias-id",
+            aws_region="us-west-2",
+        )
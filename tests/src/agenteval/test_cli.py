@@ -1,4 +1,5 @@
 import yaml
+import pytest
 from click.testing import CliRunner
 
 from src.agenteval import cli
@@ -30,11 +31,74 @@ def test_run(mocker):
     result = runner.invoke(cli.cli, ["run"])
 
     mock_run.assert_called_once_with(
-        verbose=False, num_threads=None, work_dir=None, filter=None
+        verbose=False, num_threads=None, work_dir=None, filter=None,
+        engine="threads",
+        adaptive_concurrency=False,
+        use_cache=True,
+        refresh_cache=False,
+        record_cassette=None,
+        replay_cassette=None,
+        profiler=None,
+        resume=False,
+        rerun=None,
+        last_failed=False,
+        failed_first=False,
     )
     assert result.exit_code == 0
 
 
+def test_run_asyncio_engine(mocker):
+    mock_plan = mocker.patch.object(cli.Plan, "load")
+
+    mock_run = mocker.patch.object(mock_plan.return_value, "run")
+
+    result = runner.invoke(cli.cli, ["run", "--engine", "asyncio"])
+
+    mock_run.assert_called_once_with(
+        verbose=False, num_threads=None, work_dir=None, filter=None,
+        engine="asyncio",
+        adaptive_concurrency=False,
+        use_cache=True,
+        refresh_cache=False,
+        record_cassette=None,
+        replay_cassette=None,
+        profiler=None,
+        resume=False,
+        rerun=None,
+        last_failed=False,
+        failed_first=False,
+    )
+    assert result.exit_code == 0
+
+
+def test_run_replay_cassette(mocker):
+    mock_plan = mocker.patch.object(cli.Plan, "load")
+
+    mock_run = mocker.patch.object(mock_plan.return_value, "run")
+
+    result = runner.invoke(cli.cli, ["run", "--replay-cassette", "cassette.jsonl"])
+
+    assert mock_run.call_args.kwargs["replay_cassette"] == "cassette.jsonl"
+    assert mock_run.call_args.kwargs["record_cassette"] is None
+    assert result.exit_code == 0
+
+
+def test_run_profile(mocker, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    mock_plan = mocker.patch.object(cli.Plan, "load")
+    mock_run = mocker.patch.object(mock_plan.return_value, "run")
+    mock_run.side_effect = [TestFailureError]
+    mock_log_profile = mocker.patch.object(cli, "log_profile")
+
+    result = runner.invoke(cli.cli, ["run", "--profile"])
+
+    profiler = mock_run.call_args.kwargs["profiler"]
+    assert "load" in profiler.phase_timings
+    assert (tmp_path / cli._PROFILE_FILE_NAME).exists()
+    mock_log_profile.assert_called_once()
+    assert result.exit_code == cli.ExitCode.TESTS_FAILED.value
+
+
 def test_run_tests_failed(mocker):
     mock_plan = mocker.patch.object(cli.Plan, "load")
     mock_run = mocker.patch.object(mock_plan.return_value, "run")
@@ -42,3 +106,42 @@ def test_run_tests_failed(mocker):
 
     result = runner.invoke(cli.cli, ["run"])
     assert result.exit_code == cli.ExitCode.TESTS_FAILED.value
+
+
+def test_run_resume(mocker):
+    mock_plan = mocker.patch.object(cli.Plan, "load")
+    mock_run = mocker.patch.object(mock_plan.return_value, "run")
+
+    result = runner.invoke(cli.cli, ["run", "--resume"])
+
+    assert mock_run.call_args.kwargs["resume"] is True
+    assert result.exit_code == 0
+
+
+@pytest.mark.parametrize(
+    "args,expected",
+    [
+        (["--changed-only"], "changed"),
+        (["--rerun-failed"], "failed"),
+        (["--changed-only", "--rerun-failed"], "failed"),
+    ],
+)
+def test_run_rerun(mocker, args, expected):
+    mock_plan = mocker.patch.object(cli.Plan, "load")
+    mock_run = mocker.patch.object(mock_plan.return_value, "run")
+
+    result = runner.invoke(cli.cli, ["run", *args])
+
+    assert mock_run.call_args.kwargs["rerun"] == expected
+    assert result.exit_code == 0
+
+
+def test_run_last_failed(mocker):
+    mock_plan = mocker.patch.object(cli.Plan, "load")
+    mock_run = mocker.patch.object(mock_plan.return_value, "run")
+
+    result = runner.invoke(cli.cli, ["run", "--last-failed", "--failed-first"])
+
+    assert mock_run.call_args.kwargs["last_failed"] is True
+    assert mock_run.call_args.kwargs["failed_first"] is True
+    assert result.exit_code == 0
@@ -13,3 +13,19 @@ import pytest
 def test_calculate_pass_rate_metric(pass_count, num_tests, expected):
     pass_rate = metrics.calculate_pass_rate_metric(pass_count, num_tests)
     assert pass_rate == expected
+
+
+def test_calculate_latency_percentiles():
+    latencies = metrics.calculate_latency_percentiles(
+        {"step": [float(i) for i in range(100, 0, -1)], "empty": []}
+    )
+
+    assert latencies == {
+        "step": {"count": 100, "total": 5050.0, "p50": 50.0, "p95": 95.0, "p99": 99.0}
+    }
+
+
+def test_calculate_latency_percentiles_single_duration():
+    latencies = metrics.calculate_latency_percentiles({"step": [0.5]})
+
+    assert latencies["step"]["p50"] == latencies["step"]["p99"] == 0.5
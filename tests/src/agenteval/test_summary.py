@@ -1,27 +1,111 @@
-from src.agenteval import summary
+import json
 import os
 
+# test results are validated against the conversation class imported by the package
+from agenteval.conversation import Conversation
+from src.agenteval import summary
+from src.agenteval.test import Test, TestResult
+
 
 def test_create_markdown_summary(mocker):
     mock_get_template = mocker.patch.object(summary.jinja_env, "get_template")
-    mock_render = mocker.patch.object(mock_get_template.return_value, "render")
+    mock_stream = mocker.patch.object(mock_get_template.return_value, "stream")
     mock_calculate_pass_rate_metric = mocker.patch.object(
         summary, "calculate_pass_rate_metric"
     )
-    mock_write_summary = mocker.patch.object(summary, "_write_summary")
 
     summary.create_markdown_summary("test-work-dir", 10, 10, [], [])
 
     mock_get_template.assert_called_once_with(
         os.path.join(summary._TEMPLATE_ROOT, summary._TEMPLATE_FILE_NAME)
     )
-    mock_render.assert_called_once_with(
+    mock_stream.assert_called_once_with(
         tests=[],
         results=[],
+        statuses={},
+        pages_dir=None,
         zip=zip,
         metrics={"pass_rate": mock_calculate_pass_rate_metric.return_value},
     )
-    mock_write_summary.assert_called_once_with(
+    mock_stream.return_value.dump.assert_called_once_with(
         os.path.join("test-work-dir", os.path.splitext(summary._TEMPLATE_FILE_NAME)[0]),
-        mock_render.return_value,
+        encoding="utf-8",
+    )
+
+
+def create_tests_and_results():
+    conversation = Conversation()
+    conversation.add_turn("user message", "agent message")
+    tests = [
+        Test(
+            name=name,
+            steps=["step"],
+            expected_results=["expected result"],
+            initial_prompt=None,
+            max_turns=2,
+            hook=None,
+        )
+        for name in ["test 1", "test_2"]
+    ]
+    results = [
+        TestResult(
+            test_name=test.name,
+            result=f"{test.name} result",
+            reasoning="reasoning",
+            passed=test.name == "test 1",
+            conversation=conversation,
+        )
+        for test in tests
+    ]
+    return tests, results
+
+
+def test_create_markdown_summary_from_iterator(tmp_path):
+    tests, results = create_tests_and_results()
+
+    summary.create_markdown_summary(
+        str(tmp_path),
+        1,
+        2,
+        tests,
+        iter(results),
+        {"test 1": True, "test_2": False},
     )
+
+    with open(tmp_path / "agenteval_summary.md", encoding="utf-8") as f:
+        rendered = f.read()
+    assert "- [🟢 test 1](#test-1)" in rendered
+    assert "- [🔴 test_2](#test_2)" in rendered
+    assert "[AGENT] agent message" in rendered
+    assert "test 1 result" in rendered
+    assert "test_2 result" in rendered
+    assert not (tmp_path / summary._PAGES_DIR_NAME).exists()
+
+
+def test_create_markdown_summary_split(tmp_path):
+    tests, results = create_tests_and_results()
+
+    summary.create_markdown_summary(str(tmp_path), 1, 2, tests, results, split=True)
+
+    with open(tmp_path / "agenteval_summary.md", encoding="utf-8") as f:
+        index = f.read()
+    assert "- [🟢 test 1](agenteval_summary/test%201.md)" in index
+    assert "- [🔴 test_2](agenteval_summary/test_2.md)" in index
+    assert "[AGENT] agent message" not in index
+
+    for test in tests:
+        with open(
+            tmp_path / summary._PAGES_DIR_NAME / f"{test.name}.md", encoding="utf-8"
+        ) as f:
+            page = f.read()
+        assert f"{test.name} result" in page
+        assert "[AGENT] agent message" in page
+
+
+def test_create_latency_summary(tmp_path):
+    latencies = {"_invoke_target": {"count": 1, "total": 1.0, "p50": 1.0}}
+
+    summary.create_latency_summary(str(tmp_path), latencies)
+
+    with open(tmp_path / summary._LATENCY_FILE_NAME) as f:
+        assert json.load(f) == latencies
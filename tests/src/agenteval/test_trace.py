@@ -1,3 +1,5 @@
+import time
+
 from src.agenteval import trace
 import pytest
 
@@ -47,3 +49,181 @@ class TestTrace:
         trace_fixture._dump_trace()
 
         assert (tmp_path / "test_dir" / "my_test.json").exists()
+
+    def test_init_unsupported_format(self):
+        with pytest.raises(ValueError):
+            trace.Trace("my_test", "test_dir", format="xml")
+
+    def test_jsonl_trace(self, tmp_path):
+        jsonl_trace = trace.Trace("my_test", str(tmp_path), format="jsonl")
+
+        with jsonl_trace:
+            jsonl_trace.add_step(step_name="step 1", data="test data")
+            jsonl_trace.add_step(step_name="step 2")
+
+        assert jsonl_trace.steps == []
+
+        with open(jsonl_trace.path) as f:
+            assert len(f.readlines()) == 4
+
+        result = trace.read_trace(jsonl_trace.path)
+
+        assert result["test_name"] == "my_test"
+        assert result["start_time"] == str(jsonl_trace.start_time)
+        assert result["end_time"] == str(jsonl_trace.end_time)
+        assert [step["step_name"] for step in result["steps"]] == ["step 1", "step 2"]
+        assert result["steps"][0]["data"] == "test data"
+
+    def test_read_unfinished_jsonl_trace(self, tmp_path):
+        jsonl_trace = trace.Trace(
+            "my_test", str(tmp_path), format="jsonl", flush_interval=0
+        )
+        jsonl_trace.__enter__()
+        jsonl_trace.add_step(step_name="step 1")
+
+        with open(jsonl_trace.path, "a") as f:
+            f.write('{"event": "st')
+
+        result = trace.read_trace(jsonl_trace.path)
+
+        assert result["end_time"] is None
+        assert len(result["steps"]) == 1
+
+        jsonl_trace._file.close()
+
+    def _read_steps(self, jsonl_trace):
+        return trace.read_trace(jsonl_trace.path)["steps"]
+
+    def test_jsonl_trace_flush_interval(self, tmp_path):
+        jsonl_trace = trace.Trace(
+            "my_test", str(tmp_path), format="jsonl", flush_interval=0.05
+        )
+
+        with jsonl_trace:
+            jsonl_trace.add_step(step_name="step 1")
+
+            assert self._read_steps(jsonl_trace) == []
+
+            # the step is flushed once the interval has passed, without another step
+            deadline = time.monotonic() + 2
+            while not self._read_steps(jsonl_trace) and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            assert len(self._read_steps(jsonl_trace)) == 1
+
+    def test_jsonl_trace_without_flush_interval(self, tmp_path):
+        jsonl_trace = trace.Trace(
+            "my_test", str(tmp_path), format="jsonl", flush_interval=0
+        )
+
+        with jsonl_trace:
+            jsonl_trace.add_step(step_name="step 1")
+            jsonl_trace.add_step(step_name="step 2")
+
+            assert len(self._read_steps(jsonl_trace)) == 2
+            assert jsonl_trace._flush_timer is None
+
+    def test_jsonl_trace_flush(self, tmp_path):
+        jsonl_trace = trace.Trace(
+            "my_test", str(tmp_path), format="jsonl", flush_interval=60
+        )
+
+        with jsonl_trace:
+            jsonl_trace.add_step(step_name="step 1")
+            jsonl_trace.flush()
+
+            assert len(self._read_steps(jsonl_trace)) == 1
+
+        # flushing a closed trace has no effect
+        jsonl_trace.flush()
+
+    def test_add_step_to_closed_jsonl_trace(self, tmp_path):
+        jsonl_trace = trace.Trace("my_test", str(tmp_path), format="jsonl")
+
+        with jsonl_trace:
+            jsonl_trace.add_step(step_name="step 1")
+
+        with pytest.raises(RuntimeError):
+            jsonl_trace.add_step(step_name="step 2")
+
+        # the finished trace is left intact
+        result = trace.read_trace(jsonl_trace.path)
+        assert result["end_time"] == str(jsonl_trace.end_time)
+        assert [step["step_name"] for step in result["steps"]] == ["step 1"]
+
+    def test_read_json_trace(self, tmp_path):
+        json_trace = trace.Trace("my_test", str(tmp_path))
+
+        with json_trace:
+            json_trace.add_step(step_name="step 1")
+
+        assert trace.read_trace(json_trace.path)["steps"][0]["step_name"] == "step 1"
+
+    def test_init_unsupported_compression(self):
+        with pytest.raises(ValueError):
+            trace.Trace("my_test", "test_dir", compression="bz2")
+
+    def test_init_unsupported_retention(self):
+        with pytest.raises(ValueError):
+            trace.Trace("my_test", "test_dir", retention={"prompt": "summarize"})
+
+    def test_init_zstd_not_installed(self, mocker):
+        mocker.patch.object(trace, "find_spec", return_value=None)
+
+        with pytest.raises(ImportError):
+            trace.Trace("my_test", "test_dir", compression="zstd")
+
+    @pytest.mark.parametrize("format", trace.TRACE_FORMATS)
+    def test_gzip_compression(self, tmp_path, format):
+        compressed_trace = trace.Trace(
+            "my_test", str(tmp_path), format=format, compression="gzip"
+        )
+
+        with compressed_trace:
+            compressed_trace.add_step(step_name="step 1", data={"key": "value"})
+
+        assert compressed_trace.path.endswith(f"my_test.{format}.gz")
+
+        steps = trace.read_trace(compressed_trace.path)["steps"]
+
+        assert steps[0]["data"] == {"key": "value"}
+
+    def test_add_step_retention(self, trace_fixture):
+        trace_fixture._retention = {
+            "prompt": 5,
+            "system_prompt": "hash",
+            "bedrock_agent_trace": "drop",
+            "reasoning": "full",
+        }
+
+        trace_fixture.add_step(
+            step_name="test step",
+            prompt="a long prompt",
+            system_prompt="a system prompt",
+            reasoning="some reasoning",
+            data={"bedrock_agent_trace": [{"key": "value"}], "other": "value"},
+        )
+
+        step = trace_fixture.steps[0]
+
+        assert step["prompt"] == "a lon"
+        assert step["system_prompt"] == (
+            "sha256:" + trace.hashlib.sha256(b"a system prompt").hexdigest()
+        )
+        assert step["reasoning"] == "some reasoning"
+        assert step["data"] == {"other": "value"}
+
+    def test_add_step_started_at(self, trace_fixture):
+        trace_fixture.add_step(step_name="test step", started_at=time.monotonic())
+
+        step = trace_fixture.steps[0]
+
+        assert step["duration"] >= 0
+        assert trace_fixture.durations == {"test step": [step["duration"]]}
+
+    def test_timer(self, trace_fixture):
+        with trace_fixture.timer("hook"):
+            pass
+
+        assert len(trace_fixture.durations["hook"]) == 1
+        assert trace_fixture.steps == []
@@ -1,3 +1,7 @@
+import asyncio
+
+import pytest
+
 from src.agenteval.utils import aws
 
 
@@ -16,6 +20,7 @@ def test_create_boto3_client(mocker):
 
     mock_config.assert_called_once_with(
         retries={"max_attempts": 10, "mode": aws._RETRY_MODE},
+        max_pool_connections=aws._max_pool_connections,
     )
 
     mock_session.assert_called_once_with(
@@ -25,3 +30,106 @@ def test_create_boto3_client(mocker):
     mock_client.assert_called_once_with(
         "test-service-name", endpoint_url=None, config=mock_config.return_value
     )
+
+
+def test_create_boto3_client_cached(mocker):
+    mock_session = mocker.patch.object(aws.boto3, "Session")
+
+    args = {
+        "boto3_service_name": "test-service-name",
+        "aws_profile": "test-profile",
+        "aws_region": "us-west-2",
+        "endpoint_url": None,
+        "max_retry": 10,
+    }
+
+    client = aws.create_boto3_client(**args)
+
+    assert aws.create_boto3_client(**args) is client
+    mock_session.assert_called_once()
+
+    aws.create_boto3_client(**{**args, "aws_region": "us-east-1"})
+
+    assert mock_session.call_count == 2
+
+
+def test_configure_boto3_client_pool(mocker):
+    mock_config = mocker.patch.object(aws, "Config")
+    mocker.patch.object(aws.boto3, "Session")
+    mocker.patch.object(aws, "_max_pool_connections", 10)
+
+    args = {
+        "boto3_service_name": "test-service-name",
+        "aws_profile": None,
+        "aws_region": None,
+        "endpoint_url": None,
+        "max_retry": 10,
+    }
+
+    aws.create_boto3_client(**args)
+    aws.configure_boto3_client_pool(max_pool_connections=10)
+    aws.create_boto3_client(**args)
+
+    assert mock_config.call_count == 1
+
+    aws.configure_boto3_client_pool(max_pool_connections=45)
+    aws.create_boto3_client(**args)
+
+    assert mock_config.call_count == 2
+    assert mock_config.call_args.kwargs["max_pool_connections"] == 45
+
+
+def test_create_async_boto3_client_cached(mocker):
+    mock_create = mocker.patch.object(aws, "_create_async_boto3_client")
+
+    args = {
+        "boto3_service_name": "test-service-name",
+        "aws_profile": None,
+        "aws_region": "us-west-2",
+        "endpoint_url": None,
+        "max_retry": 10,
+    }
+
+    async def create_clients():
+        clients = await asyncio.gather(
+            aws.create_async_boto3_client(**args),
+            aws.create_async_boto3_client(**args),
+        )
+        await aws.close_async_boto3_clients()
+        return clients
+
+    first, second = asyncio.run(create_clients())
+
+    assert first is second
+    mock_create.assert_awaited_once_with("test-service-name", None, "us-west-2", None, 10)
+    first.close.assert_awaited_once()
+    assert aws._async_client_pool == {}
+
+
+def test_create_async_boto3_client_retries_after_failure(mocker):
+    mock_create = mocker.patch.object(
+        aws,
+        "_create_async_boto3_client",
+        side_effect=[RuntimeError("expired credentials"), mocker.AsyncMock()],
+    )
+
+    args = {
+        "boto3_service_name": "test-service-name",
+        "aws_profile": None,
+        "aws_region": "us-west-2",
+        "endpoint_url": None,
+        "max_retry": 10,
+    }
+
+    async def create_clients():
+        with pytest.raises(RuntimeError):
+            await aws.create_async_boto3_client(**args)
+        # the failed creation is not cached
+        client = await aws.create_async_boto3_client(**args)
+        await aws.close_async_boto3_clients()
+        return client
+
+    client = asyncio.run(create_clients())
+
+    assert mock_create.await_count == 2
+    client.close.assert_awaited_once()
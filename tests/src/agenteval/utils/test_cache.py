@@ -0,0 +1,100 @@
+import os
+import time
+
+import pytest
+
+from src.agenteval.utils import cache
+
+
+@pytest.fixture
+def cache_fixture(tmp_path):
+    return cache.CompletionCache(cache_dir=str(tmp_path))
+
+
+def test_make_key():
+    key = cache.CompletionCache.make_key("model", "body")
+
+    assert key == cache.CompletionCache.make_key("model", "body")
+    assert key != cache.CompletionCache.make_key("mod", "elbody")
+
+
+def test_put_get(cache_fixture):
+    key = cache.CompletionCache.make_key("model", "body")
+
+    assert cache_fixture.get(key) is None
+
+    cache_fixture.put(key, {"completion": "test completion"})
+
+    assert cache_fixture.get(key) == {"completion": "test completion"}
+
+
+def test_refresh(tmp_path):
+    key = cache.CompletionCache.make_key("model", "body")
+    cache.CompletionCache(cache_dir=str(tmp_path)).put(key, {"completion": "old"})
+
+    refreshed = cache.CompletionCache(cache_dir=str(tmp_path), refresh=True)
+
+    assert refreshed.get(key) is None
+
+    refreshed.put(key, {"completion": "new"})
+
+    assert cache.CompletionCache(cache_dir=str(tmp_path)).get(key) == {
+        "completion": "new"
+    }
+
+
+def test_ttl(tmp_path):
+    cache_fixture = cache.CompletionCache(cache_dir=str(tmp_path), ttl_days=1)
+    key = cache.CompletionCache.make_key("model", "body")
+    cache_fixture.put(key, {"completion": "test completion"})
+
+    path = cache_fixture._get_path(key)
+    two_days_ago = time.time() - 2 * 24 * 60 * 60
+    os.utime(path, (two_days_ago, two_days_ago))
+
+    assert cache_fixture.get(key) is None
+
+    cache_fixture.evict()
+
+    assert not os.path.exists(path)
+
+
+def test_max_size(tmp_path):
+    entry = {"completion": "x" * 1000}
+    cache_fixture = cache.CompletionCache(
+        cache_dir=str(tmp_path), max_size_mb=2500 / (1024 * 1024)
+    )
+    keys = [cache.CompletionCache.make_key(str(i)) for i in range(3)]
+
+    for i, key in enumerate(keys):
+        cache_fixture.put(key, entry)
+        # make the order of writes deterministic
+        os.utime(cache_fixture._get_path(key), (i, time.time() - 10 + i))
+
+    # the oldest entry is evicted
+    assert cache_fixture.get(keys[0]) is None
+    assert cache_fixture.get(keys[1]) == entry
+    assert cache_fixture.get(keys[2]) == entry
+
+
+def test_max_size_evicts_least_recently_used(tmp_path):
+    entry = {"completion": "x" * 1000}
+    cache_fixture = cache.CompletionCache(
+        cache_dir=str(tmp_path), max_size_mb=2500 / (1024 * 1024)
+    )
+    keys = [cache.CompletionCache.make_key(str(i)) for i in range(3)]
+
+    for i, key in enumerate(keys[:2]):
+        cache_fixture.put(key, entry)
+        os.utime(cache_fixture._get_path(key), (time.time() - 10 + i,) * 2)
+    written_at = os.path.getmtime(cache_fixture._get_path(keys[0]))
+
+    # reading the first entry makes it the most recently used
+    assert cache_fixture.get(keys[0]) == entry
+    assert os.path.getmtime(cache_fixture._get_path(keys[0])) == written_at
+
+    cache_fixture.put(keys[2], entry)
+
+    assert cache_fixture.get(keys[0]) == entry
+    assert cache_fixture.get(keys[1]) is None
+    assert cache_fixture.get(keys[2]) == entry
@@ -0,0 +1,260 @@
+import asyncio
+import concurrent.futures
+import threading
+import time
+
+import pytest
+
+from src.agenteval.utils import concurrency
+
+
+def test_invalid_max_concurrency():
+    with pytest.raises(ValueError):
+        concurrency.ConcurrencyLimiter(0)
+
+
+def test_limits_threads():
+    limiter = concurrency.ConcurrencyLimiter(2)
+    lock = threading.Lock()
+    in_flight = []
+    max_in_flight = []
+
+    def call():
+        with limiter:
+            with lock:
+                in_flight.append(1)
+                max_in_flight.append(len(in_flight))
+            time.sleep(0.01)
+            with lock:
+                in_flight.pop()
+
+    threads = [threading.Thread(target=call) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(max_in_flight) == 2
+
+
+def test_limits_tasks():
+    limiter = concurrency.ConcurrencyLimiter(3)
+    in_flight = []
+    max_in_flight = []
+
+    async def call():
+        async with limiter:
+            in_flight.append(1)
+            max_in_flight.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.pop()
+
+    async def run():
+        await asyncio.gather(*(call() for _ in range(9)))
+
+    # the limiter can be reused by a new event loop
+    asyncio.run(run())
+    asyncio.run(run())
+
+    assert max(max_in_flight) == 3
+
+
+def _throttling_error():
+    return concurrency.ClientError(
+        {"Error": {"Code": "ThrottlingException", "Message": "Too many requests"}},
+        "InvokeModel",
+    )
+
+
+def test_adaptive_invalid_max_concurrency():
+    with pytest.raises(ValueError):
+        concurrency.AdaptiveConcurrencyLimiter(0)
+
+
+def test_adaptive_slow_start():
+    limiter = concurrency.AdaptiveConcurrencyLimiter(4)
+
+    assert limiter.limit == 1
+
+    for _ in range(5):
+        limiter.record_latency("evaluator", 1.0)
+
+    # grows by one per call until the maximum is reached
+    assert limiter.limit == 4
+
+
+def test_adaptive_decrease_then_additive_increase(mocker):
+    on_change = mocker.MagicMock()
+    limiter = concurrency.AdaptiveConcurrencyLimiter(
+        10, initial_concurrency=8, on_change=on_change
+    )
+
+    limiter.record_congestion()
+
+    assert limiter.limit == 4
+    on_change.assert_called_once_with(8, 4, concurrency.THROTTLING)
+
+    # grows by one after a full round-trip of successful calls
+    for _ in range(3):
+        limiter.record_latency("evaluator", 1.0)
+    assert limiter.limit == 4
+
+    limiter.record_latency("evaluator", 1.0)
+    assert limiter.limit == 5
+
+
+def test_adaptive_decrease_once_per_round_trip():
+    limiter = concurrency.AdaptiveConcurrencyLimiter(8, initial_concurrency=8)
+
+    for _ in range(3):
+        limiter.__enter__()
+
+    limiter.record_congestion()
+    limiter.record_congestion()
+    limiter.record_congestion()
+
+    # the calls in flight at the time of the first decrease are ignored
+    assert limiter.limit == 4
+
+    limiter.record_congestion()
+
+    assert limiter.limit == 2
+
+
+def test_adaptive_decrease_on_latency():
+    limiter = concurrency.AdaptiveConcurrencyLimiter(8, initial_concurrency=4)
+
+    limiter.record_latency("target", 10.0)
+    limiter.record_latency("evaluator", 1.0)
+
+    # latencies are compared to calls from the same source
+    assert limiter.limit == 6
+
+    limiter.record_latency("evaluator", 3.0)
+
+    assert limiter.limit == 3
+
+
+def test_adaptive_adapts_to_lasting_latency_increase(mocker):
+    on_change = mocker.MagicMock()
+    limiter = concurrency.AdaptiveConcurrencyLimiter(8, on_change=on_change)
+
+    for _ in range(10):
+        limiter.record_latency("evaluator", 0.1)
+    for _ in range(2000):
+        limiter.record_latency("evaluator", 0.3)
+
+    # slow calls are included in the moving average, so the limit recovers
+    assert limiter.limit == 8
+    assert limiter._latency_baselines["evaluator"] == pytest.approx(0.3)
+    assert (8, 4, concurrency.LATENCY) in [call.args for call in on_change.call_args_list]
+
+
+def test_adaptive_ignores_jitter_in_fast_calls():
+    limiter = concurrency.AdaptiveConcurrencyLimiter(8, initial_concurrency=8)
+
+    limiter.record_latency("evaluator", 0.0001)
+    limiter.record_latency("evaluator", 0.001)
+
+    assert limiter.limit == 8
+
+
+def test_adaptive_observe():
+    limiter = concurrency.AdaptiveConcurrencyLimiter(8, initial_concurrency=4)
+
+    with pytest.raises(concurrency.ClientError):
+        with limiter.observe("evaluator"):
+            raise _throttling_error()
+
+    assert limiter.limit == 2
+
+    for _ in range(2):
+        with limiter.observe("evaluator"):
+            pass
+
+    assert limiter.limit == 3
+
+    with pytest.raises(concurrency.ClientError):
+        with limiter.observe("evaluator"):
+            raise concurrency.ClientError(
+                {"Error": {"Code": "ValidationException", "Message": ""}},
+                "InvokeModel",
+            )
+
+    assert limiter.limit == 3
+
+
+def test_adaptive_limits_threads():
+    limiter = concurrency.AdaptiveConcurrencyLimiter(4, initial_concurrency=2)
+    lock = threading.Lock()
+    in_flight = []
+    max_in_flight = []
+
+    def call():
+        with limiter:
+            with lock:
+                in_flight.append(1)
+                max_in_flight.append(len(in_flight))
+            time.sleep(0.01)
+            with lock:
+                in_flight.pop()
+
+    threads = [threading.Thread(target=call) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(max_in_flight) == 2
+
+
+def test_adaptive_limits_tasks():
+    limiter = concurrency.AdaptiveConcurrencyLimiter(4)
+    max_in_flight = []
+
+    async def call():
+        async with limiter:
+            max_in_flight.append(limiter._in_flight)
+            await asyncio.sleep(0.01)
+
+    async def run():
+        await asyncio.gather(*(call() for _ in range(3)))
+
+        # waiting tasks are woken up when the limit increases
+        limiter.record_latency("evaluator", 1.0)
+        await asyncio.wait_for(
+            asyncio.gather(*(call() for _ in range(2))), timeout=1
+        )
+
+    asyncio.run(run())
+
+    assert max_in_flight[:3] == [1, 1, 1]
+    assert max(max_in_flight) == 2
+
+
+def test_is_throttling_error():
+    throttled = concurrency.ClientError({"Error": {"Code": "ThrottlingException"}}, "InvokeModel")
+    denied = concurrency.ClientError({"Error": {"Code": "AccessDeniedException"}}, "InvokeModel")
+
+    assert concurrency.is_throttling_error(throttled) is True
+    assert concurrency.is_throttling_error(denied) is False
+    assert concurrency.is_throttling_error(ValueError()) is False
+
+
+def test_to_thread_uses_executor():
+    async def run():
+        default_thread = await concurrency.to_thread(threading.current_thread)
+        with concurrent.futures.ThreadPoolExecutor(
+            thread_name_prefix="test"
+        ) as executor, concurrency.use_executor(executor):
+            # tasks created within the context also use the executor
+            threads = await asyncio.gather(
+                concurrency.to_thread(threading.current_thread),
+                asyncio.create_task(concurrency.to_thread(threading.current_thread)),
+            )
+        return default_thread, threads
+
+    default_thread, threads = asyncio.run(run())
+
+    assert not default_thread.name.startswith("test")
+    assert all(thread.name.startswith("test") for thread in threads)
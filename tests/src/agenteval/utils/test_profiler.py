@@ -0,0 +1,50 @@
+import threading
+import time
+
+from src.agenteval.utils import profiler
+
+
+def busy_wait(duration):
+    end = time.monotonic() + duration
+    while time.monotonic() < end:
+        pass
+
+
+def test_sampling_profiler(tmp_path):
+    sampling_profiler = profiler.SamplingProfiler(interval=0.001)
+    sampling_profiler.start()
+
+    with sampling_profiler.phase("setup"):
+        busy_wait(0.05)
+
+    def run_test():
+        with sampling_profiler.thread("evaluation;test_1"):
+            busy_wait(0.05)
+
+    with sampling_profiler.phase("evaluation", sample=False):
+        thread = threading.Thread(target=run_test)
+        thread.start()
+        thread.join()
+
+    sampling_profiler.stop()
+
+    path = tmp_path / "profile.folded"
+    sampling_profiler.write_folded(str(path))
+    stacks = path.read_text().splitlines()
+
+    assert any(stack.startswith("setup;") for stack in stacks)
+    assert any(stack.startswith("evaluation;test_1;") for stack in stacks)
+    # the main thread is not sampled while it waits for the test
+    assert not any(stack.startswith("evaluation;test_profiler") for stack in stacks)
+    assert all(stack.rsplit(" ", 1)[1].isdigit() for stack in stacks)
+
+    assert set(sampling_profiler.phase_timings) == {"setup", "evaluation"}
+    wall_time, cpu_time = sampling_profiler.phase_timings["setup"]
+    assert wall_time >= 0.05
+
+    hotspots = sampling_profiler.hotspots()
+    assert hotspots[0][0].startswith("busy_wait(test_profiler.py:")
+
+
+def test_hotspots_without_samples():
+    assert profiler.SamplingProfiler().hotspots() == []
@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from src.agenteval.utils import rate_limiter
+
+
+@pytest.fixture
+def clock(mocker):
+    now = [0.0]
+    mocker.patch.object(rate_limiter.time, "monotonic", side_effect=lambda: now[0])
+
+    def sleep(seconds):
+        now[0] += seconds
+
+    mocker.patch.object(rate_limiter.time, "sleep", side_effect=sleep)
+    return now
+
+
+class TestRateLimiter:
+    def test_acquire_requests(self, clock):
+        limiter = rate_limiter.RateLimiter(requests_per_minute=2)
+
+        limiter.acquire(100)
+        limiter.acquire(100)
+        assert clock[0] == 0.0
+
+        # the third request waits for one request to refill
+        limiter.acquire(100)
+        assert clock[0] == pytest.approx(30.0)
+
+    def test_acquire_tokens(self, clock):
+        limiter = rate_limiter.RateLimiter(tokens_per_minute=600)
+
+        limiter.acquire(600)
+        limiter.acquire(300)
+
+        assert clock[0] == pytest.approx(30.0)
+
+    def test_acquire_more_tokens_than_capacity(self, clock):
+        limiter = rate_limiter.RateLimiter(tokens_per_minute=600)
+
+        limiter.acquire(1000)
+
+        assert clock[0] == 0.0
+
+    def test_settle_refunds_unused_tokens(self, clock):
+        limiter = rate_limiter.RateLimiter(tokens_per_minute=600)
+
+        limiter.acquire(600)
+        limiter.settle(reserved_tokens=600, used_tokens=300)
+        limiter.acquire(300)
+
+        assert clock[0] == 0.0
+
+    def test_settle_charges_extra_tokens(self, clock):
+        limiter = rate_limiter.RateLimiter(tokens_per_minute=600)
+
+        limiter.acquire(300)
+        limiter.settle(reserved_tokens=300, used_tokens=600)
+        limiter.acquire(300)
+
+        assert clock[0] == pytest.approx(30.0)
+
+    def test_settle_more_tokens_than_capacity(self, clock):
+        limiter = rate_limiter.RateLimiter(tokens_per_minute=1000)
+
+        reserved_tokens = limiter.acquire(5000)
+        limiter.settle(reserved_tokens, used_tokens=2000)
+
+        assert reserved_tokens == 1000
+        # the bucket is 1000 tokens in debt, which takes two minutes to refill
+        limiter.acquire(1000)
+        assert clock[0] == pytest.approx(120.0)
+
+    def test_aacquire(self, mocker, clock):
+        limiter = rate_limiter.RateLimiter(requests_per_minute=1)
+        sleeps = []
+
+        async def sleep(seconds):
+            sleeps.append(seconds)
+            clock[0] += seconds
+
+        mocker.patch.object(rate_limiter.asyncio, "sleep", side_effect=sleep)
+
+        async def acquire():
+            await limiter.aacquire(1)
+            await limiter.aacquire(1)
+
+        asyncio.run(acquire())
+
+        assert sleeps == [pytest.approx(60.0)]
+
+    def test_unlimited(self, clock):
+        limiter = rate_limiter.RateLimiter()
+
+        for _ in range(100):
+            limiter.acquire(1000)
+        limiter.settle(1000, 2000)
+
+        assert clock[0] == 0.0
+
+
+def test_get_rate_limiter():
+    limiter = rate_limiter.get_rate_limiter("test-model", 10, 1000)
+
+    assert rate_limiter.get_rate_limiter("test-model", 10, 1000) is limiter
+    assert rate_limiter.get_rate_limiter("test-model", 20, 1000) is not limiter
+    assert rate_limiter.get_rate_limiter("other-model", 10, 1000) is not limiter
+
+
+def test_estimate_token_count():
+    assert rate_limiter.estimate_token_count("") == 0
+    assert rate_limiter.estimate_token_count("a" * 9) == 3
@@ -0,0 +1,70 @@
+import pytest
+from botocore.exceptions import ClientError
+
+from src.agenteval.utils import telemetry
+
+
+@pytest.fixture
+def otel_not_installed(mocker):
+    mocker.patch.object(telemetry, "otel_trace", None)
+
+
+@pytest.fixture
+def mock_throttle_counter(mocker):
+    mocker.patch.object(telemetry, "otel_trace", mocker.MagicMock())
+    return mocker.patch.object(telemetry, "_throttle_counter", create=True)
+
+
+def _throttling_error():
+    return ClientError({"Error": {"Code": "ThrottlingException"}}, "InvokeModel")
+
+
+class TestTelemetry:
+    def test_span_not_installed(self, otel_not_installed):
+        assert telemetry.telemetry_available() is False
+
+        with telemetry.span("test span", {"key": "value"}) as span:
+            assert span is None
+
+    def test_record_not_installed(self, otel_not_installed):
+        telemetry.record_tokens("test-model", {"input": 10})
+        telemetry.record_retries("evaluator", 2)
+        telemetry.record_duration("test step", 1.0)
+
+        with pytest.raises(ClientError):
+            with telemetry.count_throttles("evaluator"):
+                raise _throttling_error()
+
+    def test_count_throttles(self, mock_throttle_counter):
+        with pytest.raises(ClientError):
+            with telemetry.count_throttles("evaluator"):
+                raise _throttling_error()
+
+        with pytest.raises(ValueError):
+            with telemetry.count_throttles("evaluator"):
+                raise ValueError
+
+        mock_throttle_counter.add.assert_called_once_with(
+            1, {"agenteval.source": "evaluator"}
+        )
+
+    def test_span(self):
+        pytest.importorskip("opentelemetry.sdk")
+        from opentelemetry import trace
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+        from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+            InMemorySpanExporter,
+        )
+
+        exporter = InMemorySpanExporter()
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+        trace.set_tracer_provider(provider)
+
+        with telemetry.span("test span", {"key": "value"}):
+            pass
+
+        (span,) = exporter.get_finished_spans()
+        assert span.name == "test span"
+        assert span.attributes["key"] == "value"